@@ -2,17 +2,92 @@
 json2pyclass - A tool to generate Python classes with type hints from JSON files
 """
 
-from .code_generator import generate_class_code, generate_type_declare_file
-from .naming import camel_to_snake, snake_to_pascal
-from .structure_analyzer import analyze_json_structure
-from .type_inference import get_python_type
-
+# Defined before the imports, since submodules embed it in cache keys
 __version__ = "0.1.0"
+
+from .batch import collect_json_files, generate_batch
+from .cache import GenerationCache
+from .code_generator import (
+    analyze_json_file,
+    enum_class_names,
+    generate_class_code,
+    generate_columnar_class_code,
+    generate_module_code,
+    generate_type_declare_file,
+    generate_value_lookup_code,
+    iter_class_code,
+    iter_module_code,
+    write_module_code,
+)
+from .incremental import patch_module_source, update_module_file
+from .json_schema import from_json_schema, read_json_schema, to_json_schema, write_json_schema
+from .naming import camel_to_snake, clear_naming_cache, naming_cache_info, resolve_naming_policy, snake_to_pascal
+from .package import write_package
+from .runtime import build_classes, build_classes_from_sample, class_cache_info, clear_class_cache
+from .samples import generate_merged_declare_file, infer_schema_from_samples
+from .shared import ClassRegistry, generate_shared_batch
+from .stats import GenerationStats
+from .streaming import infer_schema_from_file, infer_schema_from_stream, iter_json_records
+from .structure_analyzer import (
+    analyze_json_structure,
+    class_shape_digest,
+    collect_classes,
+    deduplicate_classes,
+    low_cardinality_values,
+    merge_class_info,
+    merge_schemas,
+    schema_fingerprint,
+)
+from .type_inference import get_python_type, merge_python_types
+from .watch import watch
+
 __all__ = [
     "camel_to_snake",
     "snake_to_pascal",
+    "resolve_naming_policy",
+    "naming_cache_info",
+    "clear_naming_cache",
     "get_python_type",
+    "merge_python_types",
     "analyze_json_structure",
+    "merge_class_info",
+    "merge_schemas",
+    "class_shape_digest",
+    "collect_classes",
+    "deduplicate_classes",
+    "low_cardinality_values",
+    "schema_fingerprint",
+    "iter_json_records",
+    "infer_schema_from_stream",
+    "infer_schema_from_file",
+    "analyze_json_file",
+    "to_json_schema",
+    "from_json_schema",
+    "write_json_schema",
+    "read_json_schema",
     "generate_class_code",
+    "generate_columnar_class_code",
+    "generate_value_lookup_code",
+    "enum_class_names",
+    "generate_module_code",
     "generate_type_declare_file",
+    "iter_class_code",
+    "iter_module_code",
+    "write_module_code",
+    "patch_module_source",
+    "update_module_file",
+    "write_package",
+    "collect_json_files",
+    "generate_batch",
+    "ClassRegistry",
+    "generate_shared_batch",
+    "infer_schema_from_samples",
+    "generate_merged_declare_file",
+    "GenerationCache",
+    "watch",
+    "build_classes",
+    "build_classes_from_sample",
+    "class_cache_info",
+    "clear_class_cache",
+    "GenerationStats",
 ]
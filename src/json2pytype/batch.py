@@ -0,0 +1,163 @@
+"""
+Batch generation.
+
+Generates type declaration files for many JSON samples at once, spreading
+the work over a process pool so interpreter start-up is paid only once.
+"""
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .code_generator import generate_type_declare_file
+from .stats import GenerationStats
+from .streaming import NDJSON_EXTENSIONS
+
+# Line-delimited files are streamed, see is_line_delimited
+JSON_EXTENSIONS = (".json",) + NDJSON_EXTENSIONS
+
+
+def is_batch_input(input_path: str) -> bool:
+    """
+    Check whether an input argument names a directory or a glob pattern.
+
+    Args:
+        input_path: Input path or pattern given on the command line
+
+    Returns:
+        True if the input should be processed in batch mode
+    """
+    return os.path.isdir(input_path) or any(char in input_path for char in "*?[")
+
+
+def collect_json_files(input_path: str) -> List[str]:
+    """
+    Resolve a directory or glob pattern into a sorted list of JSON files.
+
+    Directories are searched recursively for ``.json``, ``.ndjson`` and
+    ``.jsonl`` files, the line-delimited ones being read as streams; glob
+    patterns support ``**``.
+
+    Args:
+        input_path: Directory or glob pattern
+
+    Returns:
+        Sorted list of matching file paths
+    """
+    if os.path.isdir(input_path):
+        paths = [
+            os.path.join(root, name)
+            for root, _, names in os.walk(input_path)
+            for name in names
+            if name.endswith(JSON_EXTENSIONS)
+        ]
+    else:
+        paths = [path for path in glob.glob(input_path, recursive=True) if os.path.isfile(path)]
+    return sorted(paths)
+
+
+def generate_batch(
+    json_paths: Sequence[str],
+    output_dir: Optional[str] = None,
+    jobs: Optional[int] = None,
+    stats: Optional[GenerationStats] = None,
+    **options: Any
+) -> List[str]:
+    """
+    Generate type declaration files for many JSON files in parallel.
+
+    Each file is analyzed and generated independently in a worker process.
+    Results are returned in input order regardless of completion order, so
+    output is deterministic for any number of jobs.
+
+    Args:
+        json_paths: Paths of the input JSON files
+        output_dir: Directory for the generated files, mirroring the input
+            layout below the inputs' common directory (default: next to
+            each input file)
+        jobs: Number of worker processes (default: number of CPUs);
+            1 runs everything in the current process
+        stats: Accumulates the measurements of every file; workers measure
+            with the same ``trace_memory`` setting and their results are
+            merged in, without invoking the callback
+        **options: Keyword arguments passed to generate_type_declare_file
+
+    Returns:
+        Paths of the written output files, in input order
+    """
+    trace_memory = stats.trace_memory if stats is not None else None
+    extension = "" if options.get("package") else ".py"
+    tasks = [
+        (json_path, output_path, trace_memory, options)
+        for json_path, output_path in plan_outputs(json_paths, output_dir, extension)
+    ]
+    if not tasks:
+        return []
+
+    if jobs == 1 or len(tasks) == 1:
+        results = [_generate_one(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # Large chunks amortize IPC when there are thousands of small files
+            chunksize = max(1, len(tasks) // ((jobs or os.cpu_count() or 1) * 4))
+            results = list(executor.map(_generate_one, tasks, chunksize=chunksize))
+
+    if stats is not None:
+        for _, task_stats in results:
+            stats.merge(task_stats)
+    return [output_path for output_path, _ in results]
+
+
+def plan_outputs(
+    json_paths: Sequence[str],
+    output_dir: Optional[str],
+    extension: str = ".py"
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    Pair every input with the path of its generated file.
+
+    Args:
+        json_paths: Paths of the input JSON files
+        output_dir: Output directory mirroring the input layout below the
+            inputs' common directory, or None
+        extension: Extension of the generated files; empty for package
+            directories
+
+    Returns:
+        Pairs of input path and output path (None means next to the input)
+
+    Raises:
+        ValueError: If two inputs would write the same output, e.g.
+            ``a.json`` and ``a.ndjson``
+    """
+    if output_dir is None:
+        plan: List[Tuple[str, Optional[str]]] = [(json_path, None) for json_path in json_paths]
+        targets = [os.path.splitext(json_path)[0] + extension for json_path in json_paths]
+    else:
+        input_dirs = [os.path.dirname(os.path.abspath(path)) for path in json_paths]
+        base_dir = os.path.commonpath(input_dirs) if json_paths else ""
+        plan = []
+        for json_path in json_paths:
+            relative = os.path.relpath(os.path.abspath(json_path), base_dir)
+            plan.append((json_path, os.path.join(output_dir, os.path.splitext(relative)[0] + extension)))
+        targets = [output_path for _, output_path in plan]
+
+    inputs: Dict[str, str] = {}
+    for json_path, target in zip(json_paths, targets):
+        target = os.path.normcase(os.path.abspath(target))
+        if target in inputs:
+            raise ValueError(f"{inputs[target]} and {json_path} would both be generated into {target}")
+        inputs[target] = json_path
+    return plan
+
+
+def _generate_one(
+    task: Tuple[str, Optional[str], Optional[bool], Dict[str, Any]]
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Worker entry point generating a single file, with its measurements."""
+    json_path, output_path, trace_memory, options = task
+    if output_path:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    stats = GenerationStats(trace_memory) if trace_memory is not None else None
+    output_path = generate_type_declare_file(json_path, output_path, verbose=False, stats=stats, **options)
+    return output_path, stats.as_dict() if stats is not None else None
@@ -0,0 +1,262 @@
+"""
+Benchmark suite.
+
+Generates synthetic wide, deep and long JSON payloads and measures
+generation time, peak memory, import time of the generated module and the
+decode/encode throughput of the generated classes. Results are emitted as
+JSON so runs of different versions can be compared.
+
+Run with ``python -m json2pytype.benchmark``.
+"""
+
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from . import __version__
+from .code_generator import generate_module_code
+from .structure_analyzer import analyze_json_structure, collect_classes, deduplicate_classes
+
+# Metrics where a larger value is better, used when comparing runs
+HIGHER_IS_BETTER = ("decode_records_per_s", "encode_records_per_s")
+
+
+def make_wide_payload(width: int = 2000) -> Dict[str, Any]:
+    """
+    Generate one object with many keys of mixed scalar types.
+
+    Args:
+        width: Number of keys
+
+    Returns:
+        JSON-compatible dictionary
+    """
+    values = (1, 1.5, "text", True, None)
+    return {f"field{index}Name": values[index % len(values)] for index in range(width)}
+
+
+def make_deep_payload(depth: int = 200) -> Dict[str, Any]:
+    """
+    Generate an object nested ``depth`` levels deep with a few fields per level.
+
+    Args:
+        depth: Nesting depth
+
+    Returns:
+        JSON-compatible dictionary
+    """
+    payload: Dict[str, Any] = {"leafId": 0, "leafName": "leaf"}
+    for level in range(depth, 0, -1):
+        payload = {"levelId": level, "levelName": f"level{level}", f"child{level}": payload}
+    return payload
+
+
+def make_long_payload(length: int = 50000) -> List[Dict[str, Any]]:
+    """
+    Generate a long array of records with nested objects and arrays.
+
+    Args:
+        length: Number of records
+
+    Returns:
+        JSON-compatible list
+    """
+    return [
+        {
+            "id": index,
+            "name": f"record{index}",
+            "score": index * 0.5,
+            "active": index % 2 == 0,
+            "tags": ["a", "b"],
+            "address": {"street": f"{index} Main St", "city": "Anytown", "zipCode": "12345"},
+            "orders": [{"sku": "sku1", "quantity": 1}, {"sku": "sku2", "quantity": 2}],
+        }
+        for index in range(length)
+    ]
+
+
+SCENARIOS: Dict[str, Callable[[int], Any]] = {
+    "wide": make_wide_payload,
+    "deep": make_deep_payload,
+    "long": make_long_payload,
+}
+
+
+def run_scenario(name: str, payload: Any, repeat: int = 3, **codegen_options: Any) -> Dict[str, Any]:
+    """
+    Measure generation and generated-code performance for one payload.
+
+    Timings are the best of ``repeat`` runs.
+
+    Args:
+        name: Scenario name, also used for the root class
+        payload: JSON-compatible payload
+        repeat: Number of timing runs per measurement
+        **codegen_options: Options passed to generate_class_code
+
+    Returns:
+        Dictionary of metrics
+    """
+    class_name = f"Bench{name.capitalize()}"
+    analyze_s = _best_of(repeat, lambda: analyze_json_structure(payload, class_name))
+    class_info = analyze_json_structure(payload, class_name)
+    generate_s = _best_of(repeat, lambda: generate_module_code(class_info, **codegen_options))
+    source = generate_module_code(class_info, **codegen_options)
+
+    gc.collect()
+    tracemalloc.start()
+    generate_module_code(analyze_json_structure(payload, class_name), **codegen_options)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    import_s, module = _import_source(source, repeat)
+    root_class = getattr(module, class_name)
+    data = {"items": payload} if isinstance(payload, list) else payload
+    records = len(payload) if isinstance(payload, list) else 1
+    decode_s = _best_of(repeat, lambda: root_class(data))
+    instance = root_class(data)
+    encode_s = _best_of(repeat, instance)
+
+    return {
+        "analyze_s": analyze_s,
+        "generate_s": generate_s,
+        "peak_memory_bytes": peak,
+        "generated_bytes": len(source.encode("utf-8")),
+        # Classes of the schema, not the helper classes some options emit
+        "generated_classes": len(collect_classes(deduplicate_classes(class_info))),
+        "import_s": import_s,
+        "records": records,
+        "decode_records_per_s": records / decode_s if decode_s else None,
+        "encode_records_per_s": records / encode_s if encode_s else None,
+    }
+
+
+def run_benchmarks(
+    scenarios: Optional[List[str]] = None,
+    scale: float = 1.0,
+    repeat: int = 3,
+    **codegen_options: Any
+) -> Dict[str, Any]:
+    """
+    Run benchmark scenarios and collect machine-readable results.
+
+    Args:
+        scenarios: Scenario names to run (default: all of wide, deep, long)
+        scale: Factor applied to the default payload sizes
+        repeat: Number of timing runs per measurement
+        **codegen_options: Options passed to generate_class_code
+
+    Returns:
+        Dictionary with run metadata and per-scenario metrics
+    """
+    sizes = {"wide": 2000, "deep": 200, "long": 50000}
+    results: Dict[str, Any] = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "codegen_options": codegen_options,
+        "scenarios": {},
+    }
+    for name in scenarios or list(SCENARIOS):
+        payload = SCENARIOS[name](max(1, int(sizes[name] * scale)))
+        results["scenarios"][name] = run_scenario(name, payload, repeat, **codegen_options)
+    return results
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """
+    Compare two benchmark results metric by metric.
+
+    Args:
+        baseline: Results of the reference run
+        current: Results of the new run
+
+    Returns:
+        Dictionary mapping scenario names to metric speedups, where values
+        above 1.0 mean the current run is better
+    """
+    comparison: Dict[str, Dict[str, float]] = {}
+    for name, metrics in current["scenarios"].items():
+        old_metrics = baseline["scenarios"].get(name)
+        if not old_metrics:
+            continue
+        comparison[name] = {}
+        for metric, value in metrics.items():
+            old_value = old_metrics.get(metric)
+            if not isinstance(value, (int, float)) or not old_value or not value or metric == "records":
+                continue
+            ratio = value / old_value if metric in HIGHER_IS_BETTER else old_value / value
+            comparison[name][metric] = round(ratio, 3)
+    return comparison
+
+
+def _best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """Run a function ``repeat`` times and return the fastest wall time."""
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _import_source(source: str, repeat: int) -> Tuple[float, Any]:
+    """Write generated source to a file and time importing it from scratch."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "bench_generated.py")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source)
+        best = float("inf")
+        module = None
+        for attempt in range(max(1, repeat)):
+            module_name = f"_json2pytype_bench_{attempt}"
+            spec = importlib.util.spec_from_file_location(module_name, path)
+            module = importlib.util.module_from_spec(spec)
+            start = time.perf_counter()
+            # Includes compiling the source, as for a cold import
+            spec.loader.exec_module(module)
+            best = min(best, time.perf_counter() - start)
+            sys.modules.pop(module_name, None)
+    return best, module
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point of the benchmark suite."""
+    parser = argparse.ArgumentParser(description='Benchmark json2pytype generation and generated classes')
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help=f"Scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument('--scale', type=float, default=1.0, help='Factor applied to the default payload sizes')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing runs per measurement (best is reported)')
+    parser.add_argument('-O', '--option', action='append', default=[], metavar='NAME',
+                        help='Enable a boolean code generation option, e.g. -O slots -O fast_decode')
+    parser.add_argument('-o', '--output', help='Write results to this JSON file instead of stdout')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='JSON results of a previous run; prints per-metric speedups to stderr')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    results = run_benchmarks(args.scenarios, args.scale, args.repeat, **{name: True for name in args.option})
+    encoded = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(encoded + "\n")
+    else:
+        print(encoded)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(json.dumps(compare_results(baseline, results), indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
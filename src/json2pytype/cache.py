@@ -0,0 +1,210 @@
+"""
+Generation cache.
+
+Remembers, per output file, the input it was generated from and a
+fingerprint of the generated schema, so regenerating an unchanged sample
+skips analysis, and a sample whose values changed but whose shape did not
+skips code generation and the file write. A generated package is tracked
+through every module in its directory.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Mapping, Optional, Tuple
+from . import __version__
+from .structure_analyzer import schema_fingerprint
+
+DEFAULT_CACHE_DIR = ".json2pytype_cache"
+
+
+class GenerationCache:
+    """
+    Content-addressed cache of generated type declaration files.
+
+    Every output file has one small entry file in the cache directory, so
+    worker processes generating different files never contend for an
+    entry. An output is considered current when the input is unchanged
+    (same size and modification time, and the same options) or
+    when the analyzed schema and the code generation options have the same
+    fingerprint as last time; in both cases the output file, or every
+    module of an output package, must also be exactly as it was written.
+
+    Args:
+        cache_dir: Directory holding the cache entries
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def input_is_current(self, json_path: str, output_path: str, options: Mapping[str, Any]) -> bool:
+        """
+        Check whether an output was generated from the input as it is now.
+
+        Args:
+            json_path: Path of the input JSON file
+            output_path: Path of the generated file or package directory
+            options: Analysis and code generation options passed to
+                generate_type_declare_file
+
+        Returns:
+            True if analysis and generation can be skipped
+        """
+        entry = self._load(output_path)
+        options_key = _options_key(options)
+        current = (
+            entry is not None
+            and options_key is not None
+            and entry["options_key"] == options_key
+            and entry["input_stat"] == stat_signature(json_path)
+            and entry["output_stat"] == output_signature(output_path)
+        )
+        if current:
+            self.hits += 1
+        return current
+
+    def schema_is_current(self, output_path: str, schema_key: str) -> bool:
+        """
+        Check whether an output was generated from the same schema.
+
+        Args:
+            output_path: Path of the generated file or package directory
+            schema_key: Key returned by schema_key
+
+        Returns:
+            True if generation and writing can be skipped
+        """
+        entry = self._load(output_path)
+        current = (
+            entry is not None
+            and entry["schema_key"] == schema_key
+            and entry["output_stat"] == output_signature(output_path)
+        )
+        if current:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return current
+
+    def store(
+        self,
+        json_path: str,
+        output_path: str,
+        options: Mapping[str, Any],
+        schema_key: str
+    ) -> None:
+        """
+        Record the input and schema an output file was generated from.
+
+        Args:
+            json_path: Path of the input JSON file
+            output_path: Path of the generated file or package directory,
+                already written
+            options: Analysis and code generation options
+            schema_key: Key returned by schema_key
+        """
+        entry = {
+            "input": os.path.abspath(json_path),
+            "input_stat": stat_signature(json_path),
+            "options_key": _options_key(options),
+            "schema_key": schema_key,
+            "output_stat": output_signature(output_path),
+        }
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry_path = self._entry_path(output_path)
+        # Write then rename, so readers never see a partial entry
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(temp_path, entry_path)
+
+    def _entry_path(self, output_path: str) -> str:
+        """Path of the cache entry of an output file."""
+        digest = hashlib.sha1(os.path.abspath(output_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _load(self, output_path: str) -> Optional[Dict[str, Any]]:
+        """Read the cache entry of an output file, if any."""
+        try:
+            with open(self._entry_path(output_path), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Entries hold JSON lists where signatures are tuples
+        for key in ("input_stat", "output_stat"):
+            if entry.get(key) is not None:
+                entry[key] = tuple(tuple(item) if isinstance(item, list) else item for item in entry[key])
+        return entry
+
+
+def schema_key(class_info: Dict[str, Any], codegen_options: Mapping[str, Any]) -> str:
+    """
+    Compute the cache key of a schema and the options generating its code.
+
+    Args:
+        class_info: Dictionary containing class definition information
+        codegen_options: Options passed to generate_class_code
+
+    Returns:
+        Hex digest identifying the generated code
+    """
+    encoded = json.dumps(
+        [__version__, schema_fingerprint(class_info), sorted(codegen_options.items())],
+        separators=(",", ":"),
+        default=repr,
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _options_key(options: Mapping[str, Any]) -> Optional[str]:
+    """Key of the generation options, or None if they cannot be compared."""
+    if callable(options.get("naming")):
+        # A naming function's behavior cannot be fingerprinted
+        return None
+    encoded = json.dumps([__version__, sorted(options.items())], separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def stat_signature(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Get a cheap signature of a file's contents.
+
+    Args:
+        path: Path of the file
+
+    Returns:
+        Size and modification time in nanoseconds, or None if the file is
+        missing
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def output_signature(path: str) -> Optional[Tuple[Any, ...]]:
+    """
+    Get a cheap signature of a generated module or package.
+
+    Args:
+        path: Path of the module, or of the package directory
+
+    Returns:
+        stat_signature of a module; for a package, the name, size and
+        modification time of every module in the directory, sorted by name.
+        None if the output is missing
+    """
+    if not os.path.isdir(path):
+        return stat_signature(path)
+    try:
+        return tuple(sorted(
+            (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+            for entry in os.scandir(path)
+            if entry.name.endswith(".py") and entry.is_file()
+        ))
+    except OSError:
+        # A module was removed while listing
+        return None
@@ -6,17 +6,194 @@ with type hints.
 """
 
 import argparse
-from .code_generator import generate_type_declare_file
+import json
+import os
+import sys
+from typing import List, Optional
+from .batch import collect_json_files, generate_batch, is_batch_input, plan_outputs
+from .cache import DEFAULT_CACHE_DIR, GenerationCache
+from .code_generator import (
+    DEFAULT_MAX_ENUM_VALUES,
+    LOW_CARDINALITY_MODES,
+    RECORD_BACKENDS,
+    generate_type_declare_file,
+)
+from .naming import NAMING_POLICIES
+from .package import PACKAGE_LAYOUTS
+from .samples import generate_merged_declare_file
+from .shared import generate_shared_batch
+from .stats import GenerationStats
+from .type_inference import SAMPLING_STRATEGIES
+from .watch import watch
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """Main function for the command line interface."""
     parser = argparse.ArgumentParser(description='Convert JSON files to Python classes with type hints')
-    parser.add_argument('input', help='Path to the input JSON file (e.g., data.json)')
-    parser.add_argument('-o', '--output', help='Path for the output Python file (default: input filename with .py extension)')
-    args = parser.parse_args()
+    parser.add_argument('input', help='Path to the input JSON file (e.g., data.json), '
+                                      'or a directory or quoted glob pattern for batch mode')
+    parser.add_argument('-o', '--output', help='Path for the output Python file (default: input filename with .py extension), '
+                                               'or - for standard output; in batch mode, the output directory')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Number of worker processes in batch and merge mode (default: number of CPUs)')
+    parser.add_argument('--merge', action='store_true',
+                        help='Analyze every input file in parallel and merge them into one schema, '
+                             'written to a single output named after the inputs\' directory unless -o is given')
+    parser.add_argument('--shared-module', metavar='MODULE',
+                        help='In batch mode, generate classes of the same shape used by several outputs once '
+                             'into this module below the -o directory (e.g. common) and import them from there')
+    parser.add_argument('--stream', action='store_true',
+                        help='Read the input incrementally as NDJSON records or top-level array elements '
+                             'and merge them into one schema without loading the whole file')
+    parser.add_argument('--max-samples', type=int, default=None,
+                        help='Maximum number of elements inspected per array (default: all elements)')
+    parser.add_argument('--sampling', choices=SAMPLING_STRATEGIES, default='first',
+                        help='How array elements are picked when an array exceeds --max-samples (default: first)')
+    parser.add_argument('--naming', choices=NAMING_POLICIES, default='snake',
+                        help='Field naming policy: snake_case attributes or the original JSON keys (default: snake)')
+    parser.add_argument('--name-map', metavar='FILE',
+                        help='JSON file mapping JSON keys to attribute names; unmapped keys use snake_case')
+    parser.add_argument('--from-schema', action='store_true',
+                        help='Read the input as a JSON Schema document instead of a JSON sample')
+    parser.add_argument('--export-schema', metavar='FILE',
+                        help='Also write the analyzed schema as JSON Schema to FILE, for later use with --from-schema')
+    parser.add_argument('--backend', choices=RECORD_BACKENDS, default='class',
+                        help='Generate mutable classes, or immutable hashable tuple records with '
+                             'from_dict/to_dict (default: class)')
+    parser.add_argument('--update', action='store_true',
+                        help='Patch an existing output module, rewriting only the classes that changed')
+    parser.add_argument('--validate', action='store_true',
+                        help='Check input types while decoding; set_trusted() in the module turns checks off')
+    parser.add_argument('--compact-pickle', action='store_true',
+                        help='Pickle instances as tuples of field values without attribute names')
+    parser.add_argument('--slots', action='store_true',
+                        help='Emit __slots__ on every generated class to drop the per-instance __dict__')
+    parser.add_argument('--fast-decode', action='store_true',
+                        help='Emit the fast decode template with a bulk from_list classmethod')
+    parser.add_argument('--strict', action='store_true',
+                        help='Fast decode template that indexes keys present in every sample directly '
+                             '(implies --fast-decode)')
+    parser.add_argument('--lazy', action='store_true',
+                        help='Decode nested objects and lists of objects on first attribute access')
+    parser.add_argument('--to-json', action='store_true',
+                        help='Emit a to_json() method and a module-level set_json_encoder() hook')
+    parser.add_argument('--columnar', action='store_true',
+                        help='Decode lists of objects into generated <Item>Batch classes storing each field '
+                             'as a column (array for int, float and bool fields)')
+    parser.add_argument('--low-cardinality', choices=LOW_CARDINALITY_MODES,
+                        help='Decode string fields with few distinct values to members of a generated Enum '
+                             'or to shared string objects')
+    parser.add_argument('--max-enum-values', type=int, default=None,
+                        help='Most distinct values of a field handled by --low-cardinality '
+                             f'(default: {DEFAULT_MAX_ENUM_VALUES})')
+    parser.add_argument('--package', choices=PACKAGE_LAYOUTS,
+                        help='Write a package importing each class on first access, with one module per class '
+                             'or per field of the root class; -o names the package directory')
+    parser.add_argument('--stats', action='store_true',
+                        help='Print wall time and memory per phase and counts of emitted classes, '
+                             'fields and bytes to stderr')
+    parser.add_argument('--cache-dir', metavar='DIR',
+                        help='Skip regenerating outputs whose input, or whose schema fingerprint, is unchanged, '
+                             'keeping cache entries in DIR')
+    parser.add_argument('--watch', action='store_true',
+                        help='Poll the inputs and regenerate the outputs whose schema changed '
+                             f'(caches in {DEFAULT_CACHE_DIR} unless --cache-dir is given)')
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help='Seconds between polls in watch mode (default: 1)')
+    args = parser.parse_args(argv)
     
-    generate_type_declare_file(args.input, args.output)
+    naming = args.naming
+    if args.name_map:
+        with open(args.name_map, 'r', encoding='utf-8') as f:
+            naming = json.load(f)
+    
+    options = {
+        "stream": args.stream,
+        "max_samples": args.max_samples,
+        "sampling": args.sampling,
+        "naming": naming,
+        "slots": args.slots,
+        "fast_decode": args.fast_decode,
+        "strict": args.strict,
+        "lazy": args.lazy,
+        "to_json": args.to_json,
+        "columnar": args.columnar,
+        "low_cardinality": args.low_cardinality,
+        "backend": args.backend,
+        "compact_pickle": args.compact_pickle,
+        "validate": args.validate,
+        "max_enum_values": args.max_enum_values,
+        "package": args.package,
+        "from_schema": args.from_schema,
+        "schema_path": args.export_schema,
+        "update": args.update,
+    }
+    if args.package and args.output == "-":
+        parser.error("--package cannot write to standard output")
+    if args.update and (args.package or args.output == "-"):
+        parser.error("--update patches a single module file")
+    stats = GenerationStats(trace_memory=True) if args.stats else None
+    cache = GenerationCache(args.cache_dir) if args.cache_dir else None
+    
+    if args.merge and (args.watch or cache is not None):
+        parser.error("--merge cannot be combined with --watch or --cache-dir")
+    if args.export_schema and not args.merge and is_batch_input(args.input):
+        parser.error("--export-schema takes a single input, or --merge")
+    if args.shared_module and (not is_batch_input(args.input) or not args.output or args.output == "-"):
+        parser.error("--shared-module needs batch input and an -o directory")
+    if args.shared_module and (args.merge or args.watch or cache is not None or args.package or args.export_schema):
+        parser.error("--shared-module cannot be combined with --merge, --watch, --cache-dir, --package "
+                     "or --export-schema")
+    if args.shared_module and (args.columnar or args.to_json or args.validate):
+        parser.error("--shared-module cannot be combined with --columnar, --to-json or --validate")
+    
+    if args.watch:
+        if args.output == "-":
+            parser.error("watch mode cannot write to standard output")
+        try:
+            watch(args.input, args.output, args.interval, cache, **options)
+        except KeyboardInterrupt:
+            pass
+        return
+    
+    if args.merge:
+        json_paths = collect_json_files(args.input) if is_batch_input(args.input) else [args.input]
+        if not json_paths:
+            parser.error(f"no JSON files found for {args.input}")
+        try:
+            generate_merged_declare_file(json_paths, args.output, args.jobs, stats=stats, **options)
+        except BrokenPipeError:
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(1)
+    elif is_batch_input(args.input):
+        if args.output == "-":
+            parser.error("batch mode cannot write to standard output")
+        json_paths = collect_json_files(args.input)
+        if not json_paths:
+            parser.error(f"no JSON files found for {args.input}")
+        try:
+            plan_outputs(json_paths, args.output, "" if args.package else ".py")
+        except ValueError as error:
+            parser.error(str(error))
+        if args.shared_module:
+            del options["package"], options["schema_path"]
+            output_paths = generate_shared_batch(
+                json_paths, args.output, args.shared_module, args.jobs, stats=stats, **options
+            )
+        else:
+            output_paths = generate_batch(json_paths, args.output, args.jobs, stats, cache=cache, **options)
+        for output_path in output_paths:
+            print(f"Type declaration file generated: {output_path}")
+    else:
+        try:
+            generate_type_declare_file(args.input, args.output, stats=stats, cache=cache, **options)
+        except BrokenPipeError:
+            # The reader of standard output went away, e.g. `| head`
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(1)
+    
+    if stats is not None:
+        print(stats.report(), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -6,131 +6,1372 @@ Generates Python class code with type hints based on analyzed JSON structures.
 
 import json
 import os
-from typing import Any, Dict, List, Optional, Set
-from .structure_analyzer import analyze_json_structure
-from .naming import snake_to_pascal
+import sys
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set, TextIO, Tuple
+from .structure_analyzer import (
+    analyze_json_structure,
+    collect_classes,
+    deduplicate_classes,
+    list_elements_nullable,
+    low_cardinality_values,
+)
+from .type_inference import make_optional, split_type_members
+from .naming import NamingPolicy, camel_to_snake, key_to_class_name, snake_to_pascal, to_identifier
+from .cache import GenerationCache, schema_key
+from .stats import GenerationStats, measure
+from .json_schema import from_json_schema, write_json_schema
+from .streaming import infer_schema_from_file, is_line_delimited
 
+# Encoder hook emitted once into modules generated with to_json=True; the
+# C encoder without circular reference checks is the fastest stdlib option
+JSON_ENCODER_SOURCE = '''import json
 
-def generate_class_code(class_info: Dict[str, Any], imported_classes: Set[str] = None) -> str:
+_json_encode = json.JSONEncoder(check_circular=False).encode
+
+
+def set_json_encoder(encode: Callable[[dict], str]) -> None:
+    """Replace the function used by to_json() to encode dictionaries."""
+    global _json_encode
+    _json_encode = encode
+'''
+
+# Descriptor emitted once into modules generated with lazy=True
+LAZY_FIELD_SOURCE = '''class _LazyField:
+    """Nested field decoded from its raw JSON value on first access, then cached."""
+
+    def __init__(self, decode, many=False):
+        self.decode = getattr(decode, "from_list", None) if many else None
+        self.item_decode = decode
+        self.many = many
+
+    def __set_name__(self, owner, name):
+        self.raw_name = "_raw_" + name
+        self.cache_name = "_" + name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        try:
+            return getattr(obj, self.cache_name)
+        except AttributeError:
+            raw = getattr(obj, self.raw_name)
+            if not self.many:
+                value = self.item_decode(raw or {})
+            elif self.decode is not None:
+                value = self.decode(raw or [])
+            else:
+                value = [self.item_decode(item) for item in raw or []]
+            setattr(obj, self.cache_name, value)
+            return value
+
+    def __set__(self, obj, value):
+        setattr(obj, self.cache_name, value)
+
+    def dump(self, obj):
+        """Encode the field, passing the raw value through if never decoded."""
+        try:
+            value = getattr(obj, self.cache_name)
+        except AttributeError:
+            return getattr(obj, self.raw_name)
+        if self.many:
+            return [item() for item in value] if value else []
+        return value() if value else None
+'''
+
+# Column helpers emitted once into modules generated with columnar=True
+COLUMNAR_SOURCE = '''from array import array
+
+
+def _column(typecode, values):
+    """Pack a column into an array, keeping the list if a value does not fit."""
+    try:
+        return array(typecode, values)
+    except (TypeError, OverflowError):
+        return values
+
+
+def _cell(column, index):
+    """Read one value of a column, restoring booleans packed into an array."""
+    value = column[index]
+    return bool(value) if type(column) is array and column.typecode == "b" else value
+
+
+def _column_values(column):
+    """All values of a column as a list, restoring packed booleans."""
+    if type(column) is not array:
+        return column
+    if column.typecode == "b":
+        return [value == 1 for value in column]
+    return column.tolist()
+'''
+
+# Value lookup emitted once into modules generated with low_cardinality set
+CANONICAL_SOURCE = '''class _Canonical(dict):
+    """Map a value to its canonical object; values not listed map to themselves."""
+
+    def __getitem__(self, key):
+        try:
+            return dict.__getitem__(self, key)
+        except TypeError:
+            # Unhashable values, e.g. an object where a string was sampled
+            return key
+
+    def __missing__(self, key):
+        return key
+'''
+
+# Validation helpers emitted once into modules generated with validate=True;
+# classes start out validating and set_trusted swaps the plain methods back
+VALIDATION_SOURCE = '''_NoneType = type(None)
+
+
+class ValidationError(ValueError):
+    """A JSON value does not have the type inferred from the samples."""
+
+    def __init__(self, path: list, expected: str, value: Any, missing: bool = False):
+        super().__init__(path, expected, value)
+        self.path = path
+        self.expected = expected
+        self.value = value
+        self.missing = missing
+
+    def __str__(self) -> str:
+        location = "".join(f"[{key}]" if type(key) is int else f".{key}" for key in self.path).lstrip(".")
+        if self.missing:
+            return f"{location or '<root>'}: missing, expected {self.expected}"
+        return f"{location or '<root>'}: expected {self.expected}, got {type(self.value).__name__}"
+
+
+# Validating classes and their unchecked __init__ and from_list
+_checked_classes = {}
+_trusted = False
+
+
+def set_trusted(trusted: bool = True) -> None:
+    """Skip all validation for trusted input, or turn it back on."""
+    global _trusted
+    _trusted = trusted
+    for cls in _checked_classes:
+        _switch_methods(cls)
+
+
+def _checked(cls):
+    """Register a class with a _checked_init constructor."""
+    _checked_classes[cls] = (cls.__init__, cls.__dict__.get("from_list"))
+    _switch_methods(cls)
+    return cls
+
+
+def _switch_methods(cls):
+    init, from_list = _checked_classes[cls]
+    cls.__init__ = init if _trusted else cls._checked_init
+    if from_list is not None:
+        cls.from_list = from_list if _trusted else _checked_from_list
+
+
+def _empty(cls):
+    """The object the unchecked constructor builds for a missing or null nested object."""
+    obj = object.__new__(cls)
+    try:
+        _checked_classes[cls][0](obj, {})
+    except KeyError as error:
+        # Strict decoding indexes the keys present in every sample
+        raise ValidationError([error.args[0]], "a value", None, True) from None
+    return obj
+
+
+def _check_list(decode, values, key, nullable=False):
+    if type(values) is not list:
+        raise ValidationError([] if key is None else [key], "list", values)
+    result = []
+    append = result.append
+    try:
+        for item in values:
+            append(None if nullable and item is None else decode(item))
+    except ValidationError as error:
+        # The failing element is the next one to append
+        error.path[:0] = [len(result)] if key is None else [key, len(result)]
+        raise
+    return result
+
+
+def _check_items(types, expected, values, key):
+    if type(values) is not list:
+        raise ValidationError([key], "list", values)
+    if types is not None:
+        for index, item in enumerate(values):
+            if type(item) not in types:
+                raise ValidationError([key, index], expected, item)
+    return values
+
+
+_checked_from_list = classmethod(lambda cls, records: _check_list(cls, records, None))
+'''
+
+# Python types accepted for a basic type when validating; int is accepted
+# where float was inferred, as JSON does not distinguish 1 from 1.0
+VALIDATED_TYPES = {
+    "int": ("int",),
+    "float": ("float", "int"),
+    "str": ("str",),
+    "bool": ("bool",),
+    "None": ("_NoneType",),
+}
+
+LOW_CARDINALITY_MODES = ("enum", "intern")
+
+# Distinct values collected per string field when low_cardinality is set
+DEFAULT_MAX_ENUM_VALUES = 16
+
+# Base class emitted once into modules generated with backend="tuple"
+TUPLE_RECORD_SOURCE = '''from operator import itemgetter as _itemgetter
+
+_tuple_new = tuple.__new__
+
+
+class _Record(tuple):
+    """Immutable record storing its fields positionally in a tuple."""
+    __slots__ = ()
+    _fields: tuple = ()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(self._fields, self))
+        return f"{type(self).__name__}({fields})"
+
+    def _replace(self, **changes):
+        """Copy of the record with some fields replaced."""
+        return _tuple_new(type(self), [changes.get(name, value) for name, value in zip(self._fields, self)])
+
+
+def _freeze(value):
+    """Turn lists nested at any depth into tuples, so the value is hashable."""
+    if type(value) is list:
+        return tuple([_freeze(item) for item in value])
+    return value
+
+
+def _thaw(value):
+    """Turn the tuples made by _freeze back into lists."""
+    if type(value) is tuple:
+        return [_thaw(item) for item in value]
+    return value
+'''
+
+RECORD_BACKENDS = ("class", "tuple")
+
+# Array typecodes of the columns of basic types that pack into an array
+COLUMN_TYPECODES = {"int": "q", "float": "d", "bool": "b"}
+
+
+def generate_class_code(
+    class_info: Dict[str, Any],
+    imported_classes: Set[str] = None,
+    slots: bool = False,
+    fast_decode: bool = False,
+    strict: bool = False,
+    lazy: bool = False,
+    to_json: bool = False,
+    columnar: bool = False,
+    low_cardinality: Optional[str] = None,
+    backend: str = "class",
+    compact_pickle: bool = False,
+    validate: bool = False,
+    shared_classes: Optional[Mapping[str, str]] = None
+) -> str:
     """
     Generate Python class code from class information.
 
     Args:
         class_info: Dictionary containing class definition information
-        imported_classes: Set to track imported classes to avoid duplicates
+        imported_classes: Set to track imported classes to avoid duplicates;
+            when omitted, classes are first deduplicated by shape with
+            deduplicate_classes
+        slots: Declare ``__slots__`` from the field list so instances of
+            every generated class carry no per-instance ``__dict__``
+        fast_decode: Emit the fast decode template: ``__init__`` binds
+            ``data.get`` once, and a ``from_list`` classmethod decodes a
+            whole list of records with pre-bound locals and inlined field
+            assignments; lists of nested classes are decoded through it
+        strict: Fast decode template (implies ``fast_decode``) that reads
+            keys present in every sample with direct indexing, so a
+            missing key raises KeyError
+        lazy: Keep the raw value of nested class fields and decode it on
+            first attribute access through a caching ``_LazyField``
+            descriptor; fields never accessed are encoded back from the raw
+            value unchanged
+        to_json: Emit a ``to_json()`` method encoding the instance with
+            the module's JSON encoder, replaceable globally through the
+            generated ``set_json_encoder`` or per call through ``encode``
+        columnar: Decode lists of nested objects into a generated
+            ``<Item>Batch`` class storing every field as a column, with
+            ``array`` columns for int, float and bool fields, instead of
+            one object per element
+        low_cardinality: How string fields with few distinct values (see
+            low_cardinality_values) are decoded: ``"enum"`` emits a ``str``
+            Enum class per field and decodes values to its members,
+            ``"intern"`` decodes every value to one shared string object;
+            values not seen in the samples are kept as they are
+        backend: ``"class"`` for mutable classes decoded by ``__init__``
+            and encoded by ``__call__``, or ``"tuple"`` for immutable,
+            hashable tuple records with ``from_dict``, ``from_list`` and
+            ``to_dict``, storing lists as tuples, nested ones included,
+            though a record holding a dict is not hashable (cannot be
+            combined with ``lazy`` or ``columnar``; ``slots`` and
+            ``fast_decode`` are implied)
+        compact_pickle: Emit ``__getstate__`` and ``__setstate__`` pickling
+            instances of the class backend as a tuple of field values in
+            schema order, without attribute names (tuple records always
+            pickle this way)
+        validate: Emit a ``_checked_init`` constructor per class that
+            checks every value against its inferred type while decoding and
+            raises the module's ``ValidationError`` naming the JSON path of
+            a mismatch; ``set_trusted()`` swaps the unchecked constructors
+            back in for trusted input (class backend only, cannot be
+            combined with ``lazy`` or ``columnar``)
+        shared_classes: Classes defined in other modules, mapped to the
+            module they are imported from; they are imported at the top of
+            the generated code instead of being generated (ignored when
+            ``imported_classes`` is given)
 
     Returns:
         String containing the generated Python class code
+
+    Raises:
+        ValueError: If the low cardinality mode or the backend is unknown,
+            or the backend does not support an option
     """
-    if imported_classes is None:
-        imported_classes = set()
-        
+    return "".join(iter_class_code(
+        class_info, imported_classes, slots, fast_decode, strict, lazy, to_json, columnar, low_cardinality, backend,
+        compact_pickle, validate, shared_classes
+    ))
+
+
+def iter_class_code(
+    class_info: Dict[str, Any],
+    imported_classes: Set[str] = None,
+    slots: bool = False,
+    fast_decode: bool = False,
+    strict: bool = False,
+    lazy: bool = False,
+    to_json: bool = False,
+    columnar: bool = False,
+    low_cardinality: Optional[str] = None,
+    backend: str = "class",
+    compact_pickle: bool = False,
+    validate: bool = False,
+    shared_classes: Optional[Mapping[str, str]] = None
+) -> Iterator[str]:
+    """
+    Generate Python class code from class information chunk by chunk.
+
+    Module helpers and then every class, in dependency order, are yielded as
+    soon as they are generated, so the output never has to be held in
+    memory as a whole. Joining the chunks gives the output of
+    generate_class_code, which documents the arguments.
+
+    Yields:
+        Consecutive chunks of the generated Python class code
+
+    Raises:
+        ValueError: If the low cardinality mode or the backend is unknown,
+            or the backend does not support an option
+    """
+    if low_cardinality is not None and low_cardinality not in LOW_CARDINALITY_MODES:
+        raise ValueError(f"Unknown low cardinality mode: {low_cardinality}")
+    if backend not in RECORD_BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    if backend == "tuple" and (lazy or columnar):
+        raise ValueError("The tuple backend supports neither lazy nor columnar decoding")
+    if validate and (backend != "class" or lazy or columnar):
+        raise ValueError("Validation requires the class backend without lazy or columnar decoding")
+    fast_decode = fast_decode or strict
+    separator = ""
+    top_level = imported_classes is None
+    if top_level:
+        # Share one definition per distinct shape, so names identify shapes
+        class_info = deduplicate_classes(class_info)
+        imported_classes = set(shared_classes or ())
+    # Classes stored column-wise by a batch class
+    batched = list_element_classes(class_info) if columnar else set()
+    if top_level and shared_classes:
+        modules: Dict[str, List[str]] = {}
+        for name, module in shared_classes.items():
+            modules.setdefault(module, []).append(name)
+        yield "".join(f"from {module} import {', '.join(sorted(names))}\n" for module, names in sorted(modules.items()))
+        separator = "\n"
+    if top_level:
+        # Module level helpers, emitted once before all classes
+        if lazy:
+            yield LAZY_FIELD_SOURCE
+            separator = "\n"
+        if to_json:
+            yield separator + JSON_ENCODER_SOURCE
+            separator = "\n"
+        if batched:
+            yield separator + COLUMNAR_SOURCE
+            separator = "\n"
+        if low_cardinality:
+            enum_import = "from enum import Enum\n\n\n" if low_cardinality == "enum" else ""
+            yield separator + enum_import + CANONICAL_SOURCE
+            separator = "\n"
+        if backend == "tuple":
+            yield separator + TUPLE_RECORD_SOURCE
+            separator = "\n"
+        if validate:
+            yield separator + VALIDATION_SOURCE
+            separator = "\n"
+    
+    # Nested classes come before the classes using them; the walk uses an
+    # explicit stack, so nesting depth is not limited by recursion
+    for info in collect_classes(class_info, imported_classes):
+        if low_cardinality:
+            lookups = generate_value_lookup_code(info, low_cardinality)
+            if lookups:
+                yield separator + lookups
+                separator = "\n"
+        if backend == "tuple":
+            lines = _tuple_record_lines(info, strict, to_json, low_cardinality)
+        else:
+            lines = _class_lines(
+                info, slots, fast_decode, strict, lazy, to_json, columnar, low_cardinality, compact_pickle, validate
+            )
+        yield separator + "\n".join(lines)
+        separator = "\n"
+        if info["name"] in batched:
+            yield separator + generate_columnar_class_code(info, to_json, low_cardinality)
+
+
+def list_element_classes(class_info: Dict[str, Any]) -> Set[str]:
+    """
+    Find the classes of a tree used as elements of lists.
+
+    Args:
+        class_info: Dictionary containing class definition information
+
+    Returns:
+        Names of the classes decoded from list elements, leaving out lists
+        with null elements, which are decoded one object per element
+    """
+    return {
+        field_info["list_element_type"]
+        for info in collect_classes(class_info)
+        for field_info in info["fields"].values()
+        if field_info["list_element_is_custom"] and not list_elements_nullable(field_info)
+    }
+
+
+def enum_class_names(class_info: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Name the Enum classes of a class's low cardinality fields.
+
+    Args:
+        class_info: Dictionary containing class definition information
+
+    Returns:
+        Dictionary mapping field names to Enum class names, for the fields
+        that low_cardinality_values selects
+    """
+    return {
+        field_name: f"{class_info['name']}{key_to_class_name(field_info['json_key'])}"
+        for field_name, field_info in class_info["fields"].items()
+        if not field_info["is_list"] and low_cardinality_values(field_info)
+    }
+
+
+def generate_value_lookup_code(class_info: Dict[str, Any], low_cardinality: str) -> str:
+    """
+    Generate the value lookups of a class's low cardinality fields.
+
+    Every field gets a ``_<Class>_<field>_values`` lookup mapping each value
+    seen in the samples to its canonical object, an Enum member or a
+    shared string, preceded by its Enum class in ``"enum"`` mode.
+
+    Args:
+        class_info: Dictionary containing class definition information
+        low_cardinality: ``"enum"`` or ``"intern"``, see generate_class_code
+
+    Returns:
+        String containing the generated code, empty if no field qualifies
+    """
+    chunks: List[str] = []
+    for field_name, enum_name in enum_class_names(class_info).items():
+        values = low_cardinality_values(class_info["fields"][field_name])
+        lookup = _value_lookup_name(class_info, field_name)
+        if low_cardinality == "enum":
+            code = [f"class {enum_name}(str, Enum):"]
+            for member_name, value in zip(_enum_member_names(values), values):
+                code.append(f"    {member_name} = {value!r}")
+            code.append("")
+            code.append(f"{lookup} = _Canonical({{member.value: member for member in {enum_name}}})")
+        else:
+            code = [f"{lookup} = _Canonical({{"]
+            code.extend(f"    {value!r}: {value!r}," for value in values)
+            code.append("})")
+        chunks.append("\n".join(code) + "\n")
+    return "\n".join(chunks)
+
+
+def _enum_member_names(values: List[str]) -> List[str]:
+    """Unique upper case member names for Enum values."""
+    names: List[str] = []
+    for value in values:
+        base_name = to_identifier(camel_to_snake(value)).upper()
+        if base_name.startswith("_"):
+            # Enum reserves names starting with an underscore
+            base_name = f"VALUE{base_name}"
+        name = base_name
+        suffix = 2
+        while name in names:
+            name = f"{base_name}_{suffix}"
+            suffix += 1
+        names.append(name)
+    return names
+
+
+def _value_lookup_name(class_info: Dict[str, Any], field_name: str) -> str:
+    """Name of the value lookup of a low cardinality field."""
+    return f"_{class_info['name']}_{field_name}_values"
+
+
+def _value_lookups(class_info: Dict[str, Any], low_cardinality: Optional[str]) -> Dict[str, str]:
+    """Map the low cardinality fields of a class to their value lookup names."""
+    if not low_cardinality:
+        return {}
+    return {field_name: _value_lookup_name(class_info, field_name) for field_name in enum_class_names(class_info)}
+
+
+def generate_columnar_class_code(
+    class_info: Dict[str, Any],
+    to_json: bool = False,
+    low_cardinality: Optional[str] = None
+) -> str:
+    """
+    Generate the columnar batch class of a class decoded from list elements.
+
+    The ``<Name>Batch`` class takes the list of records and stores every
+    field as one column: an ``array`` for int, float and bool fields (a list
+    if some value does not fit, e.g. a null), a list of the raw values for
+    other fields. Columns are attributes named like the fields; indexing
+    and iteration create ``<Name>`` row objects on demand, and calling the
+    batch converts it back to a list of dictionaries.
+
+    Args:
+        class_info: Dictionary containing class definition information
+        to_json: Emit a ``to_json()`` method, see generate_class_code
+        low_cardinality: Decode low cardinality columns through their value
+            lookups, see generate_class_code
+
+    Returns:
+        String containing the generated batch class code
+    """
+    class_name = class_info["name"]
+    fields = class_info["fields"]
+    lookups = _value_lookups(class_info, low_cardinality)
+    code: List[str] = []
+    code.append(f"class {class_name}Batch:")
+    code.append(f'    """Columns of a list of {class_name} records."""')
+    code.append(f"    __slots__ = {('_length',) + tuple(fields)!r}")
+    code.append("")
+    code.append("    def __init__(self, records: list):")
+    code.append("        self._length = len(records)")
+    for field_name, field_info in fields.items():
+        json_key = field_info.get("json_key", field_name)
+        if field_name in lookups:
+            values = f"[{lookups[field_name]}[record.get({json_key!r})] for record in records]"
+        else:
+            values = f"[record.get({json_key!r}) for record in records]"
+        typecode = _column_typecode(field_info)
+        if typecode:
+            code.append(f"        self.{field_name} = _column({typecode!r}, {values})")
+        else:
+            code.append(f"        self.{field_name} = {values}")
+    code.append("")
+    code.append("    def __len__(self) -> int:")
+    code.append("        return self._length")
+    code.append("")
+    code.append(f"    def __getitem__(self, index: int) -> {class_name}:")
+    code.append(f"        return {class_name}(self.record(index))")
+    code.append("")
+    code.append("    def __iter__(self):")
+    code.append("        for index in range(self._length):")
+    code.append(f"            yield {class_name}(self.record(index))")
+    code.append("")
+    code.append("    def record(self, index: int) -> dict:")
+    if fields:
+        code.append("        return {")
+        for field_name, field_info in fields.items():
+            json_key = field_info.get("json_key", field_name)
+            if _column_typecode(field_info) == "b":
+                code.append(f"            {json_key!r}: _cell(self.{field_name}, index),")
+            else:
+                code.append(f"            {json_key!r}: self.{field_name}[index],")
+        code.append("        }")
+    else:
+        code.append("        return {}")
+    code.append("")
+    code.append("    def __call__(self) -> list:")
+    if fields:
+        # One pass over all columns at once instead of one record() call per row
+        code.append("        return [")
+        code.append("            {" + ", ".join(
+            f"{field_info.get('json_key', field_name)!r}: c{index}"
+            for index, (field_name, field_info) in enumerate(fields.items())
+        ) + "}")
+        names = ", ".join(f"c{index}" for index in range(len(fields)))
+        # A single column still unpacks the 1-tuples zip yields
+        trailing = "," if len(fields) == 1 else ""
+        code.append(f"            for {names}{trailing} in zip(")
+        for field_name, field_info in fields.items():
+            if _column_typecode(field_info):
+                code.append(f"                _column_values(self.{field_name}),")
+            else:
+                code.append(f"                self.{field_name},")
+        code.append("            )")
+        code.append("        ]")
+    else:
+        code.append("        return [{} for _ in range(self._length)]")
+    if to_json:
+        code.append("")
+        code.append("    def to_json(self, encode: Optional[Callable[[list], str]] = None) -> str:")
+        code.append("        return (encode or _json_encode)(self())")
+    code.append("")
+    return "\n".join(code)
+
+
+def _column_typecode(field_info: Dict[str, Any]) -> Optional[str]:
+    """Array typecode of a field's column, or None to store a list."""
+    members = [member for member in split_type_members(field_info["type"]) if member != "None"]
+    return COLUMN_TYPECODES.get(members[0]) if len(members) == 1 else None
+
+
+def _class_lines(
+    class_info: Dict[str, Any],
+    slots: bool,
+    fast_decode: bool,
+    strict: bool,
+    lazy: bool,
+    to_json: bool,
+    columnar: bool,
+    low_cardinality: Optional[str],
+    compact_pickle: bool,
+    validate: bool
+) -> List[str]:
+    """Generate the lines of a single class, without its nested classes."""
     code: List[str] = []
     class_name = class_info["name"]
-    imported_classes.add(class_name)
-    
-    # Collect nested classes
-    nested_classes: List[str] = []
-    for field in class_info["fields"].values():
-        if field["info"]:
-            nested_class_code = generate_class_code(field["info"], imported_classes)
-            if nested_class_code not in nested_classes:
-                nested_classes.append(nested_class_code)
+    # Low cardinality fields decoded through their value lookups
+    lookups = _value_lookups(class_info, low_cardinality)
+    enum_names = enum_class_names(class_info) if low_cardinality == "enum" else {}
+    # Nested fields behind a _LazyField; columnar batches are built eagerly
+    lazy_fields = {
+        field_name for field_name, field_info in class_info["fields"].items()
+        if lazy and field_info["info"] and not _is_batched(field_info, columnar)
+        and not list_elements_nullable(field_info)
+    }
     
     # Generate current class code
+    if validate:
+        code.append("@_checked")
     code.append(f"class {class_name}:")
+    if slots:
+        slot_names: List[str] = []
+        for field_name, field_info in class_info["fields"].items():
+            if field_name in lazy_fields:
+                slot_names.extend([f"_raw_{field_name}", f"_{field_name}"])
+            else:
+                slot_names.append(field_name)
+        code.append(f"    __slots__ = {tuple(slot_names)!r}")
+        if class_info["fields"]:
+            code.append("")
     
     # Generate class attributes with type hints
     for field_name, field_info in class_info["fields"].items():
-        code.append(f"    {field_name}: {field_info['type']}")
+        if _is_batched(field_info, columnar):
+            batch_type = f"{field_info['list_element_type']}Batch"
+            field_type = make_optional(batch_type) if "None" in split_type_members(field_info["type"]) else batch_type
+        elif field_name in enum_names:
+            enum_name = enum_names[field_name]
+            field_type = make_optional(enum_name) if "None" in split_type_members(field_info["type"]) else enum_name
+        else:
+            field_type = field_info["type"]
+        code.append(f"    {field_name}: {field_type}")
+    
+    # Descriptors decoding nested fields on first access
+    for field_name, field_info in class_info["fields"].items():
+        if field_name not in lazy_fields:
+            continue
+        if field_info["is_custom_class"]:
+            code.append(f"    {field_name} = _LazyField({field_info['info']['name']})")
+        else:
+            code.append(f"    {field_name} = _LazyField({field_info['list_element_type']}, many=True)")
     
     # Generate __init__ method
     code.append("")
-    code.append("    def __init__(self, data: dict):")
-    
-    # Initialize each field
-    for field_name, field_info in class_info["fields"].items():
-        # Convert snake_case back to camelCase for JSON key
-        json_key = field_name
-        # if '_' in field_name:
-        #     json_key = ''.join(word.capitalize() for word in field_name.split('_'))
-        #     json_key = json_key[0].lower() + json_key[1:]
+    if fast_decode:
+        code.extend(_fast_decode_lines(class_info, strict, lazy_fields, columnar, lookups))
+    else:
+        code.append("    def __init__(self, data: dict):")
         
-        if field_info["is_custom_class"]:
-            # Initialize custom class
-            code.append(f"        self.{field_name} = {field_info['type']}(data.get('{json_key}', {{}}) or {{}})")
-        elif field_info["is_list"]:
-            if field_info["list_element_is_custom"]:
-                # Initialize list of custom classes
-                code.append(f"        self.{field_name} = [")
-                code.append(f"            {field_info['list_element_type']}(item) "
-                            f"for item in data.get('{json_key}', []) or []")
-                code.append(f"        ]")
+        # Initialize each field
+        for field_name, field_info in class_info["fields"].items():
+            json_key = field_info.get("json_key", field_name)
+            
+            if field_name in lazy_fields:
+                # Keep the raw value for the lazy descriptor
+                code.append(f"        self._raw_{field_name} = data.get({json_key!r})")
+            elif _is_batched(field_info, columnar):
+                # Store the list column-wise
+                code.append(f"        self.{field_name} = {field_info['list_element_type']}Batch("
+                            f"data.get({json_key!r}, []) or [])")
+            elif field_info["is_custom_class"]:
+                # Initialize custom class
+                code.append(f"        self.{field_name} = {field_info['info']['name']}(data.get({json_key!r}, {{}}) or {{}})")
+            elif field_info["is_list"]:
+                if field_info["list_element_is_custom"]:
+                    # Initialize list of custom classes
+                    code.append(f"        self.{field_name} = [")
+                    code.append(f"            {_item_decoder(field_info, 'item')} "
+                                f"for item in data.get({json_key!r}, []) or []")
+                    code.append(f"        ]")
+                else:
+                    # Initialize list of basic types
+                    code.append(f"        self.{field_name} = data.get({json_key!r}, []) or []")
+            elif field_name in lookups:
+                # Canonical object of the value
+                code.append(f"        self.{field_name} = {lookups[field_name]}[data.get({json_key!r})]")
             else:
-                # Initialize list of basic types
-                code.append(f"        self.{field_name} = data.get('{json_key}', []) or []")
-        else:
-            # Initialize basic type
-            code.append(f"        self.{field_name} = data.get('{json_key}')")
+                # Initialize basic type
+                code.append(f"        self.{field_name} = data.get({json_key!r})")
+        if not class_info["fields"]:
+            code.append("        pass")
+    if validate:
+        code.append("")
+        code.extend(_checked_init_lines(class_info, lookups))
 
     code.append("")
     
     # Generate __call__ method to convert back to dictionary
     code.append("    def __call__(self) -> dict:")
-    code.append("        result = {}")
-    for field_name, field_info in class_info["fields"].items():
-        # Convert snake_case back to camelCase for JSON key
-        json_key = field_name
-        # if '_' in field_name:
-        #     json_key = ''.join(word.capitalize() for word in field_name.split('_'))
-        #     json_key = json_key[0].lower() + json_key[1:]
+    if class_info["fields"]:
+        code.append("        return {")
+        for field_name, field_info in class_info["fields"].items():
+            json_key = field_info.get("json_key", field_name)
             
+            if field_name in lazy_fields:
+                code.append(f"            {json_key!r}: {class_name}.{field_name}.dump(self),")
+            elif _is_batched(field_info, columnar):
+                code.append(f"            {json_key!r}: self.{field_name}() if self.{field_name} is not None else [],")
+            elif field_info["is_custom_class"]:
+                code.append(f"            {json_key!r}: self.{field_name}() if self.{field_name} else None,")
+            elif field_info["is_list"] and field_info["list_element_is_custom"]:
+                encoded = "item()"
+                if list_elements_nullable(field_info):
+                    encoded += " if item is not None else None"
+                code.append(f"            {json_key!r}: [{encoded} for item in self.{field_name}] if self.{field_name} else [],")
+            else:
+                code.append(f"            {json_key!r}: self.{field_name},")
+        code.append("        }")
+    else:
+        code.append("        return {}")
+    
+    if to_json:
+        # Encode straight from the dict literal with the pluggable encoder
+        code.append("")
+        code.append("    def to_json(self, encode: Optional[Callable[[dict], str]] = None) -> str:")
+        code.append("        return (encode or _json_encode)(self())")
+
+    if compact_pickle and class_info["fields"]:
+        # Field values by position; pickle stores the class once per stream
+        values: List[str] = []
+        targets: List[str] = []
+        for field_name in class_info["fields"]:
+            if field_name in lazy_fields:
+                # Never decoded values stay raw
+                values.append(f"{class_name}.{field_name}.dump(self)")
+                targets.append(f"self._raw_{field_name}")
+            else:
+                values.append(f"self.{field_name}")
+                targets.append(f"self.{field_name}")
+        code.append("")
+        code.append("    def __getstate__(self) -> tuple:")
+        code.append(f"        return ({', '.join(values)}{',' if len(values) == 1 else ''})")
+        code.append("")
+        code.append("    def __setstate__(self, state: tuple) -> None:")
+        code.append(f"        {', '.join(targets)}{',' if len(targets) == 1 else ''} = state")
+    code.append("")
+    return code
+
+
+def _tuple_record_lines(
+    class_info: Dict[str, Any],
+    strict: bool,
+    to_json: bool,
+    low_cardinality: Optional[str]
+) -> List[str]:
+    """Generate the lines of a single tuple record, without its nested classes."""
+    code: List[str] = []
+    class_name = class_info["name"]
+    fields = class_info["fields"]
+    lookups = _value_lookups(class_info, low_cardinality)
+    enum_names = enum_class_names(class_info) if low_cardinality == "enum" else {}
+    
+    code.append(f"class {class_name}(_Record):")
+    code.append("    __slots__ = ()")
+    code.append(f"    _fields = {tuple(fields)!r}")
+    if fields:
+        code.append("")
+    for field_name, field_info in fields.items():
+        nullable = "None" in split_type_members(field_info["type"])
+        if field_info["is_list"]:
+            # Lists are decoded into tuples, which are never None
+            element_type = field_info["list_element_type"]
+            if list_elements_nullable(field_info):
+                element_type = make_optional(element_type)
+            field_type = f"Tuple[{element_type}, ...]"
+        elif field_name in enum_names:
+            field_type = make_optional(enum_names[field_name]) if nullable else enum_names[field_name]
+        else:
+            field_type = field_info["type"]
+        code.append(f"    {field_name}: {field_type}")
+    for index, field_name in enumerate(fields):
+        code.append(f"    {field_name} = property(_itemgetter({index}))")
+    
+    # (decoder or None if there is none, expression after it) in field order
+    values: List[Tuple[Optional[str], str]] = []
+    uses_get = False
+    for field_name, field_info in fields.items():
+        json_key = field_info.get("json_key", field_name)
+        required = strict and not field_info.get("optional", False)
+        non_null = required and "None" not in split_type_members(field_info["type"])
+        if required:
+            source = f"data[{json_key!r}]"
+        else:
+            source = f"get({json_key!r})"
+            uses_get = True
         if field_info["is_custom_class"]:
-            code.append(f"        result['{json_key}'] = self.{field_name}() if self.{field_name} else None")
-        elif field_info["is_list"] and field_info["list_element_is_custom"]:
-            code.append(f"        result['{json_key}'] = [item() for item in self.{field_name}] if self.{field_name} else []")
+            values.append((f"{field_info['info']['name']}.from_dict", f"({source})" if non_null else f"({source} or {{}})"))
+        elif list_elements_nullable(field_info):
+            items = source if non_null else f"{source} or ()"
+            values.append((None, f"tuple({_item_decoder(field_info, 'item', '.from_dict')} for item in {items})"))
+        elif field_info["list_element_is_custom"]:
+            values.append((f"{field_info['list_element_type']}.from_list", f"({source})" if non_null else f"({source} or ())"))
+        elif _holds_lists(field_info):
+            # Nested lists become nested tuples too
+            values.append(("_freeze", f"({source})" if non_null or not field_info["is_list"] else f"({source} or ())"))
+        elif field_info["is_list"]:
+            values.append((None, f"tuple({source})" if non_null else f"tuple({source} or ())"))
+        elif field_name in lookups:
+            values.append((lookups[field_name], f"[{source}]"))
         else:
-            code.append(f"        result['{json_key}'] = self.{field_name}")
-    code.append("        return result")
+            values.append((None, source))
+    
+    code.append("")
+    code.append("    @classmethod")
+    code.append(f"    def from_dict(cls, data: dict) -> {class_name!r}:")
+    if uses_get:
+        code.append("        get = data.get")
+    if fields:
+        code.append("        return _tuple_new(cls, (")
+        for decoder, value in values:
+            code.append(f"            {decoder or ''}{value},")
+        code.append("        ))")
+    else:
+        code.append("        return _tuple_new(cls, ())")
+    
     code.append("")
+    code.append("    @classmethod")
+    code.append("    def from_list(cls, records: list) -> tuple:")
+    code.append("        new = _tuple_new")
+    # Pre-bind nested decoders and value lookups so the loop does no
+    # attribute or global lookups
+    for field_name, (decoder, _) in zip(fields, values):
+        if decoder:
+            code.append(f"        decode_{field_name} = {decoder}")
+    code.append("        result = []")
+    code.append("        append = result.append")
+    code.append("        for data in records:")
+    if uses_get:
+        code.append("            get = data.get")
+    if fields:
+        code.append("            append(new(cls, (")
+        for field_name, (decoder, value) in zip(fields, values):
+            code.append(f"                {f'decode_{field_name}' if decoder else ''}{value},")
+        code.append("            )))")
+    else:
+        code.append("            append(new(cls, ()))")
+    code.append("        return tuple(result)")
     
-    # Combine nested classes and current class code
-    return "\n".join(nested_classes + code)
+    code.append("")
+    code.append("    def to_dict(self) -> dict:")
+    if fields:
+        code.append("        return {")
+        for index, (field_name, field_info) in enumerate(fields.items()):
+            json_key = field_info.get("json_key", field_name)
+            if field_info["is_custom_class"]:
+                code.append(f"            {json_key!r}: self[{index}].to_dict() if self[{index}] is not None else None,")
+            elif field_info["list_element_is_custom"]:
+                encoded = "item.to_dict()"
+                if list_elements_nullable(field_info):
+                    encoded += " if item is not None else None"
+                code.append(f"            {json_key!r}: [{encoded} for item in self[{index}]],")
+            elif _holds_lists(field_info):
+                code.append(f"            {json_key!r}: _thaw(self[{index}]),")
+            elif field_info["is_list"]:
+                code.append(f"            {json_key!r}: list(self[{index}]),")
+            else:
+                code.append(f"            {json_key!r}: self[{index}],")
+        code.append("        }")
+    else:
+        code.append("        return {}")
+    
+    if to_json:
+        code.append("")
+        code.append("    def to_json(self, encode: Optional[Callable[[dict], str]] = None) -> str:")
+        code.append("        return (encode or _json_encode)(self.to_dict())")
+    code.append("")
+    return code
 
 
-def generate_type_declare_file(json_path: str, output_path: Optional[str] = None) -> None:
+def _fast_decode_lines(
+    class_info: Dict[str, Any],
+    strict: bool,
+    lazy_fields: Set[str],
+    columnar: bool,
+    lookups: Dict[str, str]
+) -> List[str]:
+    """Generate the fast decode ``__init__`` and ``from_list`` methods."""
+    fields = class_info["fields"]
+    # (attribute, expression before the decoder, expression after it)
+    assignments: List[Tuple[str, str, str]] = []
+    uses_get = False
+    for field_name, field_info in fields.items():
+        json_key = field_info.get("json_key", field_name)
+        # Direct indexing only where every sample had the key and no nulls
+        required = strict and not field_info.get("optional", False)
+        non_null = required and "None" not in split_type_members(field_info["type"])
+        if required:
+            source = f"data[{json_key!r}]"
+        else:
+            source = f"get({json_key!r})"
+            uses_get = True
+        
+        if field_name in lazy_fields:
+            # Keep the raw value for the lazy descriptor
+            assignments.append((f"_raw_{field_name}", "", source))
+        elif field_info["is_custom_class"]:
+            assignments.append((field_name, None, f"({source})" if non_null else f"({source} or {{}})"))
+        elif list_elements_nullable(field_info):
+            items = source if non_null else f"{source} or []"
+            assignments.append((field_name, "", f"[{_item_decoder(field_info, 'item')} for item in {items}]"))
+        elif field_info["is_list"] and field_info["list_element_is_custom"]:
+            assignments.append((field_name, None, f"({source})" if non_null else f"({source} or [])"))
+        elif field_info["is_list"]:
+            assignments.append((field_name, "", source if non_null else f"{source} or []"))
+        elif field_name in lookups:
+            assignments.append((field_name, None, f"[{source}]"))
+        else:
+            assignments.append((field_name, "", source))
+    
+    code: List[str] = []
+    code.append("    def __init__(self, data: dict):")
+    if uses_get:
+        code.append("        get = data.get")
+    for (attribute, decoder, value), (field_name, field_info) in zip(assignments, fields.items()):
+        if decoder is None:
+            decoder = lookups.get(field_name) or _decoder_name(field_info, columnar)
+        code.append(f"        self.{attribute} = {decoder}{value}")
+    if not fields:
+        code.append("        pass")
+    
+    code.append("")
+    code.append("    @classmethod")
+    code.append("    def from_list(cls, records: list) -> list:")
+    code.append("        new = object.__new__")
+    # Pre-bind nested decoders and value lookups so the loop does no
+    # attribute or global lookups
+    for field_name, field_info in fields.items():
+        if field_name in lookups:
+            code.append(f"        decode_{field_name} = {lookups[field_name]}")
+        elif field_info["info"] and field_name not in lazy_fields and not list_elements_nullable(field_info):
+            code.append(f"        decode_{field_name} = {_decoder_name(field_info, columnar)}")
+    code.append("        result = []")
+    code.append("        append = result.append")
+    code.append("        for data in records:")
+    code.append("            obj = new(cls)")
+    if uses_get:
+        code.append("            get = data.get")
+    for (attribute, decoder, value), field_name in zip(assignments, fields):
+        decoder = f"decode_{field_name}" if decoder is None else decoder
+        code.append(f"            obj.{attribute} = {decoder}{value}")
+    code.append("            append(obj)")
+    code.append("        return result")
+    return code
+
+
+def _checked_init_lines(class_info: Dict[str, Any], lookups: Dict[str, str]) -> List[str]:
+    """Generate the ``_checked_init`` method decoding and validating in one pass."""
+    code: List[str] = []
+    code.append("    def _checked_init(self, data: dict):")
+    code.append("        if type(data) is not dict:")
+    code.append("            raise ValidationError([], 'dict', data)")
+    for field_name, field_info in class_info["fields"].items():
+        json_key = field_info.get("json_key", field_name)
+        # Keys missing from some samples may be missing from the input too
+        optional = field_info.get("optional", False)
+        nullable = optional or "None" in split_type_members(field_info["type"])
+        # A method call per key; binding data.get allocates per instance
+        code.append(f"        value = data.get({json_key!r})")
+        if not optional:
+            code.append(f"        if value is None and {json_key!r} not in data:")
+            code.append(f"            raise ValidationError([{json_key!r}], {field_info['type']!r}, None, True)")
+        # Missing and null values decode as in the unchecked constructor
+        if field_info["is_custom_class"]:
+            # Inlined rather than a helper call per object; the path of an
+            # error is extended on the way out
+            class_name = field_info["info"]["name"]
+            code.append("        try:")
+            decoded = f"{class_name}(value)"
+            empty = f" if value is not None else _empty({class_name})" if nullable else ""
+            code.append(f"            self.{field_name} = {decoded}{empty}")
+            code.append("        except ValidationError as error:")
+            code.append(f"            error.path.insert(0, {json_key!r})")
+            code.append("            raise")
+        elif field_info["list_element_is_custom"]:
+            nullable_elements = ", True" if list_elements_nullable(field_info) else ""
+            decoded = f"_check_list({field_info['list_element_type']}, value, {json_key!r}{nullable_elements})"
+            code.append(f"        self.{field_name} = {decoded}{' if value is not None else []' if nullable else ''}")
+        elif field_info["is_list"]:
+            element_types = _validated_types(field_info["list_element_type"], False)
+            types = f"({', '.join(element_types)},)" if element_types else "None"
+            decoded = f"_check_items({types}, {field_info['list_element_type']!r}, value, {json_key!r})"
+            code.append(f"        self.{field_name} = {decoded}{' if value is not None else []' if nullable else ''}")
+        else:
+            types = _validated_types(field_info["type"], nullable)
+            if types:
+                condition = f"is not {types[0]}" if len(types) == 1 else f"not in ({', '.join(types)})"
+                code.append(f"        if type(value) {condition}:")
+                code.append(f"            raise ValidationError([{json_key!r}], {field_info['type']!r}, value)")
+            if field_name in lookups:
+                code.append(f"        self.{field_name} = {lookups[field_name]}[value]")
+            else:
+                code.append(f"        self.{field_name} = value")
+    return code
+
+
+def _validated_types(type_str: str, nullable: bool) -> Optional[List[str]]:
+    """Python types accepted for a type string, or None to accept any value."""
+    if type_str == "None":
+        # Only nulls were seen, so there is no evidence of the type
+        return None
+    types: List[str] = []
+    for member in split_type_members(type_str) + (["None"] if nullable else []):
+        if member == "Any":
+            return None
+        if member.startswith("List["):
+            names = ("list",)
+        else:
+            # Everything else is an object, a nested class or Dict[str, Any]
+            names = VALIDATED_TYPES.get(member, ("dict",))
+        types.extend(name for name in names if name not in types)
+    return types
+
+
+def _decoder_name(field_info: Dict[str, Any], columnar: bool) -> str:
+    """Expression decoding the raw value of a nested class field."""
+    if field_info["is_custom_class"]:
+        return field_info["info"]["name"]
+    if columnar:
+        return f"{field_info['list_element_type']}Batch"
+    return f"{field_info['list_element_type']}.from_list"
+
+
+def _item_decoder(field_info: Dict[str, Any], item: str, method: str = "") -> str:
+    """Expression decoding one element of a list of nested objects, keeping null elements."""
+    decoded = f"{field_info['list_element_type']}{method}({item})"
+    if list_elements_nullable(field_info):
+        return f"{decoded} if {item} is not None else None"
+    return decoded
+
+
+def _holds_lists(field_info: Dict[str, Any]) -> bool:
+    """Check whether a basic field's values may contain lists, frozen by tuple records."""
+    if field_info["info"] is not None:
+        return False
+    type_str = field_info["list_element_type"] if field_info["is_list"] else field_info["type"]
+    return "List[" in type_str or "Any" in type_str
+
+
+def _is_batched(field_info: Dict[str, Any], columnar: bool) -> bool:
+    """Check whether a field is decoded into a columnar batch class."""
+    return columnar and field_info["list_element_is_custom"] and not list_elements_nullable(field_info)
+
+
+def analyze_json_file(
+    json_path: str,
+    stream: bool = False,
+    max_samples: Optional[int] = None,
+    sampling: str = "first",
+    naming: NamingPolicy = "snake",
+    stats: Optional[GenerationStats] = None,
+    max_enum_values: Optional[int] = None,
+    from_schema: bool = False
+) -> Dict[str, Any]:
     """
-    Generate a Python file with type declarations from a JSON file.
+    Analyze a JSON file, naming the root class after the file.
 
     Args:
         json_path: Path to the input JSON file
-        output_path: Path for the output Python file (optional)
+        stream: Read the input incrementally as NDJSON records or as the
+            elements of a top-level array, merging every record into one
+            schema instead of loading the whole document; ``.ndjson`` and
+            ``.jsonl`` files are always streamed, see is_line_delimited
+        max_samples: Maximum number of elements inspected per array
+            (all elements when None)
+        sampling: How array elements are sampled when an array exceeds
+            ``max_samples``: ``"first"`` or ``"reservoir"``
+        naming: Naming policy for field names, see resolve_naming_policy
+        stats: Records the ``load`` and ``analyze`` phases (a single
+            ``stream`` phase when streaming)
+        max_enum_values: Collect value statistics of string fields, see
+            analyze_json_structure
+        from_schema: The file is a JSON Schema document, converted with
+            from_json_schema instead of being analyzed; its ``title``
+            names the root class if present
+
+    Returns:
+        Dictionary containing class definition information
     """
-    # Read JSON data
-    with open(json_path, 'r', encoding='utf-8') as f:
-        json_data = json.load(f)
-    
     # Extract root class name from JSON filename
     file_name = os.path.splitext(os.path.basename(json_path))[0]
     root_class_name = snake_to_pascal(file_name)
     
+    if from_schema:
+        with measure(stats, "load"), open(json_path, 'r', encoding='utf-8') as f:
+            schema = json.load(f)
+        with measure(stats, "analyze"):
+            return from_json_schema(schema, None if schema.get("title") else root_class_name, naming)
+    
+    if stream or is_line_delimited(json_path):
+        # Fold records into a running schema without loading the document
+        with measure(stats, "stream"):
+            return infer_schema_from_file(json_path, root_class_name, max_samples, sampling, naming, max_enum_values)
+    
+    # Read JSON data
+    with measure(stats, "load"), open(json_path, 'r', encoding='utf-8') as f:
+        json_data = json.load(f)
+    
     # Analyze JSON structure
-    class_info = analyze_json_structure(json_data, root_class_name)
+    with measure(stats, "analyze"):
+        return analyze_json_structure(json_data, root_class_name, max_samples, sampling, naming, max_enum_values)
+
+
+def generate_module_code(class_info: Dict[str, Any], **codegen_options: Any) -> str:
+    """
+    Generate the source of a complete Python module from class information.
+
+    Args:
+        class_info: Dictionary containing class definition information
+        **codegen_options: Options passed to generate_class_code
+
+    Returns:
+        String containing the import statements and all generated classes
+    """
+    return "".join(iter_module_code(class_info, **codegen_options))
+
+
+def iter_module_code(class_info: Dict[str, Any], **codegen_options: Any) -> Iterator[str]:
+    """
+    Generate the source of a complete Python module chunk by chunk.
+
+    Args:
+        class_info: Dictionary containing class definition information
+        **codegen_options: Options passed to iter_class_code
+
+    Yields:
+        The import statements, then the chunks of iter_class_code
+    """
+    # Generate import statements
+    typing_names = "List, Dict, Any, Optional, Union, Callable"
+    if codegen_options.get("backend") == "tuple":
+        typing_names += ", Tuple"
+    imports = [f"from typing import {typing_names}"]
+    yield "\n".join(imports) + "\n\n"
     
     # Generate class code
-    imported_classes: Set[str] = set()
-    class_code = generate_class_code(class_info, imported_classes)
-    
+    yield from iter_class_code(class_info, **codegen_options)
+
+
+def write_module_code(class_info: Dict[str, Any], fp: TextIO, **codegen_options: Any) -> int:
+    """
+    Write the source of a complete Python module to a text file object.
+
+    Every class is written as soon as it is generated, so memory use does
+    not grow with the size of the output and the first classes reach a
+    pipe before the last ones are generated.
+
+    Args:
+        class_info: Dictionary containing class definition information
+        fp: Text file object, e.g. an open file or sys.stdout
+        **codegen_options: Options passed to iter_class_code
+
+    Returns:
+        Number of bytes written, in UTF-8
+    """
+    written = 0
+    for chunk in iter_module_code(class_info, **codegen_options):
+        fp.write(chunk)
+        written += len(chunk.encode("utf-8"))
+    return written
+
+
+def generate_type_declare_file(
+    json_path: str,
+    output_path: Optional[str] = None,
+    stream: bool = False,
+    max_samples: Optional[int] = None,
+    sampling: str = "first",
+    naming: NamingPolicy = "snake",
+    verbose: bool = True,
+    stats: Optional[GenerationStats] = None,
+    cache: Optional[GenerationCache] = None,
+    package: Optional[str] = None,
+    max_enum_values: Optional[int] = None,
+    from_schema: bool = False,
+    schema_path: Optional[str] = None,
+    update: bool = False,
+    **codegen_options: Any
+) -> str:
+    """
+    Generate a Python file with type declarations from a JSON file.
+
+    Args:
+        json_path: Path to the input JSON file
+        output_path: Path for the output Python file (optional); ``"-"``
+            writes the module to standard output
+        stream: Read the input incrementally as NDJSON records or as the
+            elements of a top-level array, merging every record into one
+            schema instead of loading the whole document
+        max_samples: Maximum number of elements inspected per array
+            (all elements when None)
+        sampling: How array elements are sampled when an array exceeds
+            ``max_samples``: ``"first"`` or ``"reservoir"``
+        naming: Naming policy for field names, see resolve_naming_policy
+        verbose: Print the path of the generated file (to standard error
+            when writing to standard output)
+        stats: Records the ``load``, ``analyze`` and ``generate`` phases,
+            where ``generate`` includes writing the classes out as they are
+            generated, and counts the emitted file, classes, fields and bytes
+        cache: Skip analysis when the input and options are unchanged since
+            the output was generated, and skip generation and writing when
+            the analyzed schema is unchanged
+        package: Write a lazily loaded package instead of a single module,
+            with ``"class"`` or ``"group"`` layout (see write_package);
+            the output path is then the package directory, by default the
+            input path without extension
+        max_enum_values: Collect value statistics of string fields with up
+            to this many distinct values, used by the ``low_cardinality``
+            code generation option (DEFAULT_MAX_ENUM_VALUES when that option
+            is set)
+        from_schema: The input is a JSON Schema document rather than a
+            sample, see analyze_json_file
+        schema_path: Also write the analyzed schema as JSON Schema to this
+            path, so later runs can generate from it with ``from_schema``
+        update: Patch an existing output module, rewriting only the
+            classes whose shape changed, see update_module_file
+        **codegen_options: Options passed to generate_class_code,
+            e.g. ``slots=True``
+
+    Returns:
+        Path of the written output file
+    """
     # Determine output path
     if not output_path:
-        output_path = json_path.replace(".json", ".py")
+        output_path = os.path.splitext(json_path)[0] + ("" if package else ".py")
     
-    # Generate import statements
-    imports = ["from typing import List, Dict, Any, Optional"]
+    if output_path == "-":
+        cache = None
+    if max_enum_values is None and codegen_options.get("low_cardinality"):
+        max_enum_values = DEFAULT_MAX_ENUM_VALUES
+    options = dict(codegen_options, stream=stream, max_samples=max_samples, sampling=sampling,
+                   naming=naming, package=package, max_enum_values=max_enum_values,
+                   from_schema=from_schema, schema_path=schema_path, update=update)
+    if cache is not None and cache.input_is_current(json_path, output_path, options):
+        return _report_up_to_date(output_path, verbose)
     
-    # Write output file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write("\n".join(imports) + "\n\n")
-        f.write(class_code)
+    class_info = analyze_json_file(json_path, stream, max_samples, sampling, naming, stats, max_enum_values,
+                                   from_schema)
+    if schema_path:
+        write_json_schema(class_info, schema_path)
     
-    print(f"Type declaration file generated: {output_path}")
+    if cache is not None:
+        key = schema_key(class_info, dict(codegen_options, package=package))
+        if cache.schema_is_current(output_path, key):
+            # Only values changed; remember the input so analysis is skipped next time
+            cache.store(json_path, output_path, options, key)
+            return _report_up_to_date(output_path, verbose)
+    
+    write_output(class_info, output_path, package, stats, update, **codegen_options)
+    
+    if cache is not None:
+        cache.store(json_path, output_path, options, key)
+    
+    if verbose:
+        print(f"Type declaration file generated: {output_path}",
+              file=sys.stderr if output_path == "-" else sys.stdout)
+    return output_path
+
+
+def write_output(
+    class_info: Dict[str, Any],
+    output_path: str,
+    package: Optional[str] = None,
+    stats: Optional[GenerationStats] = None,
+    update: bool = False,
+    **codegen_options: Any
+) -> int:
+    """
+    Write the generated code of a schema to a module, package or stdout.
+
+    Args:
+        class_info: Dictionary containing class definition information
+        output_path: Path of the module, or of the package directory;
+            ``"-"`` writes the module to standard output
+        package: Package layout, see write_package (default: one module)
+        stats: Records the ``generate`` phase and counts the emitted file,
+            classes, fields and bytes
+        update: Patch an existing module file with update_module_file,
+            replacing only the classes whose source changed
+        **codegen_options: Options passed to generate_class_code
+
+    Returns:
+        Number of bytes written, in UTF-8
+    """
+    # Write classes out as they are generated
+    with measure(stats, "generate"):
+        if package:
+            # Imported here because the package writer builds on this module
+            from .package import write_package
+            written = write_package(class_info, output_path, package, **codegen_options)
+        elif output_path == "-":
+            written = write_module_code(class_info, sys.stdout, **codegen_options)
+            sys.stdout.flush()
+        elif update:
+            from .incremental import update_module_file
+            written = update_module_file(class_info, output_path, **codegen_options)
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                written = write_module_code(class_info, f, **codegen_options)
+    
+    if stats is not None:
+        classes = collect_classes(deduplicate_classes(class_info))
+        stats.count(files=1, classes=len(classes),
+                    fields=sum(len(info["fields"]) for info in classes),
+                    bytes=written)
+    return written
+
+
+def _report_up_to_date(output_path: str, verbose: bool) -> str:
+    """Report an output file that the cache found current."""
+    if verbose:
+        print(f"Type declaration file up to date: {output_path}")
+    return output_path
@@ -0,0 +1,163 @@
+"""
+Incremental regeneration.
+
+Patches an existing generated module instead of rewriting it. Top-level
+definitions are matched by name: only those whose generated source changed
+are replaced, new ones are inserted before their first use and removed ones
+are dropped. Unchanged classes keep their exact bytes and position, so
+diffs only show the classes whose shape changed.
+"""
+
+import ast
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# A top-level statement: (name if it defines one, leading lines, source lines, names used)
+Statement = Tuple[Optional[str], str, str, Set[str]]
+
+
+def patch_module_source(old_source: str, new_source: str) -> Optional[str]:
+    """
+    Patch a generated module so that it defines what a newly generated one does.
+
+    Classes, functions and single-name assignments at module level are
+    matched by name. A definition whose source is unchanged is kept as it
+    is, a changed one is replaced in place, and one that is not defined any
+    more is removed together with the blank lines before it. A new
+    definition is inserted before the first definition using it, or at the
+    end of the module.
+
+    Args:
+        old_source: Source of the existing module
+        new_source: Source of the freshly generated module
+
+    Returns:
+        Patched source, or None if the module cannot be patched: a source
+        does not parse, the other statements (imports, helper code) differ,
+        or a definition would come before a definition it uses
+    """
+    old_statements = _split_statements(old_source)
+    new_statements = _split_statements(new_source)
+    if old_statements is None or new_statements is None:
+        return None
+    (old_body, old_tail), (new_body, _) = old_statements, new_statements
+    if [text for name, _, text, _ in old_body if name is None] != [text for name, _, text, _ in new_body if name is None]:
+        # Different imports or helpers mean different options
+        return None
+    new_definitions = {name: statement for statement in new_body for name in [statement[0]] if name is not None}
+
+    body: List[Statement] = []
+    for statement in old_body:
+        name = statement[0]
+        if name is None:
+            body.append(statement)
+        elif name in new_definitions:
+            # The leading lines stay; the text is the new one, often the same
+            _, _, text, used = new_definitions[name]
+            body.append((name, statement[1], text, used))
+    old_names = {statement[0] for statement in old_body}
+    # Definitions added last-first, so each one lands before its new users too
+    for statement in reversed(new_body):
+        name = statement[0]
+        if name is None or name in old_names:
+            continue
+        users = [index for index, (_, _, _, used) in enumerate(body) if name in used]
+        body.insert(users[0] if users else len(body), statement)
+
+    # Names used while executing a statement must be defined before it
+    defined: Set[str] = set()
+    for name, _, _, used in body:
+        if (used & set(new_definitions)) - defined - {name}:
+            return None
+        if name is not None:
+            defined.add(name)
+    return "".join(leading + text for _, leading, text, _ in body) + old_tail
+
+
+def update_module_file(class_info: Dict[str, Any], output_path: str, **codegen_options: Any) -> int:
+    """
+    Regenerate a module, patching the existing file instead of rewriting it.
+
+    The file is only written if its content changes, so an unchanged schema
+    leaves it untouched. A missing file, or one that patch_module_source
+    cannot patch, is written as a whole.
+
+    Args:
+        class_info: Dictionary containing class definition information
+        output_path: Path of the module
+        **codegen_options: Options passed to generate_class_code
+
+    Returns:
+        Number of bytes written, in UTF-8 (0 if the file was already current)
+    """
+    # Imported here because the code generator writes through this module
+    from .code_generator import generate_module_code
+
+    new_source = generate_module_code(class_info, **codegen_options)
+    old_source = None
+    if os.path.exists(output_path):
+        with open(output_path, 'r', encoding='utf-8') as f:
+            old_source = f.read()
+        source = patch_module_source(old_source, new_source) or new_source
+    else:
+        source = new_source
+    if source == old_source:
+        return 0
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    return len(source.encode("utf-8"))
+
+
+def _split_statements(source: str) -> Optional[Tuple[List[Statement], str]]:
+    """Split a module into its top-level statements and the lines after them."""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    lines = source.splitlines(keepends=True)
+    statements: List[Statement] = []
+    end = 0
+    for node in tree.body:
+        decorators = getattr(node, "decorator_list", [])
+        start = min([node.lineno] + [decorator.lineno for decorator in decorators]) - 1
+        if start < end:
+            # Several statements on one line cannot be replaced separately
+            return None
+        statements.append((
+            _defined_name(node),
+            "".join(lines[end:start]),
+            "".join(lines[start:node.end_lineno]),
+            _used_names(node),
+        ))
+        end = node.end_lineno
+    return statements, "".join(lines[end:])
+
+
+def _defined_name(node: ast.stmt) -> Optional[str]:
+    """Name defined by a top-level statement, or None."""
+    if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+        return node.name
+    if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+        return node.targets[0].id
+    if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+        return node.target.id
+    return None
+
+
+def _used_names(node: ast.stmt) -> Set[str]:
+    """Names a statement reads when it is executed, leaving out function bodies."""
+    names: Set[str] = set()
+    stack: List[ast.AST] = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, ast.Name):
+            names.add(current.id)
+        elif isinstance(current, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            # Decorators, defaults and annotations run at definition time
+            stack.extend(current.decorator_list)
+            stack.append(current.args)
+            if current.returns is not None:
+                stack.append(current.returns)
+            continue
+        stack.extend(ast.iter_child_nodes(current))
+    return names
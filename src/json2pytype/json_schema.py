@@ -0,0 +1,396 @@
+"""
+JSON Schema import and export.
+
+Converts class definition information to and from JSON Schema (draft
+2020-12), so analyzed schemas can be stored and generated from later
+without re-reading the samples, and upstream JSON Schema documents can be
+fed straight into code generation.
+"""
+
+import json
+import keyword
+from typing import Any, Dict, List, Optional, Set
+from .naming import NamingPolicy, key_to_class_name, resolve_naming_policy
+from .structure_analyzer import Step, _drive, collect_classes, deduplicate_classes, merge_class_info
+from .type_inference import merge_python_types, split_type_members
+
+JSON_SCHEMA_DIALECT = "https://json-schema.org/draft/2020-12/schema"
+
+# JSON Schema types of the basic type strings
+SCHEMA_TYPES = {"int": "integer", "float": "number", "str": "string", "bool": "boolean", "None": "null"}
+
+_PYTHON_TYPES = {schema_type: type_str for type_str, schema_type in SCHEMA_TYPES.items()}
+
+
+def to_json_schema(class_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert class definition information to a JSON Schema document.
+
+    The root class is the document itself and every nested class is a
+    ``$defs`` entry named and titled after the class, referenced with
+    ``$ref``. Properties are keyed by JSON key and listed in field order;
+    keys that were missing from some samples are not ``required``.
+    Attribute names differing from the JSON key and the value statistics of
+    string fields are kept in ``x-python-name``, ``x-values`` and
+    ``x-value-count``, so from_json_schema restores a tree generating the
+    same code. The wrapper class of a root list of plain values is exported
+    as the schema of that list, like the document it was analyzed from.
+
+    Args:
+        class_info: Dictionary containing class definition information
+
+    Returns:
+        JSON Schema document as a dictionary
+    """
+    # Unique class names, so every class has one $defs entry
+    class_info = deduplicate_classes(class_info)
+    definitions = {info["name"]: _class_schema(info) for info in collect_classes(class_info)}
+    document = {"$schema": JSON_SCHEMA_DIALECT}
+    root_schema = definitions.pop(class_info["name"])
+    value_field = class_info["fields"].get("value")
+    if (len(class_info["fields"]) == 1 and value_field is not None and not value_field["is_list"]
+            and value_field["type"].startswith("List[")):
+        # The wrapper analyze_json_structure puts around a root list of plain values
+        root_schema = dict(_type_schema(value_field["type"]), title=class_info["name"])
+    document.update(root_schema)
+    if definitions:
+        document["$defs"] = definitions
+    return document
+
+
+def from_json_schema(
+    schema: Dict[str, Any],
+    class_name: Optional[str] = None,
+    naming: NamingPolicy = "snake"
+) -> Dict[str, Any]:
+    """
+    Convert a JSON Schema document to class definition information.
+
+    Objects with ``properties`` become classes, named after their
+    ``title``, their ``$defs`` key, or their position like analyzed
+    objects; ``allOf`` members are combined, ``anyOf``, ``oneOf`` and type
+    lists are merged like values of different samples, and string
+    ``enum`` and ``const`` values become value statistics usable by the
+    ``low_cardinality`` code generation option. Properties missing from
+    ``required`` become optional fields. A ``$ref`` cycle is cut with a
+    ``Dict[str, Any]`` field, since classes form a tree.
+
+    Args:
+        schema: JSON Schema document; only local ``$ref`` pointers are
+            resolved
+        class_name: Name for the root class (default: the document's
+            ``title``, or ``"Root"``)
+        naming: Naming policy for properties without ``x-python-name``,
+            see resolve_naming_policy
+
+    Returns:
+        Dictionary containing class definition information
+
+    Raises:
+        ValueError: If a ``$ref`` cannot be resolved
+    """
+    reader = _SchemaReader(schema, resolve_naming_policy(naming))
+    root_schema = reader.resolve(schema)
+    if class_name is None:
+        class_name = _title_class_name(root_schema["title"]) if root_schema.get("title") else "Root"
+    # The document may refer to itself as "#"
+    reader.reading.add("#")
+    return _drive(reader.read_root(root_schema, class_name))
+
+
+def write_json_schema(class_info: Dict[str, Any], schema_path: str) -> None:
+    """
+    Write the JSON Schema of class definition information to a file.
+
+    Args:
+        class_info: Dictionary containing class definition information
+        schema_path: Path of the JSON Schema file
+    """
+    with open(schema_path, 'w', encoding='utf-8') as f:
+        json.dump(to_json_schema(class_info), f, indent=2)
+        f.write("\n")
+
+
+def read_json_schema(
+    schema_path: str,
+    class_name: Optional[str] = None,
+    naming: NamingPolicy = "snake"
+) -> Dict[str, Any]:
+    """
+    Read class definition information from a JSON Schema file.
+
+    Args:
+        schema_path: Path of the JSON Schema file
+        class_name: Name for the root class, see from_json_schema
+        naming: Naming policy for field names, see resolve_naming_policy
+
+    Returns:
+        Dictionary containing class definition information
+    """
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        return from_json_schema(json.load(f), class_name, naming)
+
+
+def _class_schema(class_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Schema of one class, referencing its nested classes."""
+    properties: Dict[str, Any] = {}
+    required: List[str] = []
+    for field_name, field_info in class_info["fields"].items():
+        json_key = field_info.get("json_key", field_name)
+        property_schema = _type_schema(field_info["type"])
+        if field_name != json_key:
+            property_schema["x-python-name"] = field_name
+        if "value_count" in field_info:
+            property_schema["x-values"] = field_info["values"]
+            property_schema["x-value-count"] = field_info["value_count"]
+        properties[json_key] = property_schema
+        if not field_info["optional"]:
+            required.append(json_key)
+    schema = {"title": class_info["name"], "type": "object", "properties": properties}
+    if required:
+        schema["required"] = required
+    return schema
+
+
+def _type_schema(type_str: str) -> Dict[str, Any]:
+    """Schema of a type string; names of classes become references."""
+    schemas: List[Dict[str, Any]] = []
+    for member in split_type_members(type_str):
+        if member in SCHEMA_TYPES:
+            schemas.append({"type": SCHEMA_TYPES[member]})
+        elif member == "Any":
+            schemas.append({})
+        elif member == "Dict[str, Any]":
+            schemas.append({"type": "object"})
+        elif member.startswith("List[") and member.endswith("]"):
+            items = _type_schema(member[len("List["):-1])
+            schemas.append({"type": "array", "items": items} if items else {"type": "array"})
+        else:
+            schemas.append({"$ref": f"#/$defs/{member}"})
+    if len(schemas) == 1:
+        return schemas[0]
+    if all(list(schema) == ["type"] for schema in schemas):
+        # Plain types combine into a type list
+        return {"type": [schema["type"] for schema in schemas]}
+    return {"anyOf": schemas}
+
+
+class _SchemaReader:
+    """Converts the schemas of one JSON Schema document into class information."""
+
+    def __init__(self, document: Dict[str, Any], field_name_for: Any):
+        self.document = document
+        self.field_name_for = field_name_for
+        # Classes of referenced schemas, shared by every reference
+        self.classes: Dict[str, Dict[str, Any]] = {}
+        self.reading: Set[str] = set()
+
+    def resolve(self, schema: Any) -> Dict[str, Any]:
+        """Follow ``$ref`` pointers until a schema without one is reached."""
+        seen: Set[str] = set()
+        while isinstance(schema, dict) and "$ref" in schema:
+            ref = schema["$ref"]
+            if ref in seen:
+                raise ValueError(f"Circular $ref: {ref}")
+            seen.add(ref)
+            schema = self.lookup(ref)
+        return schema if isinstance(schema, dict) else {}
+
+    def lookup(self, ref: str) -> Any:
+        """Resolve a local JSON pointer such as ``#/$defs/Name``."""
+        if not ref.startswith("#"):
+            raise ValueError(f"Only local $ref pointers are supported: {ref}")
+        target: Any = self.document
+        for part in ref[1:].split("/")[1:]:
+            part = part.replace("~1", "/").replace("~0", "~")
+            try:
+                target = target[int(part)] if isinstance(target, list) else target[part]
+            except (KeyError, IndexError, ValueError, TypeError):
+                raise ValueError(f"Unresolvable $ref: {ref}") from None
+        return target
+
+    def read_root(self, schema: Dict[str, Any], class_name: str) -> Step:
+        """Step reading the root schema, wrapping non-objects like analyze_json_structure."""
+        if _is_class_schema(schema):
+            return (yield self.read_class(schema, class_name))
+        field_info = yield self.read_field("items", schema, class_name, True)
+        if not field_info["list_element_is_custom"]:
+            # Anything but a list of objects is kept as a plain value
+            field_info = _field("value", field_info["type"])
+        return {"name": class_name, "type": "class", "fields": {field_info["json_key"]: field_info}}
+
+    def read_class(self, schema: Dict[str, Any], class_name: str) -> Step:
+        """Step reading an object schema with properties into a class."""
+        properties: Dict[str, Any] = {}
+        required: Set[str] = set()
+        for part in [schema] + [self.resolve(member) for member in schema.get("allOf", ())]:
+            properties.update(part.get("properties", {}))
+            required.update(part.get("required", ()))
+        class_info: Dict[str, Any] = {"name": class_name, "type": "class", "fields": {}}
+        for key, property_schema in properties.items():
+            field_info = yield self.read_field(key, property_schema, class_name, key in required)
+            field_name = property_schema.get("x-python-name") or self.field_name_for(key)
+            class_info["fields"][field_name] = field_info
+        return class_info
+
+    def read_field(self, key: str, schema: Dict[str, Any], owner_name: str, required: bool) -> Step:
+        """Step reading a property schema into a field definition."""
+        pascal_key = key_to_class_name(key)
+        alternatives: List[Dict[str, Any]] = []
+        for ref, member in self.alternatives(schema):
+            if _is_class_schema(member):
+                info = yield self.read_reference(ref, member, f"{owner_name}{pascal_key}")
+                if info is None:
+                    alternatives.append(_field(key, "Dict[str, Any]"))
+                else:
+                    alternatives.append(_field(key, info["name"], info=info, is_custom_class=True))
+                continue
+            member_types = _schema_types(member)
+            if "array" not in member_types:
+                alternatives.extend(_field(key, self.basic_type(member, member_type)) for member_type in member_types)
+                continue
+            for member_type in member_types:
+                if member_type != "array":
+                    alternatives.append(_field(key, self.basic_type(member, member_type)))
+            element_types: List[str] = []
+            for element_ref, element in self.alternatives(member.get("items", {})):
+                if _is_class_schema(element):
+                    info = yield self.read_reference(element_ref, element, f"{pascal_key}Item")
+                    if info is None:
+                        element_types.append("Dict[str, Any]")
+                        continue
+                    alternatives.append(_field(
+                        key, f"List[{info['name']}]", info=info, is_list=True,
+                        list_element_type=info["name"], list_element_is_custom=True
+                    ))
+                else:
+                    element_types.extend(self.basic_type(element, element_type) for element_type in _schema_types(element))
+            if element_types or not alternatives:
+                element_type = _merge_types(element_types) if element_types else "Any"
+                alternatives.append(_field(key, f"List[{element_type}]", is_list=True, list_element_type=element_type))
+
+        field_info = alternatives[0] if alternatives else _field(key, "Any")
+        for alternative in alternatives[1:]:
+            # Merged like the same key in two samples
+            first = {"name": owner_name, "type": "class", "fields": {key: field_info}}
+            second = {"name": owner_name, "type": "class", "fields": {key: alternative}}
+            field_info = merge_class_info(first, second)["fields"][key]
+        field_info["optional"] = not required
+        self.read_values(schema, field_info)
+        return field_info
+
+    def read_reference(self, ref: Optional[str], schema: Dict[str, Any], class_name: str) -> Step:
+        """Step reading an object schema, once per referenced definition (None on a cycle)."""
+        if schema.get("title"):
+            class_name = _title_class_name(schema["title"])
+        elif ref is not None and ref.count("/") >= 2:
+            class_name = key_to_class_name(ref.rsplit("/", 1)[1].replace("~1", "/").replace("~0", "~"))
+        if ref is None:
+            return (yield self.read_class(schema, class_name))
+        if ref not in self.classes:
+            if ref in self.reading:
+                # A class cannot contain itself; the cycle stays a plain dict
+                return None
+            self.reading.add(ref)
+            self.classes[ref] = yield self.read_class(schema, class_name)
+            self.reading.discard(ref)
+        return self.classes[ref]
+
+    def alternatives(self, schema: Any) -> List[Any]:
+        """Flatten ``anyOf`` and ``oneOf`` into resolved member schemas with their references."""
+        members = [(None, schema)]
+        flattened = []
+        while members:
+            ref, member = members.pop(0)
+            if isinstance(member, dict) and "$ref" in member:
+                ref = member["$ref"]
+                member = self.resolve(member)
+            if not isinstance(member, dict):
+                member = {}
+            union = member.get("anyOf") or member.get("oneOf")
+            if union:
+                members[:0] = [(None, option) for option in union]
+            else:
+                flattened.append((ref, member))
+        return flattened
+
+    def basic_type(self, schema: Dict[str, Any], schema_type: str) -> str:
+        """Type string of a schema that is not a class."""
+        if schema_type == "object":
+            return "Dict[str, Any]"
+        if schema_type == "array":
+            element_types = [
+                self.basic_type(element, element_type)
+                for _, element in self.alternatives(schema.get("items", {}))
+                for element_type in _schema_types(element)
+            ]
+            return f"List[{_merge_types(element_types) if element_types else 'Any'}]"
+        return _PYTHON_TYPES.get(schema_type, "Any")
+
+    @staticmethod
+    def read_values(schema: Dict[str, Any], field_info: Dict[str, Any]) -> None:
+        """Attach stored value statistics, or string enums, to a string field."""
+        if [member for member in split_type_members(field_info["type"]) if member != "None"] != ["str"]:
+            return
+        if "x-value-count" in schema:
+            field_info["values"] = schema.get("x-values")
+            field_info["value_count"] = schema["x-value-count"]
+            return
+        values = schema.get("enum", [schema["const"]] if "const" in schema else None)
+        strings = sorted({value for value in values or () if isinstance(value, str)})
+        if strings:
+            # Declared values count as seen often enough to qualify
+            field_info["values"] = strings
+            field_info["value_count"] = 2 * len(strings)
+
+
+def _title_class_name(title: str) -> str:
+    """Class name of a schema title; titles exported from class names are kept as they are."""
+    if title.isidentifier() and not keyword.iskeyword(title):
+        return title
+    return key_to_class_name(title)
+
+
+def _is_class_schema(schema: Dict[str, Any]) -> bool:
+    """Check whether a schema describes an object with known properties."""
+    return "properties" in schema or any("properties" in member for member in schema.get("allOf", ()))
+
+
+def _schema_types(schema: Dict[str, Any]) -> List[str]:
+    """JSON Schema types a schema admits, inferred from enums when untyped."""
+    if "type" in schema:
+        types = schema["type"]
+        return [types] if isinstance(types, str) else list(types)
+    values = schema.get("enum", [schema["const"]] if "const" in schema else None)
+    if values is None:
+        return ["object"] if "additionalProperties" in schema else ["any"]
+    types: List[str] = []
+    for value in values:
+        schema_type = "null" if value is None else SCHEMA_TYPES.get(type(value).__name__, "any")
+        if schema_type not in types:
+            types.append(schema_type)
+    return types
+
+
+def _merge_types(type_strs: List[str]) -> str:
+    """Merge type strings like values of different samples."""
+    merged = type_strs[0]
+    for type_str in type_strs[1:]:
+        merged = merge_python_types(merged, type_str)
+    return merged
+
+
+def _field(key: str, type_str: str, **overrides: Any) -> Dict[str, Any]:
+    """Field definition of a JSON key, as built by the analyzer."""
+    field_info = {
+        "json_key": key,
+        "optional": False,
+        "type": type_str,
+        "info": None,
+        "is_custom_class": False,
+        "is_list": False,
+        "list_element_type": None,
+        "list_element_is_custom": False
+    }
+    field_info.update(overrides)
+    return field_info
@@ -4,12 +4,36 @@ Naming convention conversion utilities.
 Provides functions to convert between different naming conventions:
 - camelCase to snake_case
 - snake_case to PascalCase
+
+Conversions are memoized in bounded caches, since the same keys recur in
+every object of a payload, and field naming is pluggable through naming
+policies.
 """
 
+import keyword
 import re
-from typing import Optional
+import weakref
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Union
+
+# Bound on the number of distinct names each conversion cache keeps
+NAMING_CACHE_SIZE = 8192
+
+NAMING_POLICIES = ("snake", "original")
+
+NamingPolicy = Union[str, Mapping[str, str], Callable[[str], str]]
 
+# Consecutive uppercase letters (e.g., ABCDef -> ABC_Def)
+_UPPER_RUN_RE = re.compile(r'([A-Z]+)([A-Z][a-z])')
+# Lowercase letter or digit followed by uppercase (e.g., abcDef -> abc_Def)
+_WORD_BOUNDARY_RE = re.compile(r'([a-z0-9])([A-Z])')
+_INVALID_IDENTIFIER_CHARS_RE = re.compile(r'\W')
 
+# Functions returned by resolve_naming_policy, which resolve to themselves
+_resolved_policies: "weakref.WeakSet[Callable[[str], str]]" = weakref.WeakSet()
+
+
+@lru_cache(maxsize=NAMING_CACHE_SIZE)
 def camel_to_snake(name: str) -> str:
     """
     Convert a camelCase string to snake_case.
@@ -22,14 +46,15 @@ def camel_to_snake(name: str) -> str:
     """
     if not name:
         return ""
-    
+
     # Handle consecutive uppercase letters (e.g., ABCDef -> abc_def)
-    name = re.sub(r'([A-Z]+)([A-Z][a-z])', r'\1_\2', name)
-    # Handle lowercase followed by uppercase (e.g., abcDef -> abc_def)
-    name = re.sub(r'([a-z])([A-Z])', r'\1_\2', name)
+    name = _UPPER_RUN_RE.sub(r'\1_\2', name)
+    # Handle lowercase or digit followed by uppercase (e.g., abcDef -> abc_def)
+    name = _WORD_BOUNDARY_RE.sub(r'\1_\2', name)
     return name.lower()
 
 
+@lru_cache(maxsize=NAMING_CACHE_SIZE)
 def snake_to_pascal(name: str) -> str:
     """
     Convert a snake_case string to PascalCase.
@@ -43,3 +68,122 @@ def snake_to_pascal(name: str) -> str:
     if not name:
         return ""
     return ''.join(word.capitalize() for word in name.split('_') if word)
+
+
+@lru_cache(maxsize=NAMING_CACHE_SIZE)
+def to_identifier(name: str) -> str:
+    """
+    Turn an arbitrary string into a valid Python identifier.
+
+    Invalid characters become underscores, a leading digit or an empty name
+    gets an underscore prefix and keywords get an underscore suffix.
+
+    Args:
+        name: Candidate attribute name
+
+    Returns:
+        Valid Python identifier
+    """
+    name = _INVALID_IDENTIFIER_CHARS_RE.sub('_', name)
+    if not name or name[0].isdigit():
+        name = f"_{name}"
+    if keyword.iskeyword(name):
+        name = f"{name}_"
+    return name
+
+
+@lru_cache(maxsize=NAMING_CACHE_SIZE)
+def key_to_class_name(key: str) -> str:
+    """
+    Convert a JSON key to the PascalCase part of a nested class name.
+
+    The name is a valid identifier on its own, since it also starts the
+    names of list item classes: a leading digit or an empty name gets an
+    underscore prefix, as in to_identifier.
+
+    Args:
+        key: JSON object key
+
+    Returns:
+        PascalCase name
+    """
+    return to_identifier(snake_to_pascal(to_identifier(camel_to_snake(key))))
+
+
+@lru_cache(maxsize=NAMING_CACHE_SIZE)
+def _snake_field_name(key: str) -> str:
+    """Field name of a JSON key under the snake policy."""
+    return to_identifier(camel_to_snake(key))
+
+
+@lru_cache(maxsize=NAMING_CACHE_SIZE)
+def _original_field_name(key: str) -> str:
+    """Field name of a JSON key under the original policy."""
+    return to_identifier(key)
+
+
+def resolve_naming_policy(naming: NamingPolicy = "snake") -> Callable[[str], str]:
+    """
+    Resolve a naming policy into a function from JSON keys to field names.
+
+    Args:
+        naming: ``"snake"`` (camelCase keys become snake_case attributes),
+            ``"original"`` (keys are kept as they are), a mapping from JSON
+            keys to attribute names (unmapped keys fall back to snake_case),
+            or a callable converting a key to an attribute name. Results
+            are always made valid identifiers.
+
+    Returns:
+        Function converting a JSON key to a field name; passing it back
+        to resolve_naming_policy returns it unchanged
+
+    Raises:
+        ValueError: If the policy name is unknown
+    """
+    if naming == "snake":
+        return _snake_field_name
+    if naming == "original":
+        return _original_field_name
+    if isinstance(naming, str):
+        raise ValueError(f"Unknown naming policy: {naming}")
+    if naming in _resolved_policies:
+        return naming
+    if isinstance(naming, Mapping):
+        name_map = dict(naming)
+
+        def field_name_for(key: str) -> str:
+            mapped = name_map.get(key)
+            return to_identifier(mapped) if mapped is not None else _snake_field_name(key)
+    else:
+        convert = naming
+
+        @lru_cache(maxsize=NAMING_CACHE_SIZE)
+        def field_name_for(key: str) -> str:
+            return to_identifier(convert(key))
+
+    _resolved_policies.add(field_name_for)
+    return field_name_for
+
+
+def naming_cache_info() -> Dict[str, Any]:
+    """
+    Report hit statistics of the naming caches.
+
+    Returns:
+        Dictionary mapping conversion names to functools CacheInfo tuples
+    """
+    return {
+        "camel_to_snake": camel_to_snake.cache_info(),
+        "snake_to_pascal": snake_to_pascal.cache_info(),
+        "to_identifier": to_identifier.cache_info(),
+        "key_to_class_name": key_to_class_name.cache_info(),
+        "snake_field_name": _snake_field_name.cache_info(),
+        "original_field_name": _original_field_name.cache_info(),
+    }
+
+
+def clear_naming_cache() -> None:
+    """Empty all naming caches and reset their statistics."""
+    for cached in (camel_to_snake, snake_to_pascal, to_identifier, key_to_class_name,
+                   _snake_field_name, _original_field_name):
+        cached.cache_clear()
@@ -0,0 +1,238 @@
+"""
+Package output.
+
+Writes the generated classes as a package of small modules instead of one
+large module. The package ``__init__`` imports a class's module only when
+the class is first accessed, and annotations are deferred with
+``from __future__ import annotations``, so importing the package costs
+almost nothing and using a class loads only the classes it depends on.
+"""
+
+import os
+from typing import Any, Dict, List, Set
+from .code_generator import (
+    CANONICAL_SOURCE,
+    COLUMNAR_SOURCE,
+    JSON_ENCODER_SOURCE,
+    LAZY_FIELD_SOURCE,
+    TUPLE_RECORD_SOURCE,
+    VALIDATION_SOURCE,
+    generate_class_code,
+    generate_columnar_class_code,
+    enum_class_names,
+    list_element_classes,
+)
+from .naming import camel_to_snake, to_identifier
+from .structure_analyzer import collect_classes, deduplicate_classes, list_elements_nullable
+
+PACKAGE_LAYOUTS = ("class", "group")
+
+HELPERS_MODULE = "_helpers"
+
+MODULE_HEADER = '''from __future__ import annotations
+
+from typing import List, Dict, Any, Optional, Union, Callable
+'''
+
+INIT_GETATTR_SOURCE = '''def __getattr__(name: str) -> Any:
+    """Import the module defining a class on first access."""
+    module_name = _CLASS_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Later lookups find the class without calling __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+'''
+
+INIT_JSON_ENCODER_SOURCE = '''def set_json_encoder(encode: Callable[[dict], str]) -> None:
+    """Replace the function used by to_json() to encode dictionaries."""
+    _helpers.set_json_encoder(encode)
+    # Modules imported already hold their own reference to the encoder
+    for module_name in set(_CLASS_MODULES.values()):
+        module = sys.modules.get(f"{__name__}.{module_name}")
+        if module is not None:
+            module._json_encode = encode
+'''
+
+
+def write_package(
+    class_info: Dict[str, Any],
+    package_dir: str,
+    layout: str = "class",
+    **codegen_options: Any
+) -> int:
+    """
+    Write the generated classes as a lazily loaded package.
+
+    Args:
+        class_info: Dictionary containing class definition information
+        package_dir: Directory of the package, created if missing
+        layout: ``"class"`` for one module per class, or ``"group"`` for
+            one module per field of the root class holding every class
+            first reached through it, with the root class in a module of
+            its own
+        **codegen_options: Options passed to generate_class_code
+
+    Returns:
+        Number of bytes written, in UTF-8
+
+    Raises:
+        ValueError: If the layout is unknown
+    """
+    if layout not in PACKAGE_LAYOUTS:
+        raise ValueError(f"Unknown package layout: {layout}")
+    class_info = deduplicate_classes(class_info)
+    lazy = codegen_options.get("lazy", False)
+    to_json = codegen_options.get("to_json", False)
+    columnar = codegen_options.get("columnar", False)
+    low_cardinality = codegen_options.get("low_cardinality")
+    tuple_backend = codegen_options.get("backend") == "tuple"
+    validate = codegen_options.get("validate", False)
+    header = MODULE_HEADER.replace("Callable", "Callable, Tuple") if tuple_backend else MODULE_HEADER
+    batched = list_element_classes(class_info) if columnar else set()
+    modules = _plan_modules(class_info, layout)
+    class_modules: Dict[str, str] = {}
+    for module_name, classes in modules.items():
+        for info in classes:
+            class_modules[info["name"]] = module_name
+            if info["name"] in batched:
+                # Batch classes live next to their row class
+                class_modules[f"{info['name']}Batch"] = module_name
+            if low_cardinality == "enum":
+                # Enum classes live next to the class using them
+                for enum_name in enum_class_names(info).values():
+                    class_modules[enum_name] = module_name
+
+    os.makedirs(package_dir, exist_ok=True)
+    files: Dict[str, str] = {}
+    if lazy or to_json or batched or low_cardinality or tuple_backend or validate:
+        helpers = [header]
+        if lazy:
+            helpers.append(LAZY_FIELD_SOURCE)
+        if to_json:
+            helpers.append(JSON_ENCODER_SOURCE)
+        if batched:
+            helpers.append(COLUMNAR_SOURCE)
+        if low_cardinality:
+            helpers.append(CANONICAL_SOURCE)
+        if tuple_backend:
+            helpers.append(TUPLE_RECORD_SOURCE)
+        if validate:
+            # One registry, so set_trusted switches the classes of every module
+            helpers.append(VALIDATION_SOURCE)
+        files[HELPERS_MODULE] = "\n".join(helpers)
+
+    for module_name, classes in modules.items():
+        code = [header]
+        imports: List[str] = []
+        if lazy:
+            imports.append(f"from .{HELPERS_MODULE} import _LazyField")
+        if to_json:
+            imports.append(f"from .{HELPERS_MODULE} import _json_encode")
+        if any(info["name"] in batched for info in classes):
+            imports.append(f"from .{HELPERS_MODULE} import _cell, _column, _column_values")
+        if low_cardinality and any(enum_class_names(info) for info in classes):
+            if low_cardinality == "enum":
+                imports.insert(0, "from enum import Enum")
+            imports.append(f"from .{HELPERS_MODULE} import _Canonical")
+        if tuple_backend:
+            imports.append(f"from .{HELPERS_MODULE} import _Record, _freeze, _itemgetter, _thaw, _tuple_new")
+        if validate:
+            imports.append(
+                f"from .{HELPERS_MODULE} import ValidationError, _NoneType, _check_items, _check_list, "
+                "_checked, _empty"
+            )
+        imported: Set[str] = set()
+        for info in classes:
+            for field_info in info["fields"].values():
+                if field_info["info"] is None:
+                    continue
+                dependency = field_info["info"]["name"]
+                if columnar and field_info["list_element_is_custom"] and not list_elements_nullable(field_info):
+                    # The field is decoded by the batch class only
+                    dependency = f"{dependency}Batch"
+                if class_modules[dependency] != module_name and dependency not in imported:
+                    imported.add(dependency)
+                    imports.append(f"from .{class_modules[dependency]} import {dependency}")
+        if imports:
+            code.append("\n".join(imports) + "\n")
+        for info in classes:
+            # With every class marked as imported, only this class is emitted
+            code.append(generate_class_code(info, set(class_modules), **codegen_options))
+            if info["name"] in batched:
+                code.append(generate_columnar_class_code(info, to_json, low_cardinality))
+        files[module_name] = "\n".join(code)
+
+    files["__init__"] = _init_source(class_modules, to_json, validate)
+
+    written = 0
+    for module_name, source in files.items():
+        with open(os.path.join(package_dir, f"{module_name}.py"), 'w', encoding='utf-8') as f:
+            f.write(source)
+        written += len(source.encode("utf-8"))
+    return written
+
+
+def _plan_modules(class_info: Dict[str, Any], layout: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Assign every class to a module, listing each module's classes dependencies first."""
+    if layout == "class":
+        groups = [[info] for info in collect_classes(class_info)]
+    else:
+        seen = {class_info["name"]}
+        groups = []
+        for field_info in class_info["fields"].values():
+            child = field_info["info"]
+            if child is not None and child["name"] not in seen:
+                groups.append(collect_classes(child, seen))
+        groups.append([class_info])
+
+    modules: Dict[str, List[Dict[str, Any]]] = {}
+    for classes in groups:
+        # Modules are named after their last class, which uses all the others
+        base_name = to_identifier(camel_to_snake(classes[-1]["name"]))
+        module_name = base_name
+        suffix = 2
+        while module_name in modules or module_name in ("__init__", HELPERS_MODULE):
+            module_name = f"{base_name}_{suffix}"
+            suffix += 1
+        modules[module_name] = classes
+    return modules
+
+
+def _init_source(class_modules: Dict[str, str], to_json: bool, validate: bool) -> str:
+    """Source of the package ``__init__`` loading classes on demand."""
+    code = ['"""Generated classes, each imported on first access."""', ""]
+    code.append("from __future__ import annotations")
+    code.append("")
+    code.append("import importlib")
+    if to_json:
+        code.append("import sys")
+    code.append("from typing import TYPE_CHECKING")
+    if to_json:
+        code.append(f"from . import {HELPERS_MODULE}")
+    if validate:
+        code.append(f"from .{HELPERS_MODULE} import ValidationError, set_trusted")
+    code.append("")
+    code.append("_CLASS_MODULES = {")
+    for class_name, module_name in class_modules.items():
+        code.append(f"    {class_name!r}: {module_name!r},")
+    code.append("}")
+    code.append("")
+    code.append(f"__all__ = {list(class_modules)!r}")
+    code.append("")
+    code.append("if TYPE_CHECKING:")
+    code.append("    from typing import Any, Callable, List")
+    for class_name, module_name in class_modules.items():
+        code.append(f"    from .{module_name} import {class_name}")
+    code.append("")
+    code.append("")
+    code.append(INIT_GETATTR_SOURCE)
+    if to_json:
+        code.append("")
+        code.append(INIT_JSON_ENCODER_SOURCE)
+    return "\n".join(code)
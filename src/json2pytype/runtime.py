@@ -0,0 +1,148 @@
+"""
+Runtime class factory.
+
+Builds and compiles generated classes in-process, without writing and
+importing a Python file, and caches them by schema fingerprint so repeated
+payload shapes cost a dictionary lookup.
+"""
+
+import hashlib
+import sys
+import threading
+import types
+from collections import OrderedDict, namedtuple
+from typing import Any, Dict, Mapping, Optional
+from .code_generator import generate_module_code
+from .naming import NamingPolicy
+from .structure_analyzer import analyze_json_structure, schema_fingerprint
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_cache: "OrderedDict[Any, Dict[str, type]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_maxsize = 128
+_hits = 0
+_misses = 0
+
+
+def build_classes(class_info: Dict[str, Any], **codegen_options: Any) -> Dict[str, type]:
+    """
+    Build ready-to-use classes from class definition information.
+
+    The generated module is compiled once per distinct schema and set of
+    code generation options; later calls return the cached classes. While
+    cached, the module is registered in ``sys.modules`` under
+    ``json2pytype.runtime.schema_<digest>``, so instances of its classes can
+    be pickled; it is unregistered when evicted from the cache.
+
+    Args:
+        class_info: Dictionary containing class definition information
+        **codegen_options: Options passed to generate_class_code
+
+    Returns:
+        Dictionary mapping class names to classes, with the root class last
+    """
+    global _hits, _misses
+    key = (schema_fingerprint(class_info), _freeze(codegen_options))
+    with _cache_lock:
+        classes = _cache.get(key)
+        if classes is not None:
+            _hits += 1
+            _cache.move_to_end(key)
+            return classes
+        _misses += 1
+
+    classes = _compile_classes(class_info, _module_name(key), codegen_options)
+    with _cache_lock:
+        _cache[key] = classes
+        _cache.move_to_end(key)
+        while len(_cache) > _cache_maxsize:
+            sys.modules.pop(_module_name(_cache.popitem(last=False)[0]), None)
+    return classes
+
+
+def build_classes_from_sample(
+    json_data: Any,
+    class_name: str = "Root",
+    max_samples: Optional[int] = None,
+    sampling: str = "first",
+    naming: NamingPolicy = "snake",
+    max_enum_values: Optional[int] = None,
+    **codegen_options: Any
+) -> Dict[str, type]:
+    """
+    Analyze a JSON sample and build ready-to-use classes for its shape.
+
+    Args:
+        json_data: The JSON sample to analyze
+        class_name: Name for the root class
+        max_samples: Maximum number of elements inspected per array
+        sampling: Sampling strategy for arrays, see sample_elements
+        naming: Naming policy for field names, see resolve_naming_policy
+        max_enum_values: Collect value statistics of string fields, see
+            analyze_json_structure
+        **codegen_options: Options passed to generate_class_code
+
+    Returns:
+        Dictionary mapping class names to classes, with the root class last
+    """
+    class_info = analyze_json_structure(json_data, class_name, max_samples, sampling, naming, max_enum_values)
+    return build_classes(class_info, **codegen_options)
+
+
+def class_cache_info() -> CacheInfo:
+    """
+    Report statistics of the class cache.
+
+    Returns:
+        CacheInfo with hits, misses, maxsize and currsize
+    """
+    with _cache_lock:
+        return CacheInfo(_hits, _misses, _cache_maxsize, len(_cache))
+
+
+def clear_class_cache(maxsize: Optional[int] = None) -> None:
+    """
+    Empty the class cache and reset its statistics.
+
+    Args:
+        maxsize: New maximum number of cached schemas (unchanged when None)
+    """
+    global _hits, _misses, _cache_maxsize
+    with _cache_lock:
+        for key in _cache:
+            sys.modules.pop(_module_name(key), None)
+        _cache.clear()
+        _hits = _misses = 0
+        if maxsize is not None:
+            _cache_maxsize = maxsize
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of code generation option values, e.g. a shared_classes mapping."""
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze(item) for item in value))
+    return value
+
+
+def _module_name(key: Any) -> str:
+    """Name of the module compiled for a cache key, the same in every process."""
+    digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+    return f"json2pytype.runtime.schema_{digest[:16]}"
+
+
+def _compile_classes(class_info: Dict[str, Any], module_name: str, codegen_options: Dict[str, Any]) -> Dict[str, type]:
+    """Compile the generated module for a schema, register it and collect its classes."""
+    module = types.ModuleType(module_name)
+    source = generate_module_code(class_info, **codegen_options)
+    exec(compile(source, f"<{module_name}>", "exec"), module.__dict__)
+    sys.modules[module_name] = module
+    return {
+        name: value
+        for name, value in module.__dict__.items()
+        if isinstance(value, type) and value.__module__ == module_name and not name.startswith("_")
+    }
@@ -0,0 +1,177 @@
+"""
+Multi-sample analysis.
+
+Infers one schema from many sample files of the same kind, e.g. recorded
+responses of one endpoint that each show a different subset of the
+optional fields. Worker processes analyze the samples in parallel (map)
+and the calling process merges their partial schemas (reduce).
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Sequence, Tuple
+from .code_generator import DEFAULT_MAX_ENUM_VALUES, write_output
+from .json_schema import from_json_schema, write_json_schema
+from .naming import NamingPolicy, snake_to_pascal
+from .stats import GenerationStats, measure
+from .streaming import infer_schema_from_file, is_line_delimited
+from .structure_analyzer import analyze_json_structure, merge_class_info, merge_schemas
+
+
+def infer_schema_from_samples(
+    json_paths: Sequence[str],
+    class_name: str = "Root",
+    jobs: Optional[int] = None,
+    stream: bool = False,
+    max_samples: Optional[int] = None,
+    sampling: str = "first",
+    naming: NamingPolicy = "snake",
+    max_enum_values: Optional[int] = None,
+    from_schema: bool = False
+) -> Dict[str, Any]:
+    """
+    Infer one schema from many JSON sample files in parallel.
+
+    The files are split into contiguous chunks; every worker process
+    analyzes its chunks file by file and merges them into one partial
+    schema, and the partial schemas are merged with merge_schemas. Fields
+    missing from some samples become optional and mixed types are widened,
+    exactly as if the samples were merged one by one, so the result does
+    not depend on the number of jobs.
+
+    Args:
+        json_paths: Paths of the sample files, each one JSON document (or
+            NDJSON records with ``stream``)
+        class_name: Name for the root class
+        jobs: Number of worker processes (default: number of CPUs);
+            1 runs everything in the current process
+        stream: Read every file incrementally, see infer_schema_from_file
+        max_samples: Maximum number of elements inspected per array
+        sampling: Sampling strategy for arrays, see sample_elements
+        naming: Naming policy for field names, see resolve_naming_policy;
+            must be picklable to use worker processes
+        max_enum_values: Collect value statistics of string fields, see
+            analyze_json_structure
+        from_schema: The files are JSON Schema documents, converted with
+            from_json_schema and merged like samples
+
+    Returns:
+        Dictionary containing the merged class definition information
+
+    Raises:
+        ValueError: If no sample files are given
+    """
+    if not json_paths:
+        raise ValueError("No sample files to analyze")
+    jobs = jobs or os.cpu_count() or 1
+    options = (class_name, stream, max_samples, sampling, naming, max_enum_values, from_schema)
+    # A few chunks per worker balance uneven file sizes
+    chunk_count = min(len(json_paths), jobs * 4)
+    chunk_size = -(-len(json_paths) // chunk_count)
+    tasks = [(json_paths[start:start + chunk_size], options) for start in range(0, len(json_paths), chunk_size)]
+
+    if jobs == 1 or len(tasks) == 1:
+        partials = [_analyze_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            partials = list(executor.map(_analyze_chunk, tasks))
+    return merge_schemas(partials, max_enum_values)
+
+
+def generate_merged_declare_file(
+    json_paths: Sequence[str],
+    output_path: Optional[str] = None,
+    jobs: Optional[int] = None,
+    stream: bool = False,
+    max_samples: Optional[int] = None,
+    sampling: str = "first",
+    naming: NamingPolicy = "snake",
+    verbose: bool = True,
+    stats: Optional[GenerationStats] = None,
+    package: Optional[str] = None,
+    max_enum_values: Optional[int] = None,
+    from_schema: bool = False,
+    schema_path: Optional[str] = None,
+    update: bool = False,
+    **codegen_options: Any
+) -> str:
+    """
+    Generate one Python file with type declarations from many samples.
+
+    Args:
+        json_paths: Paths of the sample files
+        output_path: Path for the output Python file, or the package
+            directory; ``"-"`` writes the module to standard output
+            (default: the samples' common directory with a ``.py``
+            extension, or without extension for a package)
+        jobs: Number of worker processes, see infer_schema_from_samples
+        stream: Read every file incrementally, see infer_schema_from_file
+        max_samples: Maximum number of elements inspected per array
+        sampling: Sampling strategy for arrays, see sample_elements
+        naming: Naming policy for field names, see resolve_naming_policy
+        verbose: Print the path of the generated file
+        stats: Records the ``analyze`` phase, covering the parallel
+            analysis and the merge, and the ``generate`` phase
+        package: Write a lazily loaded package, see write_package
+        max_enum_values: Collect value statistics of string fields, see
+            generate_type_declare_file
+        from_schema: The files are JSON Schema documents, see
+            infer_schema_from_samples
+        schema_path: Also write the merged schema as JSON Schema to this
+            path
+        update: Patch an existing output module, see update_module_file
+        **codegen_options: Options passed to generate_class_code
+
+    Returns:
+        Path of the written output file
+
+    Raises:
+        ValueError: If no sample files are given
+    """
+    if not json_paths:
+        raise ValueError("No sample files to analyze")
+    sample_dir = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in json_paths])
+    if not output_path:
+        output_path = sample_dir + ("" if package else ".py")
+    # The root class is named after the output, or the samples' directory
+    base_name = sample_dir if output_path == "-" else output_path
+    class_name = snake_to_pascal(os.path.splitext(os.path.basename(base_name.rstrip(os.sep)))[0]) or "Root"
+    if max_enum_values is None and codegen_options.get("low_cardinality"):
+        max_enum_values = DEFAULT_MAX_ENUM_VALUES
+
+    with measure(stats, "analyze"):
+        class_info = infer_schema_from_samples(
+            json_paths, class_name, jobs, stream, max_samples, sampling, naming, max_enum_values, from_schema
+        )
+    if schema_path:
+        write_json_schema(class_info, schema_path)
+    write_output(class_info, output_path, package, stats, update, **codegen_options)
+
+    if verbose:
+        print(f"Type declaration file generated: {output_path}",
+              file=sys.stderr if output_path == "-" else sys.stdout)
+    return output_path
+
+
+def _analyze_chunk(task: Tuple[Sequence[str], Tuple[Any, ...]]) -> Dict[str, Any]:
+    """Worker entry point merging the schemas of consecutive sample files."""
+    json_paths, (class_name, stream, max_samples, sampling, naming, max_enum_values, from_schema) = task
+    schema: Optional[Dict[str, Any]] = None
+    for json_path in json_paths:
+        if from_schema:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                sample_info = from_json_schema(json.load(f), class_name, naming)
+        elif stream or is_line_delimited(json_path):
+            sample_info = infer_schema_from_file(
+                json_path, class_name, max_samples, sampling, naming, max_enum_values
+            )
+        else:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                json_data = json.load(f)
+            sample_info = analyze_json_structure(
+                json_data, class_name, max_samples, sampling, naming, max_enum_values
+            )
+        schema = sample_info if schema is None else merge_class_info(schema, sample_info, max_enum_values)
+    return schema
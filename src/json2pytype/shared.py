@@ -0,0 +1,313 @@
+"""
+Shared classes.
+
+Classes of the same shape recur across the modules of a project, e.g.
+pagination blocks, error envelopes or addresses. A ClassRegistry spots them
+by shape digest across modules and across runs, generates each of them once
+into a common module, and the other modules import them from there.
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+from . import __version__
+from .batch import plan_outputs
+from .code_generator import analyze_json_file, iter_class_code, iter_module_code, write_output
+from .incremental import patch_module_source
+from .naming import NamingPolicy
+from .stats import GenerationStats, measure
+from .structure_analyzer import _retarget_field, class_shape_digest, collect_classes, deduplicate_classes
+
+DEFAULT_COMMON_MODULE = "common"
+
+# Extension of the registry file, saved next to the common module
+REGISTRY_EXTENSION = ".registry.json"
+
+
+class ClassRegistry:
+    """
+    Project-level registry of the classes shared by generated modules.
+
+    Every nested class of every module is recorded by its shape digest (see
+    class_shape_digest) together with the first module using it. Once a
+    second module uses a shape, the shape is shared: it is generated into
+    the common module under the name it was first generated with, and
+    modules import it from there. The registry is saved next to the common
+    module, so later runs keep sharing the same classes under the same names.
+    A module generated before one of its classes became shared keeps its own
+    copy until it is regenerated.
+
+    Args:
+        output_dir: Directory the generated modules are imported from
+        common_module: Dotted name of the common module, relative to
+            ``output_dir``
+    """
+
+    def __init__(self, output_dir: str = ".", common_module: str = DEFAULT_COMMON_MODULE):
+        self.common_module = common_module
+        self.common_path = os.path.join(output_dir, *common_module.split(".")) + ".py"
+        self.registry_path = os.path.splitext(self.common_path)[0] + REGISTRY_EXTENSION
+        # Canonical definitions of the shared shapes, by shape digest
+        self.shared: Dict[str, Dict[str, Any]] = {}
+        # First module using each shape that is not shared yet, and the
+        # class name it was generated with there
+        self.first_users: Dict[str, Tuple[str, str]] = {}
+        self._load()
+
+    def share(self, modules: Mapping[str, Dict[str, Any]]) -> Dict[str, Tuple[Dict[str, Any], Dict[str, str]]]:
+        """
+        Point the classes of many modules at the shared definitions.
+
+        Shapes used by more than one module, counting the modules of earlier
+        runs, become shared. Root classes are never shared, and a module's
+        own class named like a shared class gets a numeric suffix.
+
+        Args:
+            modules: Class definitions of the modules, by module path
+
+        Returns:
+            Dictionary mapping every module path to its class definitions,
+            with shared classes replaced by their common definitions, and
+            the shared classes it imports (the ``shared_classes`` code
+            generation option)
+        """
+        trees = {module: deduplicate_classes(class_info) for module, class_info in modules.items()}
+        digests: Dict[int, str] = {}
+        users: Dict[str, Set[str]] = {}
+        for module, tree in trees.items():
+            # The root class comes last
+            for info in collect_classes(tree)[:-1]:
+                digest = class_shape_digest(info)
+                digests[id(info)] = digest
+                users.setdefault(digest, set()).add(module)
+                if digest not in self.shared:
+                    self.first_users.setdefault(digest, (module, info["name"]))
+        shared_digests = {
+            digest for digest, modules_using in users.items()
+            if digest in self.shared or len(modules_using | {self.first_users[digest][0]}) > 1
+        }
+        taken_names = {info["name"] for info in self.shared.values()} | {tree["name"] for tree in trees.values()}
+
+        result: Dict[str, Tuple[Dict[str, Any], Dict[str, str]]] = {}
+        for module, tree in trees.items():
+            mapped: Dict[int, Dict[str, Any]] = {}
+            local_names: Set[str] = set()
+            imports: Dict[str, str] = {}
+            # Children are mapped before the classes referring to them
+            for info in collect_classes(tree):
+                fields: Dict[str, Any] = {}
+                for field_name, field_info in info["fields"].items():
+                    if field_info["info"] is not None:
+                        field_info = _retarget_field(field_info, mapped[id(field_info["info"])])
+                    fields[field_name] = field_info
+                digest = digests.get(id(info))
+                if digest in shared_digests:
+                    if digest not in self.shared:
+                        _, first_name = self.first_users.pop(digest)
+                        name = _free_name(first_name, taken_names | local_names)
+                        taken_names.add(name)
+                        self.shared[digest] = {"name": name, "type": info["type"], "fields": fields}
+                    mapped[id(info)] = self.shared[digest]
+                    continue
+                name = info["name"]
+                if info is not tree:
+                    name = _free_name(name, taken_names | local_names)
+                local_names.add(name)
+                mapped[id(info)] = {"name": name, "type": info["type"], "fields": fields}
+                for field_info in fields.values():
+                    if field_info["info"] is not None and field_info["info"]["name"] not in local_names:
+                        imports[field_info["info"]["name"]] = self.common_module
+            result[module] = (mapped[id(tree)], imports)
+        return result
+
+    def iter_common_code(self, **codegen_options: Any) -> Iterator[str]:
+        """
+        Generate the source of the common module chunk by chunk.
+
+        Args:
+            **codegen_options: Options passed to iter_class_code, the same
+                as for the modules importing the classes
+
+        Yields:
+            Consecutive chunks of the generated Python module code
+        """
+        used = {
+            id(field_info["info"])
+            for info in self.shared.values()
+            for field_info in info["fields"].values()
+            if field_info["info"] is not None
+        }
+        tops = sorted((info for info in self.shared.values() if id(info) not in used), key=lambda info: info["name"])
+        emitted: Set[str] = set()
+        for index, info in enumerate(tops):
+            if index == 0:
+                # The first tree brings the imports and module helpers
+                yield from iter_module_code(info, **codegen_options)
+                emitted.update(child["name"] for child in collect_classes(info))
+            else:
+                yield "\n"
+                yield from iter_class_code(info, emitted, **codegen_options)
+
+    def save(self, update: bool = False, **codegen_options: Any) -> int:
+        """
+        Write the common module and the registry file.
+
+        Args:
+            update: Patch an existing common module with
+                patch_module_source instead of rewriting it, see
+                update_module_file
+            **codegen_options: Options passed to iter_class_code
+
+        Returns:
+            Number of bytes of the common module written, in UTF-8 (0 if
+            no class is shared or the module was already current)
+        """
+        os.makedirs(os.path.dirname(self.common_path) or ".", exist_ok=True)
+        digests = {id(info): digest for digest, info in self.shared.items()}
+        entries = {digest: _flatten(info, digests) for digest, info in sorted(self.shared.items())}
+        with open(self.registry_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": __version__, "shared": entries, "first_users": self.first_users}, f,
+                      indent=1, default=list)
+        if not self.shared:
+            return 0
+
+        source = "".join(self.iter_common_code(**codegen_options))
+        old_source = None
+        if os.path.exists(self.common_path):
+            with open(self.common_path, 'r', encoding='utf-8') as f:
+                old_source = f.read()
+            if update:
+                source = patch_module_source(old_source, source) or source
+        if source == old_source:
+            return 0
+        with open(self.common_path, 'w', encoding='utf-8') as f:
+            f.write(source)
+        return len(source.encode("utf-8"))
+
+    def _load(self) -> None:
+        """Read the registry file, starting empty if it is missing or stale."""
+        try:
+            with open(self.registry_path, 'r', encoding='utf-8') as f:
+                registry = json.load(f)
+        except (OSError, ValueError):
+            return
+        if registry.get("version") != __version__:
+            # Shape digests may differ between versions
+            return
+        self.first_users = {digest: tuple(user) for digest, user in registry["first_users"].items()}
+        entries = registry["shared"]
+        # Nested classes are referred to by digest, and linked up here
+        self.shared = {digest: dict(entry, fields=dict(entry["fields"])) for digest, entry in entries.items()}
+        for info in self.shared.values():
+            for field_name, field_info in info["fields"].items():
+                if field_info["info"] is not None:
+                    info["fields"][field_name] = dict(field_info, info=self.shared[field_info["info"]])
+
+
+def generate_shared_batch(
+    json_paths: Sequence[str],
+    output_dir: str,
+    common_module: str = DEFAULT_COMMON_MODULE,
+    jobs: Optional[int] = None,
+    stream: bool = False,
+    max_samples: Optional[int] = None,
+    sampling: str = "first",
+    naming: NamingPolicy = "snake",
+    stats: Optional[GenerationStats] = None,
+    max_enum_values: Optional[int] = None,
+    from_schema: bool = False,
+    update: bool = False,
+    **codegen_options: Any
+) -> List[str]:
+    """
+    Generate type declaration files for many JSON files, sharing common classes.
+
+    The files are analyzed in parallel, then a ClassRegistry for
+    ``output_dir`` decides which classes are shared. Every module imports
+    its shared classes from the common module instead of defining them.
+
+    Args:
+        json_paths: Paths of the input JSON files
+        output_dir: Directory for the generated files, mirroring the input
+            layout, see plan_outputs; modules are imported from here
+        common_module: Dotted name of the common module, relative to
+            ``output_dir``
+        jobs: Number of worker processes for the analysis (default: number
+            of CPUs); 1 runs everything in the current process
+        stream: Read every file incrementally, see infer_schema_from_file
+        max_samples: Maximum number of elements inspected per array
+        sampling: Sampling strategy for arrays, see sample_elements
+        naming: Naming policy for field names, see resolve_naming_policy
+        stats: Records the ``analyze`` phase of all files and the
+            ``generate`` phase of every module
+        max_enum_values: Collect value statistics of string fields, see
+            generate_type_declare_file
+        from_schema: The files are JSON Schema documents, see
+            analyze_json_file
+        update: Patch existing modules, see update_module_file
+        **codegen_options: Options passed to generate_class_code
+
+    Returns:
+        Paths of the written output files, in input order, followed by the
+        common module if any class is shared
+
+    Raises:
+        ValueError: If columnar decoding is requested, which keeps batch
+            classes next to their row classes, or JSON encoding or
+            validation, whose module-level helpers every module would
+            define on its own
+    """
+    for option in ("columnar", "to_json", "validate"):
+        if codegen_options.get(option):
+            raise ValueError(f"Shared classes do not support the {option} option")
+    plan = plan_outputs(json_paths, output_dir)
+    if not plan:
+        return []
+    tasks = [
+        (json_path, (stream, max_samples, sampling, naming, max_enum_values, from_schema))
+        for json_path, _ in plan
+    ]
+    with measure(stats, "analyze"):
+        if jobs == 1 or len(tasks) == 1:
+            class_infos = [_analyze_one(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                class_infos = list(executor.map(_analyze_one, tasks))
+
+    registry = ClassRegistry(output_dir, common_module)
+    modules = registry.share({output_path: class_info for (_, output_path), class_info in zip(plan, class_infos)})
+    output_paths: List[str] = []
+    for output_path, (class_info, shared_classes) in modules.items():
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        write_output(class_info, output_path, None, stats, update, shared_classes=shared_classes, **codegen_options)
+        output_paths.append(output_path)
+    registry.save(update, **codegen_options)
+    if registry.shared:
+        output_paths.append(registry.common_path)
+    return output_paths
+
+
+def _analyze_one(task: Tuple[str, Tuple[Any, ...]]) -> Dict[str, Any]:
+    """Worker entry point analyzing a single file."""
+    json_path, (stream, max_samples, sampling, naming, max_enum_values, from_schema) = task
+    return analyze_json_file(json_path, stream, max_samples, sampling, naming, None, max_enum_values, from_schema)
+
+
+def _free_name(name: str, taken: Set[str]) -> str:
+    """A class name not in ``taken``, adding a numeric suffix if needed."""
+    candidate = name
+    suffix = 2
+    while candidate in taken:
+        candidate = f"{name}{suffix}"
+        suffix += 1
+    return candidate
+
+
+def _flatten(info: Dict[str, Any], digests: Dict[int, str]) -> Dict[str, Any]:
+    """A shared class definition referring to nested classes by digest, for the registry file."""
+    fields = {
+        field_name: dict(field_info, info=digests[id(field_info["info"])]) if field_info["info"] is not None else field_info
+        for field_name, field_info in info["fields"].items()
+    }
+    return dict(info, fields=fields)
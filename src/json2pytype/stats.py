@@ -0,0 +1,155 @@
+"""
+Generation instrumentation.
+
+Records wall time and memory allocations per generation phase (loading,
+analysis, code generation and writing) plus counts of emitted classes, fields
+and bytes, for the ``--stats`` report and for library callbacks.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Dict, Iterator, Optional
+
+PhaseCallback = Callable[[str, Dict[str, Any]], None]
+
+
+class GenerationStats:
+    """
+    Per-phase measurements of one or more generation runs.
+
+    Pass an instance as ``stats`` to generate_type_declare_file or
+    generate_batch. Phases measured more than once (e.g. across batch files)
+    are accumulated.
+
+    Args:
+        trace_memory: Record allocations per phase with tracemalloc, which
+            slows generation down noticeably
+        callback: Called as ``callback(phase, record)`` after every phase
+            measured in this process, where ``record`` holds ``wall_s``
+            and, with ``trace_memory``, ``allocated_bytes`` and
+            ``peak_bytes``
+    """
+
+    def __init__(self, trace_memory: bool = False, callback: Optional[PhaseCallback] = None):
+        self.trace_memory = trace_memory
+        self.callback = callback
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.counts: Dict[str, int] = {"files": 0, "classes": 0, "fields": 0, "bytes": 0}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Measure the enclosed block as the named phase.
+
+        Args:
+            name: Phase name, e.g. ``"load"`` or ``"analyze"``
+        """
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            start_memory, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record: Dict[str, Any] = {"wall_s": time.perf_counter() - start}
+            if self.trace_memory:
+                end_memory, peak = tracemalloc.get_traced_memory()
+                record["allocated_bytes"] = max(0, end_memory - start_memory)
+                record["peak_bytes"] = max(0, peak - start_memory)
+                if started_tracing:
+                    tracemalloc.stop()
+            self.add_phase(name, record)
+
+    def add_phase(self, name: str, record: Dict[str, Any]) -> None:
+        """
+        Accumulate a phase measurement and notify the callback.
+
+        Args:
+            name: Phase name
+            record: Measurements of the phase
+        """
+        self._accumulate(name, dict(record, calls=1))
+        if self.callback is not None:
+            self.callback(name, record)
+
+    def count(self, **counts: int) -> None:
+        """
+        Add to the emitted object counters.
+
+        Args:
+            **counts: Increments for ``files``, ``classes``, ``fields`` or
+                ``bytes``
+        """
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+
+    def merge(self, other: Dict[str, Any]) -> None:
+        """
+        Merge measurements exported with as_dict, e.g. from a worker process.
+
+        Args:
+            other: Dictionary returned by as_dict
+        """
+        for name, record in other["phases"].items():
+            self._accumulate(name, record)
+        self.count(**other["counts"])
+
+    def _accumulate(self, name: str, record: Dict[str, Any]) -> None:
+        """Add a record to the phase totals; peaks keep their maximum."""
+        totals = self.phases.setdefault(name, {})
+        for key, value in record.items():
+            if key == "peak_bytes":
+                totals[key] = max(totals.get(key, 0), value)
+            else:
+                totals[key] = totals.get(key, 0) + value
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Export the measurements as plain data.
+
+        Returns:
+            Dictionary with ``phases`` and ``counts``
+        """
+        return {
+            "phases": {name: dict(record) for name, record in self.phases.items()},
+            "counts": dict(self.counts),
+        }
+
+    def report(self) -> str:
+        """
+        Format the measurements as a human readable table.
+
+        Returns:
+            Multi-line report
+        """
+        total = sum(record["wall_s"] for record in self.phases.values()) or 1.0
+        lines = [f"{'phase':<12} {'calls':>6} {'wall ms':>10} {'share':>7}"
+                 + (f" {'alloc KiB':>10} {'peak KiB':>10}" if self.trace_memory else "")]
+        for name, record in self.phases.items():
+            line = (f"{name:<12} {record['calls']:>6} {record['wall_s'] * 1000:>10.2f} "
+                    f"{record['wall_s'] / total:>7.1%}")
+            if self.trace_memory:
+                line += (f" {record.get('allocated_bytes', 0) / 1024:>10.1f}"
+                         f" {record.get('peak_bytes', 0) / 1024:>10.1f}")
+            lines.append(line)
+        lines.append(", ".join(f"{key}: {value}" for key, value in self.counts.items()))
+        return "\n".join(lines)
+
+
+def measure(stats: Optional[GenerationStats], name: str) -> ContextManager[None]:
+    """
+    Measure a phase if statistics are being collected.
+
+    Args:
+        stats: Statistics to record into, or None to measure nothing
+        name: Phase name
+
+    Returns:
+        Context manager wrapping the phase
+    """
+    return stats.phase(name) if stats is not None else nullcontext()
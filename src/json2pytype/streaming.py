@@ -0,0 +1,217 @@
+"""
+Streaming schema inference.
+
+Reads JSON records incrementally from NDJSON files or from a top-level JSON
+array and folds each record into a running schema, so memory stays bounded
+by the size of the schema rather than the size of the input.
+"""
+
+import json
+from typing import Any, Dict, IO, Iterator, Optional
+from .naming import NamingPolicy, resolve_naming_policy
+from .structure_analyzer import analyze_json_structure, merge_class_info
+
+_WHITESPACE = " \t\r\n"
+
+# Extensions of line-delimited files, always read record by record
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+
+
+def iter_json_records(fp: IO[str], chunk_size: int = 65536) -> Iterator[Any]:
+    """
+    Iterate over the JSON records of a text stream without loading it whole.
+
+    A stream whose first non-whitespace character is ``[`` is read as a
+    single JSON array and its elements are yielded one at a time; anything
+    else is read as NDJSON with one record per line (blank lines skipped).
+
+    Args:
+        fp: Text stream opened for reading
+        chunk_size: Number of characters read at a time from array streams
+
+    Returns:
+        Iterator over the decoded records
+    """
+    buffer = fp.read(chunk_size)
+    position = _skip_whitespace(buffer, 0)
+    while position == len(buffer):
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            return
+        buffer = chunk
+        position = _skip_whitespace(buffer, 0)
+
+    if buffer[position] == "[":
+        yield from _iter_array_elements(fp, buffer, position + 1, chunk_size)
+    else:
+        yield from _iter_ndjson_lines(fp, buffer[position:])
+
+
+def is_line_delimited(json_path: str) -> bool:
+    """
+    Check whether a file is named like a line-delimited JSON file.
+
+    Such files hold one document per line, so json.load cannot read them
+    and they are streamed whether or not streaming was requested.
+
+    Args:
+        json_path: Path of the input file
+
+    Returns:
+        True for ``.ndjson`` and ``.jsonl`` files
+    """
+    return json_path.lower().endswith(NDJSON_EXTENSIONS)
+
+
+def infer_schema_from_stream(
+    fp: IO[str],
+    class_name: str = "Root",
+    max_samples: Optional[int] = None,
+    sampling: str = "first",
+    naming: NamingPolicy = "snake",
+    max_enum_values: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Infer class definition information from a stream of JSON records.
+
+    Every record is analyzed on its own and merged into the running schema
+    with merge_class_info, so fields missing from some records become
+    optional and mixed types are widened.
+
+    Args:
+        fp: Text stream with NDJSON records or a top-level JSON array
+        class_name: Name for the record class
+        max_samples: Maximum number of elements inspected per nested array
+        sampling: Sampling strategy for nested arrays, see sample_elements
+        naming: Naming policy for field names, see resolve_naming_policy
+        max_enum_values: Collect value statistics of string fields, see
+            analyze_json_structure
+
+    Returns:
+        Dictionary containing class definition information for one record
+
+    Raises:
+        ValueError: If the stream contains no records
+    """
+    schema: Optional[Dict[str, Any]] = None
+    # Resolve once so custom policies share one cache across records
+    naming = resolve_naming_policy(naming)
+    for record in iter_json_records(fp):
+        record_info = analyze_json_structure(record, class_name, max_samples, sampling, naming, max_enum_values)
+        schema = record_info if schema is None else merge_class_info(schema, record_info, max_enum_values)
+
+    if schema is None:
+        raise ValueError("No JSON records found in stream")
+    return schema
+
+
+def infer_schema_from_file(
+    json_path: str,
+    class_name: str = "Root",
+    max_samples: Optional[int] = None,
+    sampling: str = "first",
+    naming: NamingPolicy = "snake",
+    max_enum_values: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Infer class definition information from an NDJSON or JSON array file.
+
+    Args:
+        json_path: Path to the input file
+        class_name: Name for the record class
+        max_samples: Maximum number of elements inspected per nested array
+        sampling: Sampling strategy for nested arrays, see sample_elements
+        naming: Naming policy for field names, see resolve_naming_policy
+        max_enum_values: Collect value statistics of string fields, see
+            analyze_json_structure
+
+    Returns:
+        Dictionary containing class definition information for one record
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return infer_schema_from_stream(f, class_name, max_samples, sampling, naming, max_enum_values)
+
+
+def _skip_whitespace(buffer: str, position: int) -> int:
+    """Return the index of the next non-whitespace character."""
+    while position < len(buffer) and buffer[position] in _WHITESPACE:
+        position += 1
+    return position
+
+
+def _iter_ndjson_lines(fp: IO[str], head: str) -> Iterator[Any]:
+    """Decode one record per line, starting with an already read head."""
+    pending = ""
+    for part in head.splitlines(keepends=True):
+        if part.endswith("\n"):
+            line = (pending + part).strip()
+            pending = ""
+            if line:
+                yield json.loads(line)
+        else:
+            pending += part
+
+    for part in fp:
+        line = (pending + part).strip()
+        pending = ""
+        if line:
+            yield json.loads(line)
+
+    if pending.strip():
+        yield json.loads(pending)
+
+
+def _iter_array_elements(fp: IO[str], buffer: str, position: int, chunk_size: int) -> Iterator[Any]:
+    """Decode the elements of a JSON array whose opening bracket was consumed."""
+    decoder = json.JSONDecoder()
+    read_size = chunk_size
+    eof = False
+    expect_value = True
+
+    while True:
+        position = _skip_whitespace(buffer, position)
+        if position == len(buffer):
+            if eof:
+                raise ValueError("Unterminated JSON array")
+            chunk = fp.read(read_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        char = buffer[position]
+        if char == "]":
+            return
+        if char == ",":
+            if expect_value:
+                raise ValueError("Unexpected ',' in JSON array")
+            expect_value = True
+            position += 1
+            continue
+        if not expect_value:
+            raise ValueError("Expected ',' or ']' in JSON array")
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            end = None
+        # A value ending at the buffer edge may be a truncated number or
+        # literal, so only accept it once more input is known to follow.
+        if end is None or (end == len(buffer) and not eof):
+            if eof:
+                raise ValueError("Invalid JSON in array stream")
+            chunk = fp.read(read_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            # Grow reads for oversized elements to keep re-decoding linear.
+            read_size *= 2
+            continue
+
+        yield value
+        expect_value = False
+        read_size = chunk_size
+        position = end
+        if position > chunk_size:
+            buffer = buffer[position:]
+            position = 0
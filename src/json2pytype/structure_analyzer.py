@@ -5,101 +5,85 @@ Analyzes JSON data structures to generate class definition information
 that can be used to create Python classes with proper type hints.
 """
 
-from typing import Any, Dict, List, Optional
-from .naming import camel_to_snake, snake_to_pascal
-from .type_inference import get_python_type
+import hashlib
+import json
+from typing import Any, Callable, Dict, Generator, List, Optional, Sequence, Set
+from .naming import NamingPolicy, key_to_class_name, resolve_naming_policy, snake_to_pascal
+from .type_inference import (
+    get_python_type,
+    make_optional,
+    merge_python_types,
+    sample_elements,
+    split_type_members,
+    strip_optional,
+)
 
+# Field keys describing observed values rather than the shape of a class
+_UNSHAPED_KEYS = ("info", "values", "value_count")
 
-def analyze_json_structure(json_data: Any, class_name: str = "Root") -> Dict[str, Any]:
+# A unit of work run by _drive: yields the steps it depends on and receives
+# their results, instead of calling them recursively
+Step = Generator[Any, Any, Any]
+
+
+def analyze_json_structure(
+    json_data: Any,
+    class_name: str = "Root",
+    max_samples: Optional[int] = None,
+    sampling: str = "first",
+    naming: NamingPolicy = "snake",
+    max_enum_values: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Analyze a JSON data structure and generate class definition information.
 
+    Array element types are merged across the elements of every array, so
+    keys missing from some objects become optional, nulls promote to
+    ``Optional`` and mixed ``int``/``float`` widen to ``float``.
+
     Args:
         json_data: The JSON data to analyze
         class_name: Name for the root class
+        max_samples: Maximum number of elements inspected per array
+            (all elements when None)
+        sampling: How elements are picked when an array exceeds
+            ``max_samples``: ``"first"`` or ``"reservoir"``
+        naming: Naming policy for field names, see resolve_naming_policy
+        max_enum_values: Collect value statistics of string fields: each
+            such field gets ``values``, the sorted distinct values seen (None
+            once there are more than ``max_enum_values``), and
+            ``value_count``, the number of values seen. Not collected when
+            None.
 
     Returns:
         Dictionary containing class definition information with fields,
         types, and nested class information
     """
+    return _analyze(json_data, class_name, max_samples, sampling, resolve_naming_policy(naming), max_enum_values)
+
+
+def _analyze(
+    json_data: Any,
+    class_name: str,
+    max_samples: Optional[int],
+    sampling: str,
+    field_name_for: Callable[[str], str],
+    max_enum_values: Optional[int] = None
+) -> Dict[str, Any]:
+    """Analyze a JSON value with an already resolved naming policy."""
     if isinstance(json_data, dict):
-        class_info: Dict[str, Any] = {
-            "name": class_name,
-            "type": "class",
-            "fields": {}
-        }
-        
-        for key, value in json_data.items():
-            # Convert key to snake_case for class attribute
-            field_name = camel_to_snake(key)
-            # Convert key to PascalCase for potential nested class name
-            pascal_key = snake_to_pascal(camel_to_snake(key))
-            
-            if isinstance(value, dict):
-                # Create new class for nested object
-                nested_class_name = f"{class_name}{pascal_key}"
-                nested_class_info = analyze_json_structure(value, nested_class_name)
-                class_info["fields"][field_name] = {
-                    "type": nested_class_name,
-                    "info": nested_class_info,
-                    "is_custom_class": True,
-                    "is_list": False,
-                    "list_element_type": None,
-                    "list_element_is_custom": False
-                }
-            elif isinstance(value, list):
-                if value and isinstance(value[0], dict):
-                    # Create new class for objects in list
-                    element_class_name = f"{pascal_key}Item"
-                    element_class_info = analyze_json_structure(value[0], element_class_name)
-                    class_info["fields"][field_name] = {
-                        "type": f"List[{element_class_name}]",
-                        "info": element_class_info,
-                        "is_custom_class": False,
-                        "is_list": True,
-                        "list_element_type": element_class_name,
-                        "list_element_is_custom": True
-                    }
-                else:
-                    # List of basic types
-                    element_type = get_python_type(value[0]) if value else "Any"
-                    class_info["fields"][field_name] = {
-                        "type": f"List[{element_type}]",
-                        "info": None,
-                        "is_custom_class": False,
-                        "is_list": True,
-                        "list_element_type": element_type,
-                        "list_element_is_custom": False
-                    }
-            else:
-                # Basic type
-                class_info["fields"][field_name] = {
-                    "type": get_python_type(value),
-                    "info": None,
-                    "is_custom_class": False,
-                    "is_list": False,
-                    "list_element_type": None,
-                    "list_element_is_custom": False
-                }
-        
-        return class_info
+        return _drive(_analyze_object(json_data, class_name, max_samples, sampling, field_name_for, max_enum_values))
     
-    elif isinstance(json_data, list) and json_data and isinstance(json_data[0], dict):
+    elif isinstance(json_data, list) and any(isinstance(item, dict) for item in json_data):
         # Root is a list of objects, create a container class
         element_class_name = snake_to_pascal("item")
-        element_class_info = analyze_json_structure(json_data[0], element_class_name)
         return {
             "name": class_name,
             "type": "class",
             "fields": {
-                "items": {
-                    "type": f"List[{element_class_name}]",
-                    "info": element_class_info,
-                    "is_custom_class": False,
-                    "is_list": True,
-                    "list_element_type": element_class_name,
-                    "list_element_is_custom": True
-                }
+                "items": _drive(_analyze_list(
+                    json_data, "items", element_class_name, max_samples, sampling, field_name_for, max_enum_values
+                ))
             }
         }
     else:
@@ -109,7 +93,9 @@ def analyze_json_structure(json_data: Any, class_name: str = "Root") -> Dict[str
             "type": "class",
             "fields": {
                 "value": {
-                    "type": get_python_type(json_data),
+                    "json_key": "value",
+                    "optional": False,
+                    "type": get_python_type(json_data, max_samples, sampling),
                     "info": None,
                     "is_custom_class": False,
                     "is_list": False,
@@ -118,3 +104,566 @@ def analyze_json_structure(json_data: Any, class_name: str = "Root") -> Dict[str
                 }
             }
         }
+
+
+def _drive(task: Step) -> Any:
+    """
+    Run a step generator and every step it delegates to without recursion.
+
+    A step yields another step generator to have it run and receives its
+    return value back, so nesting depth is bounded by memory instead of
+    the interpreter recursion limit.
+    """
+    stack = [task]
+    result = None
+    while True:
+        try:
+            request = stack[-1].send(result)
+        except StopIteration as stop:
+            stack.pop()
+            if not stack:
+                return stop.value
+            result = stop.value
+        else:
+            stack.append(request)
+            result = None
+
+
+def _analyze_object(
+    json_data: Dict[str, Any],
+    class_name: str,
+    max_samples: Optional[int],
+    sampling: str,
+    field_name_for: Callable[[str], str],
+    max_enum_values: Optional[int]
+) -> Step:
+    """Step analyzing a JSON object into a class definition."""
+    class_info: Dict[str, Any] = {
+        "name": class_name,
+        "type": "class",
+        "fields": {}
+    }
+    
+    for key, value in json_data.items():
+        # Convert key to a class attribute name
+        field_name = field_name_for(key)
+        # Convert key to PascalCase for potential nested class name
+        pascal_key = key_to_class_name(key)
+        
+        if isinstance(value, dict):
+            # Create new class for nested object
+            nested_class_name = f"{class_name}{pascal_key}"
+            nested_class_info = yield _analyze_object(value, nested_class_name, max_samples, sampling, field_name_for, max_enum_values)
+            class_info["fields"][field_name] = {
+                "json_key": key,
+                "optional": False,
+                "type": nested_class_name,
+                "info": nested_class_info,
+                "is_custom_class": True,
+                "is_list": False,
+                "list_element_type": None,
+                "list_element_is_custom": False
+            }
+        elif isinstance(value, list):
+            # Create new class for objects in list
+            class_info["fields"][field_name] = yield _analyze_list(
+                value, key, f"{pascal_key}Item", max_samples, sampling, field_name_for, max_enum_values
+            )
+        else:
+            # Basic type
+            class_info["fields"][field_name] = {
+                "json_key": key,
+                "optional": False,
+                "type": get_python_type(value),
+                "info": None,
+                "is_custom_class": False,
+                "is_list": False,
+                "list_element_type": None,
+                "list_element_is_custom": False
+            }
+            if max_enum_values is not None and isinstance(value, str):
+                # Cardinality statistics for enum detection
+                class_info["fields"][field_name]["values"] = [value] if max_enum_values else None
+                class_info["fields"][field_name]["value_count"] = 1
+    
+    return class_info
+
+
+def _analyze_list(
+    values: List[Any],
+    json_key: str,
+    element_class_name: str,
+    max_samples: Optional[int],
+    sampling: str,
+    field_name_for: Callable[[str], str],
+    max_enum_values: Optional[int]
+) -> Step:
+    """Step building a list field by merging the types of its sampled elements."""
+    element_info: Optional[Dict[str, Any]] = None
+    element_type: Optional[str] = None
+    for item in sample_elements(values, max_samples, sampling):
+        if isinstance(item, dict):
+            item_info = yield _analyze_object(item, element_class_name, max_samples, sampling, field_name_for, max_enum_values)
+            if element_info is None:
+                element_info = item_info
+            else:
+                element_info = yield _merge_class_info(element_info, item_info, max_enum_values)
+        else:
+            item_type = get_python_type(item, max_samples, sampling)
+            element_type = item_type if element_type is None else merge_python_types(element_type, item_type)
+
+    if element_info is not None and element_type in (None, "None"):
+        # Objects, possibly mixed with nulls
+        element = element_class_name if element_type is None else make_optional(element_class_name)
+        return {
+            "json_key": json_key,
+            "optional": False,
+            "type": f"List[{element}]",
+            "info": element_info,
+            "is_custom_class": False,
+            "is_list": True,
+            "list_element_type": element_class_name,
+            "list_element_is_custom": True
+        }
+
+    if element_info is not None:
+        # Objects mixed with other values cannot map onto a single class
+        element_type = merge_python_types("Dict[str, Any]", element_type)
+    elif element_type is None:
+        element_type = "Any"
+    return {
+        "json_key": json_key,
+        "optional": False,
+        "type": f"List[{element_type}]",
+        "info": None,
+        "is_custom_class": False,
+        "is_list": True,
+        "list_element_type": element_type,
+        "list_element_is_custom": False
+    }
+
+
+def merge_class_info(
+    first: Dict[str, Any],
+    second: Dict[str, Any],
+    max_enum_values: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Merge two class definitions describing samples of the same JSON object.
+
+    Fields present in only one side become optional, nulls promote field
+    types to ``Optional``, ``int`` widens to ``float`` and nested classes are
+    merged recursively. Class names are taken from ``first``.
+
+    Args:
+        first: Class definition information from analyze_json_structure
+        second: Class definition information for another sample
+        max_enum_values: Limit on the distinct values kept in the value
+            statistics of string fields, see analyze_json_structure (no
+            limit when None)
+
+    Returns:
+        New dictionary with the merged class definition information
+    """
+    return _drive(_merge_class_info(first, second, max_enum_values))
+
+
+def merge_schemas(
+    class_infos: Sequence[Dict[str, Any]],
+    max_enum_values: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Merge the class definition information of many samples into one.
+
+    Schemas are merged pairwise in rounds, like a balanced tree. This
+    still takes n - 1 merges, run one after another in the calling
+    process, each costing time proportional to the size of the two
+    schemas. The result equals folding the schemas one by one: fields
+    keep the order in which they first appear, and the root class keeps
+    the name of the first schema.
+
+    Args:
+        class_infos: Class definition information of every sample, in order
+        max_enum_values: Limit on the distinct values kept in the value
+            statistics of string fields, see merge_class_info
+
+    Returns:
+        Dictionary with the merged class definition information
+
+    Raises:
+        ValueError: If no schemas are given
+    """
+    if not class_infos:
+        raise ValueError("No schemas to merge")
+    level = list(class_infos)
+    while len(level) > 1:
+        merged = [
+            merge_class_info(level[index], level[index + 1], max_enum_values)
+            for index in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+    return level[0]
+
+
+def _merge_class_info(first: Dict[str, Any], second: Dict[str, Any], max_enum_values: Optional[int]) -> Step:
+    """Step merging two class definitions, see merge_class_info."""
+    fields: Dict[str, Any] = {}
+    second_fields = second["fields"]
+    for field_name, field_info in first["fields"].items():
+        if field_name in second_fields:
+            fields[field_name] = yield _merge_field(field_info, second_fields[field_name], max_enum_values)
+        else:
+            fields[field_name] = _mark_optional(field_info)
+    for field_name, field_info in second_fields.items():
+        if field_name not in fields:
+            fields[field_name] = _mark_optional(field_info)
+
+    return {
+        "name": first["name"],
+        "type": first["type"],
+        "fields": fields
+    }
+
+
+def _mark_optional(field_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a field that is missing from some samples."""
+    merged = dict(field_info)
+    merged["optional"] = True
+    merged["type"] = make_optional(field_info["type"])
+    return merged
+
+
+def _is_nullable(type_str: str) -> bool:
+    """Check whether a type string admits None."""
+    return "None" in split_type_members(type_str)
+
+
+def _as_basic_type(field_info: Dict[str, Any]) -> str:
+    """Type string of a field with custom classes replaced by plain dicts."""
+    if field_info["is_custom_class"]:
+        base = "Dict[str, Any]"
+    elif field_info["is_list"] and field_info["list_element_is_custom"]:
+        base = "List[Optional[Dict[str, Any]]]" if list_elements_nullable(field_info) else "List[Dict[str, Any]]"
+    else:
+        return field_info["type"]
+    return make_optional(base) if _is_nullable(field_info["type"]) else base
+
+
+def _merge_field(first: Dict[str, Any], second: Dict[str, Any], max_enum_values: Optional[int]) -> Step:
+    """Step merging two field definitions observed for the same key."""
+    if first["type"] == "None" or second["type"] == "None":
+        merged = dict(second if first["type"] == "None" else first)
+        merged["type"] = make_optional(merged["type"])
+        merged["optional"] = first["optional"] or second["optional"]
+        return merged
+
+    nullable = _is_nullable(first["type"]) or _is_nullable(second["type"])
+    merged = {
+        "json_key": first["json_key"],
+        "optional": first["optional"] or second["optional"],
+        "type": None,
+        "info": None,
+        "is_custom_class": False,
+        "is_list": False,
+        "list_element_type": None,
+        "list_element_is_custom": False
+    }
+
+    if first["is_custom_class"] and second["is_custom_class"]:
+        merged["info"] = yield _merge_class_info(first["info"], second["info"], max_enum_values)
+        merged["type"] = merged["info"]["name"]
+        merged["is_custom_class"] = True
+    elif first["is_list"] and second["is_list"]:
+        merged["is_list"] = True
+        first_custom = first["list_element_is_custom"]
+        second_custom = second["list_element_is_custom"]
+        # Null elements on either side, or a list of nulls next to objects
+        nullable_elements = (
+            list_elements_nullable(first) or list_elements_nullable(second)
+            or first["list_element_type"] == "None" or second["list_element_type"] == "None"
+        )
+        if first_custom and second_custom:
+            merged["info"] = yield _merge_class_info(first["info"], second["info"], max_enum_values)
+        elif first_custom and second["list_element_type"] in ("Any", "None"):
+            merged["info"] = first["info"]
+        elif second_custom and first["list_element_type"] in ("Any", "None"):
+            merged["info"] = second["info"]
+
+        if merged["info"] is not None:
+            merged["list_element_type"] = merged["info"]["name"]
+            merged["list_element_is_custom"] = True
+            element = make_optional(merged["list_element_type"]) if nullable_elements else merged["list_element_type"]
+        else:
+            merged["list_element_type"] = merge_python_types(
+                _list_element(_as_basic_type(first)), _list_element(_as_basic_type(second))
+            )
+            element = merged["list_element_type"]
+        merged["type"] = f"List[{element}]"
+    else:
+        merged["type"] = merge_python_types(_as_basic_type(first), _as_basic_type(second))
+        _merge_value_stats(merged, first, second, max_enum_values)
+        return merged
+
+    if nullable:
+        merged["type"] = make_optional(merged["type"])
+    return merged
+
+
+def _merge_value_stats(
+    merged: Dict[str, Any],
+    first: Dict[str, Any],
+    second: Dict[str, Any],
+    max_enum_values: Optional[int]
+) -> None:
+    """Combine the value statistics of two fields into a merged string field."""
+    if "value_count" not in first and "value_count" not in second:
+        return
+    if [member for member in split_type_members(merged["type"]) if member != "None"] != ["str"]:
+        # Statistics only describe string fields
+        return
+    if first.get("value_count") and first["values"] is None or second.get("value_count") and second["values"] is None:
+        values = None
+    else:
+        values = sorted(set(first.get("values") or ()) | set(second.get("values") or ()))
+        if max_enum_values is not None and len(values) > max_enum_values:
+            values = None
+    merged["values"] = values
+    merged["value_count"] = first.get("value_count", 0) + second.get("value_count", 0)
+
+
+def low_cardinality_values(field_info: Dict[str, Any]) -> Optional[List[str]]:
+    """
+    Get the values of a string field with few distinct values.
+
+    A field qualifies when value statistics were collected for it (see
+    analyze_json_structure), the number of distinct values stayed within
+    the limit, and every value was seen at least twice on average, so
+    fields that merely happened to be sampled a few times do not qualify.
+
+    Args:
+        field_info: Field definition information
+
+    Returns:
+        Sorted distinct values of the field, or None if it does not qualify
+    """
+    values = field_info.get("values")
+    if not values or field_info["value_count"] < 2 * len(values):
+        return None
+    return values
+
+
+def list_elements_nullable(field_info: Dict[str, Any]) -> bool:
+    """
+    Check whether a list of nested objects also held nulls.
+
+    Such a field is typed ``List[Optional[<Class>]]``, and its null
+    elements are decoded and encoded as None.
+
+    Args:
+        field_info: Field definition information
+
+    Returns:
+        True if the field is a list of nested objects with null elements
+    """
+    return field_info["list_element_is_custom"] and _is_nullable(_list_element(field_info["type"]))
+
+
+def _list_element(type_str: str) -> str:
+    """Element type of a ``List[...]`` type string, ignoring nullability."""
+    type_str = strip_optional(type_str)
+    if type_str.startswith("List[") and type_str.endswith("]"):
+        return type_str[len("List["):-1]
+    return "Any"
+
+
+def collect_classes(class_info: Dict[str, Any], seen: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+    """
+    List the distinct class definitions of a tree in dependency order.
+
+    Nested classes come before the classes using them and the root class
+    comes last; classes are distinguished by name. The tree is walked with
+    an explicit stack, so any nesting depth is supported.
+
+    Args:
+        class_info: Dictionary containing class definition information
+        seen: Names of nested classes to leave out; names of the listed
+            classes are added to it
+
+    Returns:
+        List of class definition dictionaries
+    """
+    seen = set() if seen is None else seen
+    seen.add(class_info["name"])
+    return _walk_classes(class_info, lambda info: info["name"], seen)
+
+
+def _walk_classes(
+    class_info: Dict[str, Any],
+    key: Callable[[Dict[str, Any]], Any],
+    seen: Set[Any]
+) -> List[Dict[str, Any]]:
+    """List the classes of a tree children first, skipping keys in ``seen``."""
+    ordered: List[Dict[str, Any]] = []
+    stack = [(class_info, iter(class_info["fields"].values()))]
+    while stack:
+        info, fields = stack[-1]
+        for field_info in fields:
+            child = field_info["info"]
+            if child is not None and key(child) not in seen:
+                seen.add(key(child))
+                stack.append((child, iter(child["fields"].values())))
+                break
+        else:
+            stack.pop()
+            ordered.append(info)
+    return ordered
+
+
+def schema_fingerprint(class_info: Dict[str, Any]) -> str:
+    """
+    Compute a fingerprint of a complete class definition tree.
+
+    Unlike class_shape_digest, the fingerprint covers class names and field
+    order, so two trees with the same fingerprint generate the same code.
+
+    Args:
+        class_info: Dictionary containing class definition information
+
+    Returns:
+        Hex digest of the class definition tree
+    """
+    digests: Dict[int, str] = {}
+    for info in _walk_classes(class_info, id, {id(class_info)}):
+        fields = []
+        for field_name, field_info in info["fields"].items():
+            payload = {key: value for key, value in field_info.items() if key not in _UNSHAPED_KEYS}
+            if "values" in field_info:
+                # Counts change with every sample, the generated enums only with this
+                payload["values"] = low_cardinality_values(field_info)
+            if field_info["info"] is not None:
+                payload["info"] = digests[id(field_info["info"])]
+            fields.append([field_name, payload])
+        encoded = json.dumps([info["name"], info["type"], fields], separators=(",", ":"), default=list)
+        digests[id(info)] = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    return digests[id(class_info)]
+
+
+def class_shape_digest(class_info: Dict[str, Any]) -> str:
+    """
+    Compute a structural digest of a class definition.
+
+    The digest covers field names, JSON keys, field types and the shapes of
+    nested classes, but not class names or field order, so identical shapes
+    reached under different keys hash the same.
+
+    Args:
+        class_info: Dictionary containing class definition information
+
+    Returns:
+        Hex digest identifying the class shape
+    """
+    digests: Dict[int, str] = {}
+    for info in _walk_classes(class_info, id, {id(class_info)}):
+        digests[id(info)] = _shape_digest(info, {
+            field_name: digests[id(field_info["info"])]
+            for field_name, field_info in info["fields"].items()
+            if field_info["info"] is not None
+        })
+    return digests[id(class_info)]
+
+
+def deduplicate_classes(class_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Hash-cons class definitions so every distinct shape is defined once.
+
+    Nested classes with identical shapes are replaced by a single shared
+    definition (named after the first occurrence) and every field using
+    them is pointed at it. Distinct shapes that ended up with the same
+    class name get a numeric suffix, so class names identify shapes. The
+    root class always keeps its name.
+
+    Args:
+        class_info: Dictionary containing class definition information
+
+    Returns:
+        New dictionary with shared nested class definitions
+    """
+    canonical: Dict[str, Dict[str, Any]] = {}
+    canonical_digests: Dict[int, str] = {}
+    visited: Dict[int, Dict[str, Any]] = {}
+    taken_names = {class_info["name"]}
+
+    # Children are canonicalized before the classes referring to them
+    for info in _walk_classes(class_info, id, {id(class_info)}):
+        fields: Dict[str, Any] = {}
+        child_digests: Dict[str, str] = {}
+        for field_name, field_info in info["fields"].items():
+            if field_info["info"] is not None:
+                child = visited[id(field_info["info"])]
+                field_info = _retarget_field(field_info, child)
+                child_digests[field_name] = canonical_digests[id(child)]
+            fields[field_name] = field_info
+
+        digest = _shape_digest(info, child_digests)
+        if digest not in canonical:
+            name = info["name"]
+            if info is not class_info:
+                suffix = 2
+                while name in taken_names:
+                    name = f"{info['name']}{suffix}"
+                    suffix += 1
+                taken_names.add(name)
+            result = {
+                "name": name,
+                "type": info["type"],
+                "fields": fields
+            }
+            canonical[digest] = result
+            canonical_digests[id(result)] = digest
+        else:
+            # Same shape seen again: pool the value statistics of both
+            shared_fields = canonical[digest]["fields"]
+            for field_name, field_info in fields.items():
+                if "value_count" in field_info:
+                    pooled = dict(shared_fields[field_name])
+                    _merge_value_stats(pooled, shared_fields[field_name], field_info, None)
+                    shared_fields[field_name] = pooled
+        visited[id(info)] = canonical[digest]
+
+    return visited[id(class_info)]
+
+
+def _shape_digest(class_info: Dict[str, Any], child_digests: Dict[str, str]) -> str:
+    """Digest a class from its own fields and the digests of its children."""
+    fields = []
+    for field_name in sorted(class_info["fields"]):
+        field_info = class_info["fields"][field_name]
+        payload = {key: value for key, value in field_info.items() if key not in _UNSHAPED_KEYS}
+        if field_info["info"] is not None:
+            # Child class names are replaced by the child shape
+            payload["type"] = _is_nullable(field_info["type"])
+            payload["list_element_type"] = None
+            if list_elements_nullable(field_info):
+                payload["list_element_type"] = "None"
+            payload["info"] = child_digests[field_name]
+        fields.append([field_name, payload])
+    encoded = json.dumps([class_info["type"], fields], sort_keys=True, default=list)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def _retarget_field(field_info: Dict[str, Any], class_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a field pointing at another nested class definition."""
+    retargeted = dict(field_info)
+    retargeted["info"] = class_info
+    if field_info["is_custom_class"]:
+        class_type = class_info["name"]
+    elif field_info["is_list"] and field_info["list_element_is_custom"]:
+        retargeted["list_element_type"] = class_info["name"]
+        element = make_optional(class_info["name"]) if list_elements_nullable(field_info) else class_info["name"]
+        class_type = f"List[{element}]"
+    else:
+        return retargeted
+    retargeted["type"] = make_optional(class_type) if _is_nullable(field_info["type"]) else class_type
+    return retargeted
@@ -4,19 +4,53 @@ Type inference utilities.
 Provides functionality to determine Python types from JSON values.
 """
 
-from typing import Any, List, Dict
+import random
+from typing import Any, List, Dict, Optional
 
+SAMPLING_STRATEGIES = ("first", "reservoir")
 
-def get_python_type(json_value: Any) -> str:
+
+def get_python_type(json_value: Any, max_samples: Optional[int] = None, sampling: str = "first") -> str:
     """
     Determine the corresponding Python type string from a JSON value.
 
+    List element types are merged across the sampled elements.
+
     Args:
         json_value: A JSON value (int, str, bool, list, dict, None, etc.)
+        max_samples: Maximum number of list elements inspected (all when None)
+        sampling: ``"first"`` or ``"reservoir"``, see sample_elements
 
     Returns:
         String representation of the corresponding Python type
     """
+    if not isinstance(json_value, list):
+        return _scalar_type(json_value)
+    if not json_value:
+        return "List[Any]"
+
+    # Each frame holds the remaining elements of an array and the element
+    # type merged so far, so nested arrays do not recurse.
+    stack: List[List[Any]] = [[iter(sample_elements(json_value, max_samples, sampling)), None]]
+    while True:
+        frame = stack[-1]
+        for item in frame[0]:
+            if isinstance(item, list) and item:
+                stack.append([iter(sample_elements(item, max_samples, sampling)), None])
+                break
+            item_type = "List[Any]" if isinstance(item, list) else _scalar_type(item)
+            frame[1] = item_type if frame[1] is None else merge_python_types(frame[1], item_type)
+        else:
+            stack.pop()
+            list_type = f"List[{frame[1]}]"
+            if not stack:
+                return list_type
+            parent = stack[-1]
+            parent[1] = list_type if parent[1] is None else merge_python_types(parent[1], list_type)
+
+
+def _scalar_type(json_value: Any) -> str:
+    """Return the type string of a JSON value that is not an array."""
     if isinstance(json_value, bool):
         return "bool"
     elif isinstance(json_value, int):
@@ -25,15 +59,173 @@ def get_python_type(json_value: Any) -> str:
         return "float"
     elif isinstance(json_value, str):
         return "str"
-    elif isinstance(json_value, list):
-        if not json_value:
-            return "List[Any]"
-        # Assume all elements in the list are of the same type
-        element_type = get_python_type(json_value[0])
-        return f"List[{element_type}]"
     elif isinstance(json_value, dict):
         return "Dict[str, Any]"  # Will be replaced with specific class type later
     elif json_value is None:
         return "None"
     else:
         return "Any"
+
+
+def sample_elements(values: List[Any], max_samples: Optional[int] = None, sampling: str = "first") -> List[Any]:
+    """
+    Pick the array elements that are inspected during type inference.
+
+    Args:
+        values: Array elements
+        max_samples: Maximum number of elements to return (all when None)
+        sampling: ``"first"`` keeps the leading elements, ``"reservoir"``
+            picks a uniform random subset (seeded, so output is stable)
+            and keeps it in array order
+
+    Returns:
+        List of sampled elements
+
+    Raises:
+        ValueError: If the sampling strategy or sample limit is invalid
+    """
+    if sampling not in SAMPLING_STRATEGIES:
+        raise ValueError(f"Unknown sampling strategy: {sampling}")
+    if max_samples is not None and max_samples < 1:
+        raise ValueError(f"max_samples must be at least 1, got {max_samples}")
+    if max_samples is None or len(values) <= max_samples:
+        return values
+    if sampling == "first":
+        return values[:max_samples]
+    indices = random.Random(len(values)).sample(range(len(values)), max_samples)
+    return [values[index] for index in sorted(indices)]
+
+
+def split_type_members(type_str: str) -> List[str]:
+    """
+    Split a type string into its union members.
+
+    ``Optional[X]`` yields the members of ``X`` plus ``"None"`` and
+    ``Union[A, B]`` yields ``A`` and ``B``; any other type is returned as a
+    single member.
+
+    Args:
+        type_str: Type string as produced by get_python_type
+
+    Returns:
+        List of member type strings
+    """
+    if type_str.startswith("Optional[") and type_str.endswith("]"):
+        return split_type_members(type_str[len("Optional["):-1]) + ["None"]
+    if type_str.startswith("Union[") and type_str.endswith("]"):
+        members: List[str] = []
+        for part in _split_top_level(type_str[len("Union["):-1]):
+            members.extend(split_type_members(part))
+        return members
+    return [type_str]
+
+
+def make_optional(type_str: str) -> str:
+    """
+    Wrap a type string in ``Optional[...]`` unless it already admits None.
+
+    Args:
+        type_str: Type string to wrap
+
+    Returns:
+        Type string that admits None
+    """
+    if type_str in ("None", "Any") or "None" in split_type_members(type_str):
+        return type_str
+    return f"Optional[{type_str}]"
+
+
+def strip_optional(type_str: str) -> str:
+    """
+    Remove ``None`` from a type string.
+
+    Args:
+        type_str: Type string, possibly wrapped in Optional
+
+    Returns:
+        Type string without the None member
+    """
+    members = [member for member in split_type_members(type_str) if member != "None"]
+    return _join_members(members) if members else "None"
+
+
+def merge_python_types(first: str, second: str) -> str:
+    """
+    Merge two type strings into the narrowest type string covering both.
+
+    Nulls promote to ``Optional``, ``int`` widens to ``float``, list element
+    types are merged level by level and anything else becomes a ``Union``.
+    ``Any`` only comes from empty arrays in JSON input, so it is treated as
+    "no evidence" and yields to the other side.
+
+    Args:
+        first: First type string
+        second: Second type string
+
+    Returns:
+        Merged type string
+    """
+    # Every nesting level contributes its union members; the element types
+    # of all List members at one level are merged together one level down.
+    levels: List[List[str]] = []
+    types = [first, second]
+    while not all(type_str == types[0] for type_str in types):
+        members: List[str] = []
+        elements: List[str] = []
+        for type_str in types:
+            for member in split_type_members(type_str):
+                if member.startswith("List[") and member.endswith("]"):
+                    elements.append(member[len("List["):-1])
+                    member = "List"
+                if member not in members:
+                    members.append(member)
+        levels.append(members)
+        if not elements:
+            break
+        types = elements
+
+    merged = types[0]
+    while levels:
+        merged = _merge_members(levels.pop(), merged)
+    return merged
+
+
+def _merge_members(members: List[str], list_element: str) -> str:
+    """Build a merged type string from the union members of one level."""
+    if "List" in members:
+        members[members.index("List")] = f"List[{list_element}]"
+    if len(members) > 1 and "Any" in members:
+        members.remove("Any")
+    if "int" in members and "float" in members:
+        members.remove("int")
+
+    nullable = "None" in members
+    members = [member for member in members if member != "None"]
+    if not members:
+        return "None"
+    merged = _join_members(members)
+    return f"Optional[{merged}]" if nullable else merged
+
+
+def _join_members(members: List[str]) -> str:
+    """Build a type string from non-None union members."""
+    if len(members) == 1:
+        return members[0]
+    return f"Union[{', '.join(members)}]"
+
+
+def _split_top_level(type_args: str) -> List[str]:
+    """Split comma separated type arguments, ignoring commas inside brackets."""
+    parts: List[str] = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(type_args):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(type_args[start:index].strip())
+            start = index + 1
+    parts.append(type_args[start:].strip())
+    return parts
@@ -0,0 +1,79 @@
+"""
+Watch mode.
+
+Polls input JSON files and regenerates the type declaration files of the
+inputs that changed, skipping those whose schema fingerprint did not.
+"""
+
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .batch import collect_json_files, is_batch_input, plan_outputs
+from .cache import GenerationCache, stat_signature
+from .code_generator import generate_type_declare_file
+
+
+def watch(
+    input_path: str,
+    output_path: Optional[str] = None,
+    interval: float = 1.0,
+    cache: Optional[GenerationCache] = None,
+    max_polls: Optional[int] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    **options: Any
+) -> None:
+    """
+    Regenerate type declaration files whenever their inputs change.
+
+    Every poll compares the size and modification time of the inputs with
+    the previous poll; changed and new inputs are regenerated through the
+    cache, so an input whose values changed but whose schema fingerprint
+    did not leaves its output untouched. Inputs that fail to parse are
+    reported and retried once they change again, inputs that cannot be read
+    on the next poll. Directory and glob inputs
+    are resolved again on every poll to pick up new files.
+
+    Args:
+        input_path: JSON file, directory or glob pattern
+        output_path: Output file, or output directory for batch inputs
+        interval: Seconds between polls
+        cache: Cache deciding which outputs are current (default: a cache
+            in DEFAULT_CACHE_DIR)
+        max_polls: Stop after this many polls (default: run until
+            interrupted)
+        sleep: Function waiting between polls
+        **options: Keyword arguments passed to generate_type_declare_file
+    """
+    cache = cache if cache is not None else GenerationCache()
+    seen: Dict[str, Optional[Tuple[int, int]]] = {}
+    extension = "" if options.get("package") else ".py"
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        if polls:
+            sleep(interval)
+        polls += 1
+        for json_path, target_path in _plan(input_path, output_path, extension):
+            signature = stat_signature(json_path)
+            if signature is None or seen.get(json_path) == signature:
+                continue
+            seen[json_path] = signature
+            if target_path:
+                os.makedirs(os.path.dirname(target_path) or ".", exist_ok=True)
+            try:
+                generate_type_declare_file(json_path, target_path, cache=cache, **options)
+            except OSError as error:
+                # Removed or unreadable since the stat; retried on the next poll
+                del seen[json_path]
+                print(f"Skipping {json_path}: {error}", file=sys.stderr)
+            except ValueError as error:
+                # Typically a file caught mid-write; retried once it changes again
+                print(f"Skipping {json_path}: {error}", file=sys.stderr)
+
+
+def _plan(input_path: str, output_path: Optional[str], extension: str) -> List[Tuple[str, Optional[str]]]:
+    """Resolve the current inputs and their output paths."""
+    if is_batch_input(input_path):
+        return plan_outputs(collect_json_files(input_path), output_path, extension)
+    return [(input_path, output_path)]
+
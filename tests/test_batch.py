@@ -0,0 +1,65 @@
+"""Tests for batch generation."""
+
+import json
+import pytest
+from json2pytype.batch import collect_json_files, generate_batch, is_batch_input, plan_outputs
+
+
+def _write_samples(tmp_path):
+    (tmp_path / "nested").mkdir()
+    samples = {
+        "b_sample.json": {"id": 1},
+        "a_sample.json": {"name": "x"},
+        "nested/c_sample.json": {"items": [{"id": 2}]},
+    }
+    for name, data in samples.items():
+        (tmp_path / name).write_text(json.dumps(data), encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+
+
+def test_collect_json_files(tmp_path):
+    _write_samples(tmp_path)
+    
+    assert is_batch_input(str(tmp_path))
+    assert is_batch_input(str(tmp_path / "*.json"))
+    assert not is_batch_input(str(tmp_path / "a_sample.json"))
+    
+    paths = collect_json_files(str(tmp_path))
+    assert paths == sorted(paths)
+    assert [p.rsplit("/", 1)[-1] for p in paths] == ["a_sample.json", "b_sample.json", "c_sample.json"]
+    assert len(collect_json_files(str(tmp_path / "*.json"))) == 2
+
+
+def test_generate_batch_in_parallel(tmp_path):
+    _write_samples(tmp_path)
+    output_dir = tmp_path / "out"
+    paths = collect_json_files(str(tmp_path))
+    
+    outputs = generate_batch(paths, str(output_dir), jobs=2)
+    
+    assert outputs == [
+        str(output_dir / "a_sample.py"),
+        str(output_dir / "b_sample.py"),
+        str(output_dir / "nested" / "c_sample.py"),
+    ]
+    assert "class CSample:" in (output_dir / "nested" / "c_sample.py").read_text(encoding="utf-8")
+
+
+def test_generate_batch_streams_line_delimited_files(tmp_path):
+    (tmp_path / "users.json").write_text(json.dumps({"id": 1}), encoding="utf-8")
+    (tmp_path / "events.ndjson").write_text('{"kind": "a"}\n{"kind": "b", "at": 1}\n', encoding="utf-8")
+    output_dir = tmp_path / "out"
+    
+    outputs = generate_batch(collect_json_files(str(tmp_path)), str(output_dir), jobs=1)
+    
+    assert outputs == [str(output_dir / "events.py"), str(output_dir / "users.py")]
+    assert "at: Optional[int]" in (output_dir / "events.py").read_text(encoding="utf-8")
+
+
+def test_plan_outputs_rejects_colliding_outputs(tmp_path):
+    paths = [str(tmp_path / "a.json"), str(tmp_path / "a.ndjson")]
+    
+    with pytest.raises(ValueError, match="a.json and .*a.ndjson"):
+        plan_outputs(paths, str(tmp_path / "out"))
+    with pytest.raises(ValueError):
+        plan_outputs(paths, None)
@@ -0,0 +1,35 @@
+"""Tests for the benchmark suite."""
+
+import json
+from json2pytype.benchmark import compare_results, make_deep_payload, make_wide_payload, run_benchmarks
+
+
+def test_payload_generators():
+    assert len(make_wide_payload(10)) == 10
+    
+    deep = make_deep_payload(3)
+    assert deep["child1"]["child2"]["child3"]["leafName"] == "leaf"
+
+
+def test_run_benchmarks_is_machine_readable():
+    results = json.loads(json.dumps(run_benchmarks(scale=0.001, repeat=1, slots=True)))
+    
+    assert results["codegen_options"] == {"slots": True}
+    assert set(results["scenarios"]) == {"wide", "deep", "long"}
+    long_metrics = results["scenarios"]["long"]
+    assert long_metrics["records"] == 50
+    assert long_metrics["decode_records_per_s"] > 0
+    assert long_metrics["peak_memory_bytes"] > 0
+    
+    comparison = compare_results(results, results)
+    assert comparison["wide"]["analyze_s"] == 1.0
+
+
+def test_generated_classes_leave_out_helpers():
+    plain = run_benchmarks(scale=0.001, repeat=1)["scenarios"]
+    helpers = run_benchmarks(scale=0.001, repeat=1, to_json=True, validate=True)["scenarios"]
+    
+    # The ValidationError helper is not counted
+    assert {name: metrics["generated_classes"] for name, metrics in helpers.items()} == {
+        name: metrics["generated_classes"] for name, metrics in plain.items()
+    }
@@ -0,0 +1,111 @@
+"""Tests for the generation cache and watch mode."""
+
+import json
+import os
+import sys
+from json2pytype.cache import GenerationCache
+from json2pytype.code_generator import generate_type_declare_file
+from json2pytype.watch import watch
+
+
+def _write(path, data, mtime_ns):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_cache_skips_unchanged_inputs_and_shapes(tmp_path):
+    json_path = tmp_path / "sample.json"
+    output_path = str(tmp_path / "sample.py")
+    cache = GenerationCache(str(tmp_path / "cache"))
+    _write(json_path, {"id": 1, "name": "a"}, 1_000_000_000)
+    
+    generate_type_declare_file(str(json_path), output_path, verbose=False, cache=cache)
+    written = os.stat(output_path).st_mtime_ns
+    assert (cache.hits, cache.misses) == (0, 1)
+    
+    # Unchanged input: analysis is skipped
+    generate_type_declare_file(str(json_path), output_path, verbose=False, cache=cache)
+    assert (cache.hits, cache.misses) == (1, 1)
+    
+    # New values, same shape: the output is not rewritten
+    _write(json_path, {"id": 22, "name": "bb"}, 2_000_000_000)
+    generate_type_declare_file(str(json_path), output_path, verbose=False, cache=cache)
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert os.stat(output_path).st_mtime_ns == written
+    
+    # Different options or shape regenerate
+    generate_type_declare_file(str(json_path), output_path, verbose=False, cache=cache, slots=True)
+    assert "__slots__" in open(output_path, encoding="utf-8").read()
+    _write(json_path, {"id": 22, "name": "bb", "tags": ["x"]}, 3_000_000_000)
+    generate_type_declare_file(str(json_path), output_path, verbose=False, cache=cache, slots=True)
+    assert "tags: List[str]" in open(output_path, encoding="utf-8").read()
+    assert cache.misses == 3
+    
+    # A hand-edited output is regenerated
+    with open(output_path, "a", encoding="utf-8") as f:
+        f.write("# edited\n")
+    generate_type_declare_file(str(json_path), output_path, verbose=False, cache=cache, slots=True)
+    assert "# edited" not in open(output_path, encoding="utf-8").read()
+
+
+def test_cache_tracks_every_package_module(tmp_path):
+    json_path = tmp_path / "team.json"
+    package_dir = tmp_path / "team"
+    cache = GenerationCache(str(tmp_path / "cache"))
+    _write(json_path, {"id": 1, "owner": {"name": "a"}}, 1_000_000_000)
+    
+    generate_type_declare_file(str(json_path), str(package_dir), verbose=False, cache=cache, package="class")
+    generate_type_declare_file(str(json_path), str(package_dir), verbose=False, cache=cache, package="class")
+    assert (cache.hits, cache.misses) == (1, 1)
+    
+    # Editing or removing a class module regenerates the package
+    (package_dir / "team_owner.py").write_text("# edited\n", encoding="utf-8")
+    generate_type_declare_file(str(json_path), str(package_dir), verbose=False, cache=cache, package="class")
+    assert "class TeamOwner" in (package_dir / "team_owner.py").read_text(encoding="utf-8")
+    (package_dir / "team_owner.py").unlink()
+    generate_type_declare_file(str(json_path), str(package_dir), verbose=False, cache=cache, package="class")
+    assert (package_dir / "team_owner.py").exists()
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_watch_regenerates_changed_inputs(tmp_path):
+    (tmp_path / "in").mkdir()
+    first = tmp_path / "in" / "first.json"
+    second = tmp_path / "in" / "second.json"
+    _write(first, {"id": 1}, 1_000_000_000)
+    _write(second, {"id": 1}, 1_000_000_000)
+    out_dir = tmp_path / "out"
+    cache = GenerationCache(str(tmp_path / "cache"))
+    
+    edits = iter([
+        lambda: _write(first, {"id": 1, "name": "x"}, 2_000_000_000),
+        lambda: _write(second, {"id": 2}, 2_000_000_000),
+    ])
+    watch(str(tmp_path / "in"), str(out_dir), cache=cache, max_polls=3,
+          sleep=lambda interval: next(edits)(), verbose=False)
+    
+    assert "name: str" in (out_dir / "first.py").read_text(encoding="utf-8")
+    assert (out_dir / "second.py").exists()
+    # Two initial generations, the shape change of first and the value-only change of second
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_watch_retries_unreadable_inputs(tmp_path, monkeypatch):
+    json_path = tmp_path / "sample.json"
+    _write(json_path, {"id": 1}, 1_000_000_000)
+    calls = []
+    
+    def generate(path, output_path, **options):
+        calls.append(path)
+        if len(calls) == 1:
+            raise FileNotFoundError(path)
+        return generate_type_declare_file(path, output_path, **options)
+    
+    # The package exports the watch function under the module's name
+    monkeypatch.setattr(sys.modules["json2pytype.watch"], "generate_type_declare_file", generate)
+    watch(str(json_path), str(tmp_path / "sample.py"), cache=GenerationCache(str(tmp_path / "cache")),
+          max_polls=3, sleep=lambda interval: None, verbose=False)
+    
+    # Retried on the next poll although the input did not change, then current
+    assert len(calls) == 2
+    assert (tmp_path / "sample.py").exists()
@@ -1,7 +1,13 @@
 """Tests for code generator."""
 
+import importlib
+import io
+import json
+import pickle
+import sys
+import pytest
 from json2pytype.structure_analyzer import analyze_json_structure
-from json2pytype.code_generator import generate_class_code
+from json2pytype.code_generator import generate_class_code, generate_module_code, iter_module_code, write_module_code
 
 
 def test_generate_simple_class():
@@ -27,8 +33,8 @@ def test_generate_simple_class():
     
     # Check if __call__ method is generated
     assert "    def __call__(self) -> dict:" in code
-    assert "        result['name'] = self.name" in code
-    assert "        result['age'] = self.age" in code
+    assert "            'name': self.name," in code
+    assert "            'age': self.age," in code
 
 
 def test_generate_nested_class():
@@ -70,7 +76,7 @@ def test_generate_class_with_list():
     assert "        self.hobbies = data.get('hobbies', [])" in code
     
     # Check __call__ method
-    assert "        result['hobbies'] = self.hobbies" in code
+    assert "            'hobbies': self.hobbies," in code
 
 
 def test_generate_class_with_object_list():
@@ -96,4 +102,349 @@ def test_generate_class_with_object_list():
     assert "            UsersItem(item) for item in data.get('users', [])" in code
     
     # Check __call__ method for list
-    assert "        result['users'] = [item() for item in self.users] if self.users else []" in code
+    assert "            'users': [item() for item in self.users] if self.users else []," in code
+
+
+def test_generate_null_list_elements():
+    json_data = {"users": [{"id": 1}, None, {"id": 2}]}
+    class_info = analyze_json_structure(json_data, "Team")
+    assert class_info["fields"]["users"]["type"] == "List[Optional[UsersItem]]"
+    
+    for options in ({}, {"fast_decode": True}, {"strict": True}, {"columnar": True}, {"lazy": True},
+                    {"validate": True}, {"to_json": True}, {"backend": "tuple"}):
+        namespace = {}
+        exec(generate_module_code(class_info, **options), namespace)
+        if options.get("backend") == "tuple":
+            team = namespace["Team"].from_dict(json_data)
+            assert team.to_dict() == json_data
+        else:
+            team = namespace["Team"](json_data)
+            assert team() == json_data
+        assert team.users[1] is None
+        if options.get("to_json"):
+            assert json.loads(team.to_json()) == json_data
+
+
+def test_generate_shared_nested_class_once():
+    json_data = {
+        "billing": {"street": "Main St"},
+        "shipping": {"street": "Side St"}
+    }
+    
+    class_info = analyze_json_structure(json_data, "Order")
+    code = generate_class_code(class_info)
+    
+    assert code.count("class OrderBilling:") == 1
+    assert "class OrderShipping:" not in code
+    assert "    shipping: OrderBilling" in code
+    assert "        self.shipping = OrderBilling(data.get('shipping', {}) or {})" in code
+
+
+def test_generate_slots():
+    json_data = {
+        "name": "Test",
+        "users": [{"name": "John"}],
+        "meta": {}
+    }
+    
+    class_info = analyze_json_structure(json_data, "Root")
+    code = generate_class_code(class_info, slots=True)
+    
+    assert "    __slots__ = ('name', 'users', 'meta')" in code
+    assert "    __slots__ = ('name',)" in code
+    assert "    __slots__ = ()" in code
+    
+    namespace = {}
+    exec("from typing import List, Dict, Any, Optional, Union\n" + code, namespace)
+    root = namespace["Root"]({"name": "Test", "users": [{"name": "John"}]})
+    assert not hasattr(root, "__dict__")
+    assert not hasattr(root.users[0], "__dict__")
+    assert root() == {"name": "Test", "users": [{"name": "John"}], "meta": {}}
+
+
+def test_generate_fast_decode():
+    json_data = {
+        "users": [{"name": "John", "age": 30}, {"name": "Jane"}],
+        "owner": {"name": "Ann"}
+    }
+    
+    class_info = analyze_json_structure(json_data, "Team")
+    code = generate_class_code(class_info, strict=True)
+    
+    assert "    def from_list(cls, records: list) -> list:" in code
+    assert "        self.users = UsersItem.from_list(data['users'])" in code
+    assert "            obj.name = data['name']" in code
+    assert "            obj.age = get('age')" in code
+    
+    namespace = {}
+    exec("from typing import List, Dict, Any, Optional, Union\n" + code, namespace)
+    team = namespace["Team"](json_data)
+    assert team.users[1].age is None
+    assert team() == {
+        "users": [{"name": "John", "age": 30}, {"name": "Jane", "age": None}],
+        "owner": {"name": "Ann"}
+    }
+    teams = namespace["Team"].from_list([json_data, json_data])
+    assert teams[1].owner.name == "Ann"
+
+
+def test_generate_lazy_nested_fields():
+    json_data = {
+        "owner": {"name": "Ann"},
+        "users": [{"id": 1}]
+    }
+    
+    class_info = analyze_json_structure(json_data, "Team")
+    code = generate_module_code(class_info, lazy=True, slots=True)
+    
+    assert "    owner = _LazyField(TeamOwner)" in code
+    assert "    users = _LazyField(UsersItem, many=True)" in code
+    assert "        self._raw_owner = data.get('owner')" in code
+    
+    namespace = {}
+    exec(code, namespace)
+    team = namespace["Team"](json_data)
+    assert team._raw_owner is json_data["owner"]
+    assert team() == json_data
+    assert team.users[0].id == 1
+    assert team.users is team.users
+    team.owner = namespace["TeamOwner"]({"name": "Bob"})
+    assert team() == {"owner": {"name": "Bob"}, "users": [{"id": 1}]}
+
+
+def test_generate_to_json():
+    json_data = {
+        "name": "Test",
+        "owner": {"name": "Ann"},
+        "users": [{"id": 1}]
+    }
+    
+    class_info = analyze_json_structure(json_data, "Team")
+    code = generate_module_code(class_info, to_json=True)
+    
+    assert "    def to_json(self, encode: Optional[Callable[[dict], str]] = None) -> str:" in code
+    
+    namespace = {}
+    exec(code, namespace)
+    team = namespace["Team"](json_data)
+    assert team.to_json() == json.dumps(json_data)
+    assert team.to_json(encode=lambda value: "custom") == "custom"
+    namespace["set_json_encoder"](lambda value: json.dumps(value, separators=(",", ":")))
+    assert team.owner.to_json() == '{"name":"Ann"}'
+
+
+def test_generate_deeper_than_recursion_limit():
+    depth = sys.getrecursionlimit() + 100
+    json_data = {"id": 1}
+    for _ in range(depth):
+        json_data = {"a": json_data}
+    
+    code = generate_class_code(analyze_json_structure(json_data, "Root"))
+    
+    assert code.count("\nclass ") + code.startswith("class ") == depth + 1
+    # Nested classes are defined before the classes using them
+    assert code.index("class RootA:") > code.index("class RootAA:")
+    assert code.index("class Root:") > code.index("class RootA:")
+
+
+def test_write_module_code_streams_classes():
+    json_data = {"id": 1, "owner": {"name": "Ann"}, "users": [{"id": 1, "tags": ["a"]}]}
+    class_info = analyze_json_structure(json_data, "Team")
+    
+    chunks = list(iter_module_code(class_info, lazy=True, to_json=True))
+    assert "".join(chunks) == generate_module_code(class_info, lazy=True, to_json=True)
+    assert chunks[0].startswith("from typing import")
+    # Helpers and each class arrive as separate chunks, dependencies first
+    assert [chunk.lstrip("\n").split(":", 1)[0] for chunk in chunks[3:]] == [
+        "class TeamOwner", "class UsersItem", "class Team"
+    ]
+    
+    fp = io.StringIO()
+    written = write_module_code(class_info, fp)
+    assert fp.getvalue() == generate_module_code(class_info)
+    assert written == len(fp.getvalue().encode("utf-8"))
+
+
+def test_generate_columnar_batches():
+    json_data = {
+        "rows": [
+            {"id": 1, "score": 0.5, "active": True, "name": "a", "geo": {"lat": 1.5}},
+            {"id": 2, "score": 1, "active": False, "name": None, "geo": {"lat": 2.5}},
+        ]
+    }
+    class_info = analyze_json_structure(json_data, "Report")
+    
+    for options in ({}, {"strict": True, "slots": True, "lazy": True}):
+        namespace = {}
+        exec(generate_module_code(class_info, columnar=True, **options), namespace)
+        report = namespace["Report"](json_data)
+        
+        rows = report.rows
+        assert type(rows).__name__ == "RowsItemBatch"
+        assert len(rows) == 2
+        assert (rows.id.typecode, rows.score.typecode, rows.active.typecode) == ("q", "d", "b")
+        assert rows.name == ["a", None]
+        assert rows.record(1) == {"id": 2, "score": 1.0, "active": False, "name": None, "geo": {"lat": 2.5}}
+        assert rows[-1].geo.lat == 2.5
+        assert [row.id for row in rows] == [1, 2]
+        assert report() == json_data
+    
+    # Values that do not fit an array keep a list column
+    batch = namespace["RowsItemBatch"]([{"id": None, "active": None}])
+    assert batch.id == [None]
+    assert batch() == [{"id": None, "score": None, "active": None, "name": None, "geo": None}]
+
+
+def test_generate_single_column_batches():
+    json_data = {"ids": [{"id": 1}, {"id": 2}], "tags": [{"name": "a"}]}
+    namespace = {}
+    exec(generate_module_code(analyze_json_structure(json_data, "Root"), columnar=True), namespace)
+    
+    root = namespace["Root"](json_data)
+    
+    assert root.ids() == [{"id": 1}, {"id": 2}]
+    assert root() == json_data
+
+
+def test_generate_low_cardinality_fields():
+    json_data = {"orders": [{"status": ["paid", "in-progress"][index % 2], "note": str(index)} for index in range(6)]}
+    class_info = analyze_json_structure(json_data, "Shop", max_enum_values=4)
+    
+    for options in ({}, {"fast_decode": True}, {"columnar": True, "strict": True}):
+        namespace = {}
+        exec(generate_module_code(class_info, low_cardinality="enum", **options), namespace)
+        shop = namespace["Shop"](json_data)
+        status = namespace["OrdersItemStatus"]
+        assert [member.name for member in status] == ["IN_PROGRESS", "PAID"]
+        assert shop.orders[0].status is status.PAID
+        assert shop.orders[0].note == "0"
+        assert shop() == json_data
+    
+    namespace = {}
+    exec(generate_module_code(class_info, low_cardinality="intern", fast_decode=True), namespace)
+    orders = namespace["OrdersItem"].from_list([{"status": "".join(["pa", "id"])}, {"status": "new"}])
+    assert orders[0].status is namespace["_OrdersItem_status_values"]["paid"]
+    # Values missing from the samples pass through
+    assert orders[1].status == "new"
+    assert "OrdersItemStatus" not in namespace
+
+
+def test_low_cardinality_fields_pass_unhashable_values_through():
+    json_data = {"orders": [{"status": ["paid", "in-progress"][index % 2]} for index in range(6)]}
+    class_info = analyze_json_structure(json_data, "Shop", max_enum_values=4)
+    records = [{"status": {"code": "paid"}}, {"status": ["paid"]}, {"status": "paid"}]
+    
+    for options in ({}, {"fast_decode": True}, {"columnar": True, "strict": True}, {"backend": "tuple"}):
+        namespace = {}
+        exec(generate_module_code(class_info, low_cardinality="enum", **options), namespace)
+        shop_class = namespace["Shop"]
+        shop = shop_class.from_dict({"orders": records}) if options.get("backend") else shop_class({"orders": records})
+        orders = shop.orders
+        assert [order.status for order in orders] == [{"code": "paid"}, ["paid"], "paid"]
+        assert orders[2].status is namespace["OrdersItemStatus"].PAID
+
+
+def test_generate_tuple_records():
+    json_data = {"id": 1, "owner": {"name": "a"}, "tags": ["x"], "lines": [{"sku": "s", "qty": 2}]}
+    class_info = analyze_json_structure(json_data, "Order")
+    
+    for options in ({}, {"strict": True, "to_json": True}):
+        namespace = {}
+        exec(generate_module_code(class_info, backend="tuple", **options), namespace)
+        order = namespace["Order"].from_dict(json_data)
+        
+        assert isinstance(order, tuple)
+        assert (order.id, order.owner.name, order.tags, order.lines[0].qty) == (1, "a", ("x",), 2)
+        assert order.to_dict() == json_data
+        assert order == namespace["Order"].from_list([json_data])[0]
+        assert {order, order._replace(id=2)} == {order, namespace["Order"].from_dict(dict(json_data, id=2))}
+        assert repr(order.owner) == "OrderOwner(name='a')"
+        with pytest.raises(AttributeError):
+            order.id = 3
+    
+    with pytest.raises(ValueError):
+        generate_module_code(class_info, backend="tuple", lazy=True)
+    
+    # Nested lists are frozen too, so records stay hashable
+    json_data = {"matrix": [[1, 2], [3]], "cells": [[["a"]], []], "extra": None}
+    for options in ({}, {"strict": True}):
+        namespace = {}
+        exec(generate_module_code(analyze_json_structure(json_data, "Grid"), backend="tuple", **options), namespace)
+        grid = namespace["Grid"].from_dict(json_data)
+        assert grid.matrix == ((1, 2), (3,))
+        assert hash(grid) == hash(namespace["Grid"].from_list([json_data])[0])
+        assert grid.to_dict() == json_data
+
+
+def test_generate_class_names_from_digit_keys(tmp_path, monkeypatch):
+    json_data = {"2fa": [{"method": "totp"}], "3ds": {"version": 2}}
+    class_info = analyze_json_structure(json_data, "Login")
+    (tmp_path / "login.py").write_text(generate_module_code(class_info), encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    
+    module = importlib.import_module("login")
+    
+    assert module._2faItem({"method": "totp"})() == {"method": "totp"}
+    assert module.Login(json_data)() == json_data
+
+
+def test_generate_compact_pickle(tmp_path, monkeypatch):
+    json_data = {"id": 1, "owner": {"name": "a"}, "tags": ["x"], "lines": [{"sku": "s", "qty": 2}]}
+    class_info = analyze_json_structure(json_data, "Order")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    
+    sizes = []
+    for index, options in enumerate(({}, {"compact_pickle": True}, {"compact_pickle": True, "slots": True, "lazy": True})):
+        (tmp_path / f"orders_{index}.py").write_text(generate_module_code(class_info, **options), encoding="utf-8")
+        order = importlib.import_module(f"orders_{index}").Order(json_data)
+        payload = pickle.dumps(order)
+        
+        assert pickle.loads(payload)() == json_data
+        sizes.append(len(payload))
+    assert sizes[1] < sizes[0]
+
+
+def test_generate_validating_classes():
+    json_data = {"id": 1, "price": 1.5, "owner": {"name": "a"}, "tags": ["x"], "lines": [{"sku": "s", "qty": 2}]}
+    class_info = analyze_json_structure(json_data, "Order")
+    
+    for options in ({}, {"fast_decode": True, "slots": True}):
+        namespace = {}
+        exec(generate_module_code(class_info, validate=True, **options), namespace)
+        order_class = namespace["Order"]
+        assert order_class(dict(json_data, price=2))() == dict(json_data, price=2)
+        
+        invalid = dict(json_data, lines=[{"sku": "s", "qty": 2}, {"sku": "s", "qty": "2"}])
+        with pytest.raises(namespace["ValidationError"]) as error:
+            order_class(invalid)
+        assert str(error.value) == "lines[1].qty: expected int, got str"
+        with pytest.raises(ValueError, match="owner.name: expected str, got int"):
+            order_class(dict(json_data, owner={"name": 1}))
+        
+        # Trusted input skips every check
+        namespace["set_trusted"]()
+        assert order_class(invalid).lines[1].qty == "2"
+        namespace["set_trusted"](False)
+        with pytest.raises(ValueError):
+            order_class(invalid)
+    
+    with pytest.raises(ValueError):
+        generate_module_code(class_info, validate=True, lazy=True)
+
+
+def test_validating_classes_decode_like_unchecked():
+    samples = [{"id": 1, "price": 1.5, "user": {"n": "a"}, "tags": ["x"]}, {"id": 2, "price": 2.0}]
+    class_info = analyze_json_structure({"items": samples}, "Order")
+    
+    for options in ({}, {"fast_decode": True}):
+        namespace = {}
+        exec(generate_module_code(class_info, validate=True, **options), namespace)
+        item_class = namespace["ItemsItem"]
+        payloads = [{"id": 3, "price": 1}, {"id": 4, "price": 1.0, "user": None, "tags": None}]
+        checked = [item_class(payload)() for payload in payloads]
+        namespace["set_trusted"]()
+        assert [item_class(payload)() for payload in payloads] == checked
+        namespace["set_trusted"](False)
+        
+        with pytest.raises(ValueError, match="price: missing, expected float"):
+            item_class({"id": 5})
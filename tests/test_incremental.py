@@ -0,0 +1,38 @@
+"""Tests for incremental regeneration."""
+
+import os
+from json2pytype.code_generator import generate_module_code
+from json2pytype.incremental import patch_module_source, update_module_file
+from json2pytype.structure_analyzer import analyze_json_structure
+
+DATA = {"id": 1, "owner": {"name": "a"}, "lines": [{"sku": "s", "qty": 2}], "meta": {"v": 1}}
+
+
+def test_patch_replaces_only_changed_classes():
+    old_source = generate_module_code(analyze_json_structure(DATA, "Order"))
+    old_source = old_source.replace("class OrderOwner:", "# Kept\nclass OrderOwner:")
+    changed = dict(DATA, lines=[{"sku": "s", "qty": 2, "tax": {"rate": 0.2}}])
+    del changed["meta"]
+    new_source = generate_module_code(analyze_json_structure(changed, "Order"))
+
+    patched = patch_module_source(old_source, new_source)
+
+    # The new class comes before its user, the removed one is gone
+    assert patched == new_source.replace("class OrderOwner:", "# Kept\nclass OrderOwner:")
+    namespace = {}
+    exec(patched, namespace)
+    assert namespace["Order"](changed)() == changed
+
+    # Other options change the helpers, so the module is rewritten
+    assert patch_module_source(old_source, generate_module_code(analyze_json_structure(changed, "Order"), to_json=True)) is None
+    assert patch_module_source("class Order(:", new_source) is None
+
+
+def test_update_module_file_skips_unchanged_output(tmp_path):
+    output_path = str(tmp_path / "order.py")
+    class_info = analyze_json_structure(DATA, "Order")
+
+    assert update_module_file(class_info, output_path) > 0
+    os.utime(output_path, (0, 0))
+    assert update_module_file(class_info, output_path) == 0
+    assert os.stat(output_path).st_mtime == 0
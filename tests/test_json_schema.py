@@ -0,0 +1,84 @@
+"""Tests for JSON Schema import and export."""
+
+import json
+from json2pytype.code_generator import generate_module_code, generate_type_declare_file
+from json2pytype.json_schema import from_json_schema, to_json_schema
+from json2pytype.structure_analyzer import analyze_json_structure
+
+
+def test_json_schema_round_trip():
+    json_data = [
+        {"userId": 1, "role": "admin", "address": {"city": "x"}, "tags": ["a"]},
+        {"userId": 2, "role": "admin", "address": None, "orders": [{"total": 1.5}]},
+    ]
+    class_info = analyze_json_structure(json_data, "Root", max_enum_values=4)
+    
+    schema = json.loads(json.dumps(to_json_schema(class_info)))
+    
+    item = schema["$defs"]["Item"]
+    assert item["required"] == ["userId", "role", "address"]
+    assert item["properties"]["userId"] == {"type": "integer", "x-python-name": "user_id"}
+    assert item["properties"]["address"] == {"anyOf": [{"$ref": "#/$defs/ItemAddress"}, {"type": "null"}]}
+    restored = from_json_schema(schema)
+    for options in ({}, {"strict": True, "low_cardinality": "enum"}):
+        assert generate_module_code(restored, **options) == generate_module_code(class_info, **options)
+
+
+def test_json_schema_round_trip_keeps_class_names_and_root_lists():
+    samples = [
+        {"none": {"class": 1}, "2fa": [{"on": True}], "items": [1, 2]},
+        [1, 2.5],
+        [],
+        ["a", None],
+    ]
+    for json_data in samples:
+        class_info = analyze_json_structure(json_data, "Root")
+        
+        restored = from_json_schema(json.loads(json.dumps(to_json_schema(class_info))))
+        
+        assert generate_module_code(restored) == generate_module_code(class_info)
+    
+    # Titles that are valid class names are kept, not converted again
+    restored = from_json_schema(to_json_schema(analyze_json_structure(samples[0], "Root")))
+    assert restored["fields"]["none"]["info"]["name"] == "RootNone_"
+
+
+def test_from_upstream_json_schema():
+    schema = {
+        "title": "pet order",
+        "type": "object",
+        "required": ["id"],
+        "properties": {
+            "id": {"type": "integer"},
+            "status": {"enum": ["placed", "delivered", None]},
+            "shipTo": {"oneOf": [{"$ref": "#/$defs/address"}, {"type": "null"}]},
+            "lines": {"type": "array", "items": {"allOf": [{"$ref": "#/$defs/address"}, {"properties": {"qty": {"type": "integer"}}}]}},
+            "price": {"type": ["integer", "number"]},
+            "parent": {"$ref": "#"},
+        },
+        "$defs": {"address": {"type": "object", "properties": {"city": {"type": "string"}}}},
+    }
+    
+    class_info = from_json_schema(schema)
+    
+    assert class_info["name"] == "PetOrder"
+    fields = class_info["fields"]
+    assert [fields[name]["optional"] for name in ("id", "status")] == [False, True]
+    assert (fields["status"]["type"], fields["status"]["values"]) == ("Optional[str]", ["delivered", "placed"])
+    assert fields["ship_to"]["type"] == "Optional[Address]"
+    assert fields["lines"]["type"] == "List[LinesItem]"
+    assert list(fields["lines"]["info"]["fields"]) == ["city", "qty"]
+    assert fields["price"]["type"] == "float"
+    # The self reference cannot be a nested class
+    assert fields["parent"]["type"] == "Dict[str, Any]"
+
+
+def test_generate_from_exported_schema(tmp_path):
+    json_path = tmp_path / "orders.json"
+    json_path.write_text(json.dumps({"orders": [{"id": 1, "paid": True}]}), encoding="utf-8")
+    schema_path = tmp_path / "orders.schema.json"
+    
+    generate_type_declare_file(str(json_path), verbose=False, schema_path=str(schema_path))
+    generate_type_declare_file(str(schema_path), str(tmp_path / "from_schema.py"), verbose=False, from_schema=True)
+    
+    assert (tmp_path / "from_schema.py").read_text(encoding="utf-8") == (tmp_path / "orders.py").read_text(encoding="utf-8")
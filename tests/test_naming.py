@@ -1,6 +1,15 @@
 """Tests for naming convention conversion functions."""
 
-from json2pytype.naming import camel_to_snake, snake_to_pascal
+import pytest
+from json2pytype.naming import (
+    camel_to_snake,
+    clear_naming_cache,
+    key_to_class_name,
+    naming_cache_info,
+    resolve_naming_policy,
+    snake_to_pascal,
+    to_identifier,
+)
 
 
 def test_camel_to_snake_basic():
@@ -32,3 +41,40 @@ def test_snake_to_pascal_edge_cases():
     assert snake_to_pascal("with_2_numbers") == "With2Numbers"
     assert snake_to_pascal("_leading_underscore") == "LeadingUnderscore"
     assert snake_to_pascal("trailing_underscore_") == "TrailingUnderscore"
+
+
+def test_to_identifier():
+    assert to_identifier("first-name") == "first_name"
+    assert to_identifier("2fa") == "_2fa"
+    assert to_identifier("class") == "class_"
+    assert key_to_class_name("shipping-address") == "ShippingAddress"
+    assert key_to_class_name("2fa") == "_2fa"
+    assert key_to_class_name("none") == "None_"
+
+
+def test_resolve_naming_policy():
+    assert resolve_naming_policy("snake")("userName") == "user_name"
+    assert resolve_naming_policy("original")("userName") == "userName"
+    
+    mapped = resolve_naming_policy({"userName": "login"})
+    assert mapped("userName") == "login"
+    assert mapped("firstName") == "first_name"
+    assert resolve_naming_policy(mapped) is mapped
+    
+    custom = resolve_naming_policy(str.upper)
+    assert custom("id") == "ID"
+    assert custom.cache_info().misses == 1
+    
+    with pytest.raises(ValueError):
+        resolve_naming_policy("kebab")
+
+
+def test_naming_cache_info():
+    clear_naming_cache()
+    
+    camel_to_snake("userName")
+    camel_to_snake("userName")
+    
+    stats = naming_cache_info()["camel_to_snake"]
+    assert stats.hits == 1
+    assert stats.misses == 1
@@ -0,0 +1,100 @@
+"""Tests for package output."""
+
+import importlib
+import json
+import sys
+import pytest
+from json2pytype.code_generator import generate_type_declare_file
+from json2pytype.package import write_package
+from json2pytype.structure_analyzer import analyze_json_structure
+
+DATA = {
+    "id": 1,
+    "owner": {"name": "Ann", "address": {"city": "x"}},
+    "users": [{"id": 2, "address": {"city": "y"}}],
+    "meta": {"version": 1},
+}
+
+
+def _import_fresh(tmp_path, name, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for module_name in [key for key in sys.modules if key == name or key.startswith(f"{name}.")]:
+        monkeypatch.delitem(sys.modules, module_name)
+    return importlib.import_module(name)
+
+
+def test_write_package_loads_classes_on_demand(tmp_path, monkeypatch):
+    class_info = analyze_json_structure(DATA, "Team")
+    write_package(class_info, str(tmp_path / "team_types"), to_json=True)
+    
+    package = _import_fresh(tmp_path, "team_types", monkeypatch)
+    assert "team_types.team_meta" not in sys.modules
+    
+    # Only the class and the classes it depends on are imported
+    address = package.TeamOwnerAddress({"city": "z"})
+    assert address() == {"city": "z"}
+    assert "team_types.team_owner_address" in sys.modules
+    assert "team_types.team_owner" not in sys.modules
+    
+    team = package.Team(DATA)
+    assert team() == DATA
+    assert "team_types.team_meta" in sys.modules
+    package.set_json_encoder(lambda value: "encoded")
+    assert team.meta.to_json() == "encoded"
+    assert "Team" in dir(package)
+
+
+def test_group_layout(tmp_path, monkeypatch):
+    json_path = tmp_path / "team.json"
+    json_path.write_text(json.dumps(DATA), encoding="utf-8")
+    
+    output_path = generate_type_declare_file(str(json_path), verbose=False, package="group", lazy=True, slots=True)
+    
+    assert output_path == str(tmp_path / "team")
+    assert sorted(path.name for path in (tmp_path / "team").iterdir()) == [
+        "__init__.py", "_helpers.py", "team.py", "team_meta.py", "team_owner.py", "users_item.py"
+    ]
+    source = (tmp_path / "team" / "users_item.py").read_text(encoding="utf-8")
+    assert source.startswith("from __future__ import annotations\n")
+    # The shared address class lives with the first group using it
+    assert "from .team_owner import TeamOwnerAddress" in source
+    
+    package = _import_fresh(tmp_path, "team", monkeypatch)
+    assert package.Team(DATA)() == DATA
+
+
+def test_package_columnar_batches(tmp_path, monkeypatch):
+    class_info = analyze_json_structure(DATA, "Team")
+    write_package(class_info, str(tmp_path / "columnar_types"), "group", columnar=True)
+    
+    package = _import_fresh(tmp_path, "columnar_types", monkeypatch)
+    team = package.Team(DATA)
+    assert type(team.users) is package.UsersItemBatch
+    assert team.users[0].address.city == "y"
+    assert team() == DATA
+
+
+def test_package_low_cardinality_enums(tmp_path, monkeypatch):
+    json_path = tmp_path / "roster.json"
+    users = [{"id": index, "role": ["admin", "user"][index % 2]} for index in range(4)]
+    json_path.write_text(json.dumps({"users": users}), encoding="utf-8")
+    
+    generate_type_declare_file(str(json_path), verbose=False, package="class", low_cardinality="enum")
+    
+    package = _import_fresh(tmp_path, "roster", monkeypatch)
+    assert "UsersItemRole" in package.__all__
+    roster = package.Roster({"users": users})
+    assert roster.users[1].role is package.UsersItemRole.USER
+    assert roster() == {"users": users}
+
+
+def test_package_validation_switch(tmp_path, monkeypatch):
+    class_info = analyze_json_structure(DATA, "Team")
+    write_package(class_info, str(tmp_path / "checked_team"), validate=True)
+    
+    package = _import_fresh(tmp_path, "checked_team", monkeypatch)
+    with pytest.raises(package.ValidationError):
+        package.TeamOwnerAddress({"city": 1})
+    package.set_trusted()
+    # Classes of modules imported later are switched too
+    assert package.TeamOwner({"address": {"city": 1}}).address.city == 1
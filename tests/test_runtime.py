@@ -0,0 +1,50 @@
+"""Tests for the runtime class factory."""
+
+import pickle
+from json2pytype.runtime import build_classes, build_classes_from_sample, class_cache_info, clear_class_cache
+from json2pytype.structure_analyzer import analyze_json_structure
+
+
+def test_build_classes_from_sample():
+    clear_class_cache()
+    
+    classes = build_classes_from_sample({"userName": "john", "address": {"city": "Anytown"}}, "User")
+    
+    assert list(classes) == ["UserAddress", "User"]
+    user = classes["User"]({"userName": "jane", "address": {"city": "Othertown"}})
+    assert user.user_name == "jane"
+    assert isinstance(user.address, classes["UserAddress"])
+    assert user() == {"userName": "jane", "address": {"city": "Othertown"}}
+
+
+def test_build_classes_cached_by_schema():
+    clear_class_cache(maxsize=2)
+    
+    first = build_classes(analyze_json_structure({"id": 1}, "Item"))
+    second = build_classes(analyze_json_structure({"id": 2}, "Item"))
+    slotted = build_classes(analyze_json_structure({"id": 3}, "Item"), slots=True)
+    
+    assert first is second
+    assert slotted is not first
+    assert class_cache_info() == (1, 2, 2, 2)
+    
+    build_classes(analyze_json_structure({"name": "x"}, "Item"))
+    assert class_cache_info().currsize == 2
+    clear_class_cache(maxsize=128)
+
+
+def test_build_classes_pickles_and_takes_mapping_options():
+    clear_class_cache()
+    class_info = analyze_json_structure({"id": 1, "owner": {"name": "a"}}, "Order")
+    
+    classes = build_classes(class_info, slots=True)
+    order = pickle.loads(pickle.dumps(classes["Order"]({"id": 2, "owner": {"name": "b"}})))
+    
+    assert type(order) is classes["Order"]
+    assert order() == {"id": 2, "owner": {"name": "b"}}
+    # Mapping options are part of the cache key too, and can import from registered modules
+    shared_classes = {"OrderOwner": classes["Order"].__module__}
+    shared = build_classes(class_info, slots=True, shared_classes=shared_classes)
+    assert shared is build_classes(class_info, slots=True, shared_classes=dict(shared_classes))
+    assert type(shared["Order"]({"id": 3, "owner": {"name": "c"}}).owner) is classes["OrderOwner"]
+    clear_class_cache()
@@ -0,0 +1,46 @@
+"""Tests for multi-sample analysis."""
+
+import json
+from json2pytype.samples import generate_merged_declare_file, infer_schema_from_samples
+from json2pytype.structure_analyzer import schema_fingerprint
+
+
+def _write_samples(tmp_path):
+    sample_dir = tmp_path / "responses"
+    sample_dir.mkdir()
+    paths = []
+    for index in range(6):
+        sample = {"id": index, "user": {"name": "a"}}
+        sample[f"extra_{index % 3}"] = index
+        if index == 4:
+            sample["user"]["email"] = None
+        path = sample_dir / f"response_{index}.json"
+        path.write_text(json.dumps(sample), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def test_infer_schema_from_samples(tmp_path):
+    paths = _write_samples(tmp_path)
+    
+    result = infer_schema_from_samples(paths, "Response", jobs=1)
+    
+    assert list(result["fields"]) == ["id", "user", "extra_0", "extra_1", "extra_2"]
+    assert not result["fields"]["id"]["optional"]
+    assert result["fields"]["extra_1"]["optional"]
+    email = result["fields"]["user"]["info"]["fields"]["email"]
+    assert (email["type"], email["optional"]) == ("None", True)
+    # Parallel workers reduce to the same schema
+    assert schema_fingerprint(infer_schema_from_samples(paths, "Response", jobs=2)) == schema_fingerprint(result)
+
+
+def test_generate_merged_declare_file(tmp_path):
+    paths = _write_samples(tmp_path)
+    
+    output_path = generate_merged_declare_file(paths, jobs=1, verbose=False, slots=True)
+    
+    assert output_path == str(tmp_path / "responses.py")
+    namespace = {}
+    exec((tmp_path / "responses.py").read_text(encoding="utf-8"), namespace)
+    response = namespace["Responses"]({"id": 1, "extra_2": 5})
+    assert (response.extra_2, response.extra_0) == (5, None)
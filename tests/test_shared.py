@@ -0,0 +1,76 @@
+"""Tests for shared classes."""
+
+import importlib
+import json
+import sys
+import pytest
+from json2pytype.shared import ClassRegistry, generate_shared_batch
+from json2pytype.structure_analyzer import analyze_json_structure
+
+PAGE = {"page": 1, "total": 10}
+ADDRESS = {"street": "s", "city": "c"}
+
+
+def _write_inputs(tmp_path, samples):
+    input_dir = tmp_path / "inputs"
+    input_dir.mkdir(exist_ok=True)
+    paths = []
+    for name, sample in samples.items():
+        path = input_dir / f"{name}.json"
+        path.write_text(json.dumps(sample), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def test_generate_shared_batch(tmp_path, monkeypatch):
+    users = {"items": [{"id": 1, "address": ADDRESS}], "pagination": PAGE}
+    orders = {"orders": [{"id": 2, "ship_to": ADDRESS}], "pagination": PAGE, "meta": {"version": 1}}
+    paths = _write_inputs(tmp_path, {"users": users, "orders": orders})
+    output_dir = tmp_path / "generated"
+    
+    output_paths = generate_shared_batch(paths, str(output_dir), "api.common", jobs=1, slots=True)
+    
+    assert output_paths[-1] == str(output_dir / "api" / "common.py")
+    common_source = (output_dir / "api" / "common.py").read_text(encoding="utf-8")
+    # Shared classes are named after their first use
+    assert "class UsersPagination:" in common_source and "class OrdersMeta:" not in common_source
+    orders_source = (output_dir / "orders.py").read_text(encoding="utf-8")
+    assert "from api.common import ItemsItemAddress, UsersPagination" in orders_source
+    assert "class OrdersPagination" not in orders_source
+    
+    monkeypatch.syspath_prepend(str(output_dir))
+    for name in ("users", "orders", "api", "api.common"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    users_module = importlib.import_module("users")
+    assert users_module.Users(users)() == users
+    assert type(users_module.Users(users).pagination) is importlib.import_module("orders").UsersPagination
+
+
+def test_registry_shares_classes_across_runs(tmp_path):
+    output_dir = str(tmp_path)
+    registry = ClassRegistry(output_dir)
+    registry.share({"first.py": analyze_json_structure({"address": ADDRESS}, "First")})
+    assert not registry.shared
+    registry.save()
+    
+    # A later run sees the shape a second time
+    registry = ClassRegistry(output_dir)
+    modules = registry.share({
+        "second.py": analyze_json_structure({"home": ADDRESS, "other": {"x": 1}, "address": {"x": "y"}}, "Second")
+    })
+    second, imports = modules["second.py"]
+    
+    assert imports == {"FirstAddress": "common"}
+    assert second["fields"]["home"]["type"] == "FirstAddress"
+    assert registry.save() > 0
+    assert [info["name"] for info in ClassRegistry(output_dir).shared.values()] == ["FirstAddress"]
+
+
+def test_generate_shared_batch_rejects_module_helpers(tmp_path):
+    paths = _write_inputs(tmp_path, {"users": {"pagination": PAGE}, "orders": {"pagination": PAGE}})
+    
+    # Each module would define its own ValidationError and set_trusted
+    for option in ("columnar", "to_json", "validate"):
+        with pytest.raises(ValueError, match=option):
+            generate_shared_batch(paths, str(tmp_path / "generated"), jobs=1, **{option: True})
+    assert not (tmp_path / "generated").exists()
@@ -0,0 +1,41 @@
+"""Tests for generation instrumentation."""
+
+import json
+from json2pytype.batch import generate_batch
+from json2pytype.code_generator import generate_type_declare_file
+from json2pytype.stats import GenerationStats
+
+
+def test_generate_records_phases_and_counts(tmp_path):
+    json_path = tmp_path / "sample.json"
+    json_path.write_text(json.dumps({"id": 1, "user": {"name": "x", "tags": ["a"]}}), encoding="utf-8")
+    seen = []
+    stats = GenerationStats(trace_memory=True, callback=lambda phase, record: seen.append(phase))
+    
+    output_path = generate_type_declare_file(str(json_path), verbose=False, stats=stats)
+    
+    assert seen == ["load", "analyze", "generate"]
+    assert stats.phases["generate"]["calls"] == 1
+    assert stats.phases["generate"]["peak_bytes"] >= 0
+    assert stats.counts["files"] == 1
+    assert stats.counts["classes"] == 2
+    assert stats.counts["fields"] == 4
+    with open(output_path, "rb") as f:
+        assert stats.counts["bytes"] == len(f.read())
+    assert "generate" in stats.report()
+
+
+def test_batch_merges_worker_stats(tmp_path):
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"sample{index}.json"
+        path.write_text(json.dumps({"id": index}), encoding="utf-8")
+        paths.append(str(path))
+    stats = GenerationStats()
+    
+    generate_batch(paths, str(tmp_path / "out"), jobs=2, stats=stats, stream=True)
+    
+    assert stats.phases["stream"]["calls"] == 3
+    assert "load" not in stats.phases
+    assert stats.counts["files"] == 3
+    assert stats.counts["classes"] == 3
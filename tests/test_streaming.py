@@ -0,0 +1,36 @@
+"""Tests for streaming schema inference."""
+
+import io
+from json2pytype.streaming import iter_json_records, infer_schema_from_stream
+
+
+def test_iter_ndjson_records():
+    stream = io.StringIO('{"id": 1}\n\n{"id": 2}\n{"id": 3}')
+    
+    assert list(iter_json_records(stream)) == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+
+def test_iter_array_records_across_chunks():
+    stream = io.StringIO(' [ {"id": 12345, "tags": ["a", "b"]}, 67890 , "text", null ] ')
+    
+    records = list(iter_json_records(stream, chunk_size=4))
+    
+    assert records == [{"id": 12345, "tags": ["a", "b"]}, 67890, "text", None]
+
+
+def test_infer_schema_merges_records():
+    stream = io.StringIO(
+        '{"userId": 1, "score": 3, "profile": {"name": "a"}}\n'
+        '{"userId": 2, "score": 2.5, "profile": {"name": "b", "age": 4}, "note": null}\n'
+    )
+    
+    result = infer_schema_from_stream(stream, "Event")
+    
+    fields = result["fields"]
+    assert result["name"] == "Event"
+    assert fields["user_id"]["type"] == "int"
+    assert fields["user_id"]["json_key"] == "userId"
+    assert fields["score"]["type"] == "float"
+    assert fields["note"]["type"] == "None"
+    assert fields["note"]["optional"] is True
+    assert fields["profile"]["info"]["fields"]["age"]["type"] == "Optional[int]"
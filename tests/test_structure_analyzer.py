@@ -1,8 +1,18 @@
 """Tests for JSON structure analyzer."""
 
 import json
+import sys
 from pathlib import Path
-from json2pytype.structure_analyzer import analyze_json_structure
+from json2pytype.structure_analyzer import (
+    analyze_json_structure,
+    class_shape_digest,
+    collect_classes,
+    deduplicate_classes,
+    low_cardinality_values,
+    merge_class_info,
+    merge_schemas,
+    schema_fingerprint,
+)
 
 
 def test_analyze_simple_json():
@@ -108,3 +118,144 @@ def test_analyze_root_list():
     assert items_field["is_list"] is True
     assert items_field["type"] == "List[Item]"
     assert items_field["list_element_type"] == "Item"
+
+
+def test_merge_class_info():
+    first = analyze_json_structure({"id": 1, "user": {"name": "a"}, "tags": []}, "Root")
+    second = analyze_json_structure({"id": None, "user": {"age": 3}, "tags": ["x"], "extra": True}, "Root")
+    
+    result = merge_class_info(first, second)
+    
+    fields = result["fields"]
+    assert fields["id"]["type"] == "Optional[int]"
+    assert fields["tags"]["type"] == "List[str]"
+    assert fields["extra"]["type"] == "Optional[bool]"
+    assert fields["extra"]["optional"] is True
+    
+    user_fields = fields["user"]["info"]["fields"]
+    assert user_fields["name"]["type"] == "Optional[str]"
+    assert user_fields["age"]["type"] == "Optional[int]"
+
+
+def test_analyze_list_merges_all_elements():
+    json_data = {
+        "users": [
+            {"name": "John", "score": 1},
+            {"name": None, "score": 2.5, "email": "jane@example.com"}
+        ],
+        "values": [1, None, 2.5]
+    }
+    
+    result = analyze_json_structure(json_data, "Root")
+    
+    user_fields = result["fields"]["users"]["info"]["fields"]
+    assert user_fields["name"]["type"] == "Optional[str]"
+    assert user_fields["score"]["type"] == "float"
+    assert user_fields["email"]["type"] == "Optional[str]"
+    assert user_fields["email"]["optional"] is True
+    assert result["fields"]["values"]["type"] == "List[Optional[float]]"
+
+
+def test_analyze_list_sampling_cap():
+    json_data = {"users": [{"a": 1}, {"b": 2}, {"c": 3}]}
+    
+    result = analyze_json_structure(json_data, "Root", max_samples=2)
+    user_fields = result["fields"]["users"]["info"]["fields"]
+    assert list(user_fields) == ["a", "b"]
+    
+    result = analyze_json_structure(json_data, "Root", max_samples=2, sampling="reservoir")
+    assert len(result["fields"]["users"]["info"]["fields"]) == 2
+
+
+def test_deduplicate_classes_shares_identical_shapes():
+    json_data = {
+        "billing": {"street": "Main St", "city": "Anytown"},
+        "shipping": {"city": "Othertown", "street": "Side St"},
+        "contact": {"email": "a@example.com"}
+    }
+    
+    result = deduplicate_classes(analyze_json_structure(json_data, "Order"))
+    
+    fields = result["fields"]
+    assert fields["billing"]["info"] is fields["shipping"]["info"]
+    assert fields["shipping"]["type"] == "OrderBilling"
+    assert fields["contact"]["type"] == "OrderContact"
+    assert class_shape_digest(fields["billing"]["info"]) == class_shape_digest(fields["shipping"]["info"])
+
+
+def test_deduplicate_classes_renames_colliding_shapes():
+    json_data = {
+        "first": {"users": [{"name": "John"}]},
+        "second": {"users": [{"id": 1}]}
+    }
+    
+    result = deduplicate_classes(analyze_json_structure(json_data, "Root"))
+    
+    first_users = result["fields"]["first"]["info"]["fields"]["users"]
+    second_users = result["fields"]["second"]["info"]["fields"]["users"]
+    assert first_users["type"] == "List[UsersItem]"
+    assert second_users["type"] == "List[UsersItem2]"
+    assert second_users["list_element_type"] == "UsersItem2"
+
+
+def test_analyze_naming_policies():
+    json_data = {"userName": "john", "homeAddress": {"zipCode": "12345"}}
+    
+    result = analyze_json_structure(json_data, "Root", naming="original")
+    assert "userName" in result["fields"]
+    assert result["fields"]["homeAddress"]["type"] == "RootHomeAddress"
+    
+    result = analyze_json_structure(json_data, "Root", naming={"userName": "login"})
+    assert result["fields"]["login"]["json_key"] == "userName"
+    assert "zip_code" in result["fields"]["home_address"]["info"]["fields"]
+
+
+def test_analyze_deeper_than_recursion_limit():
+    depth = sys.getrecursionlimit() + 100
+    first, second = {"id": 1}, {"id": 2, "name": "x"}
+    for _ in range(depth):
+        first, second = {"a": first}, {"a": second}
+    
+    result = analyze_json_structure([first, second], "Root")
+    
+    info = result["fields"]["items"]["info"]
+    for _ in range(depth):
+        info = info["fields"]["a"]["info"]
+    assert info["fields"]["name"]["type"] == "Optional[str]"
+    assert len(collect_classes(deduplicate_classes(result))) == depth + 2
+    assert schema_fingerprint(result) != schema_fingerprint(analyze_json_structure([first], "Root"))
+
+
+def test_analyze_value_statistics():
+    json_data = [
+        {"status": "paid", "note": "a"},
+        {"status": "shipped", "note": "b"},
+        {"status": "paid", "note": "c"},
+        {"status": None, "note": "d"},
+        {"status": "paid", "note": "e"},
+    ]
+    
+    result = analyze_json_structure(json_data, "Root", max_enum_values=3)
+    
+    fields = result["fields"]["items"]["info"]["fields"]
+    assert fields["status"]["type"] == "Optional[str]"
+    assert (fields["status"]["values"], fields["status"]["value_count"]) == (["paid", "shipped"], 4)
+    assert low_cardinality_values(fields["status"]) == ["paid", "shipped"]
+    # Too many distinct values, then too few repetitions
+    assert fields["note"]["values"] is None
+    assert low_cardinality_values(analyze_json_structure({"kind": "x"}, "Root", max_enum_values=3)["fields"]["kind"]) is None
+    # Statistics are not collected by default and disappear when a field stops being a string
+    assert "values" not in analyze_json_structure(json_data, "Root")["fields"]["items"]["info"]["fields"]["status"]
+    mixed = analyze_json_structure([{"code": "a"}, {"code": 1}], "Root", max_enum_values=3)
+    assert "values" not in mixed["fields"]["items"]["info"]["fields"]["code"]
+
+
+def test_merge_schemas_matches_fold():
+    samples = [{"a": 1}, {"b": "x", "a": None}, {"c": {"d": 1}}, {"a": 2.5, "c": {"e": True}}, {"b": 1}]
+    schemas = [analyze_json_structure(sample, "Root") for sample in samples]
+    
+    folded = schemas[0]
+    for schema in schemas[1:]:
+        folded = merge_class_info(folded, schema)
+    
+    assert schema_fingerprint(merge_schemas(schemas)) == schema_fingerprint(folded)
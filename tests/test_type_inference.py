@@ -1,6 +1,8 @@
 """Tests for type inference functions."""
 
-from json2pytype.type_inference import get_python_type
+import sys
+
+from json2pytype.type_inference import get_python_type, merge_python_types
 
 
 def test_get_python_type_basic_types():
@@ -29,3 +31,30 @@ def test_get_python_type_other_types():
     # For types not directly covered, should return "Any"
     assert get_python_type(set()) == "Any"
     assert get_python_type((1, 2, 3)) == "Any"
+
+
+def test_merge_python_types():
+    assert merge_python_types("int", "int") == "int"
+    assert merge_python_types("int", "float") == "float"
+    assert merge_python_types("str", "None") == "Optional[str]"
+    assert merge_python_types("Optional[int]", "str") == "Optional[Union[int, str]]"
+    assert merge_python_types("List[Any]", "List[int]") == "List[int]"
+    assert merge_python_types("List[int]", "List[float]") == "List[float]"
+
+
+def test_get_python_type_merges_list_elements():
+    assert get_python_type([1, 2.5]) == "List[float]"
+    assert get_python_type([1, None]) == "List[Optional[int]]"
+    assert get_python_type([1, "a", 2.5], max_samples=2) == "List[Union[int, str]]"
+
+
+def test_type_inference_deeper_than_recursion_limit():
+    depth = sys.getrecursionlimit() + 100
+    ints, floats = 1, 2.5
+    for _ in range(depth):
+        ints, floats = [ints], [floats]
+
+    int_type = get_python_type(ints)
+    assert int_type == "List[" * depth + "int" + "]" * depth
+    assert merge_python_types(int_type, get_python_type(floats)) == "List[" * depth + "float" + "]" * depth
+    assert merge_python_types(int_type, "None") == f"Optional[{int_type}]"